@@ -1,41 +1,82 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
-import boto3
+from typing import Dict, Any, List, Optional, Tuple
+import json
+import threading
 from langchain_aws import ChatBedrock
 from app.config import get_settings
+from app.services.client_registry import get_boto3_client
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# All agents share one ChatBedrock (and its pooled bedrock-runtime client)
+_shared_llm = None
+_shared_llm_lock = threading.Lock()
+
+
+def format_agent_context(previous_analyses: List[Dict], fields: Optional[Dict[str, Tuple[str, ...]]] = None) -> str:
+    """
+    Compact prompt context from earlier agents' results.
+    
+    Each analysis is rendered as minified JSON under its agent name, keeping
+    only the fields listed for that agent in `fields` (every field when the
+    agent is not listed) and dropping empty values. A fallback raw_analysis
+    is always kept since it is all that agent produced.
+    """
+    fields = fields or {}
+    sections = []
+    
+    for analysis in previous_analyses:
+        data = analysis.get('analysis', {})
+        selected = fields.get(analysis['agent_name'])
+        
+        compact = {
+            key: value for key, value in data.items()
+            if (selected is None or key in selected or key == 'raw_analysis')
+            and value not in (None, "", [], {})
+        }
+        
+        sections.append(
+            f"### {analysis['agent_name']}\n"
+            f"{json.dumps(compact, separators=(',', ':'), ensure_ascii=False)}"
+        )
+    
+    return "\n".join(sections)
+
 
 class BaseAgent(ABC):
     """Abstract base class for all sales coaching agents."""
     
+    # Fields this agent reads from each upstream agent's analysis;
+    # agents not listed are passed in full
+    CONTEXT_FIELDS: Dict[str, Tuple[str, ...]] = {}
+    
     def __init__(self, agent_name: str):
         self.agent_name = agent_name
         self.llm = self._initialize_llm()
     
     def _initialize_llm(self) -> ChatBedrock:
-        """Initialize AWS Bedrock LLM client."""
-        bedrock_client = boto3.client(
-            'bedrock-runtime',
-            region_name=settings.AWS_REGION,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-        )
+        """Return the process-wide AWS Bedrock LLM client."""
+        global _shared_llm
         
-        llm = ChatBedrock(
-            client=bedrock_client,
-            model_id=settings.BEDROCK_MODEL_ID,
-            model_kwargs={
-                "max_tokens": 4096,
-                "temperature": 0.7,
-                "top_p": 0.9
-            }
-        )
+        with _shared_llm_lock:
+            if _shared_llm is None:
+                _shared_llm = ChatBedrock(
+                    client=get_boto3_client('bedrock-runtime'),
+                    model_id=settings.BEDROCK_MODEL_ID,
+                    model_kwargs={
+                        "max_tokens": 4096,
+                        "temperature": 0.7,
+                        "top_p": 0.9
+                    }
+                )
         
-        return llm
+        return _shared_llm
+    
+    def format_previous_analyses(self, previous_analyses: List[Dict]) -> str:
+        """Earlier agents' results, reduced to the fields this agent uses."""
+        return format_agent_context(previous_analyses, self.CONTEXT_FIELDS)
     
     @abstractmethod
     def get_system_prompt(self) -> str:
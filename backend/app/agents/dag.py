@@ -0,0 +1,123 @@
+from typing import Dict, Any, Callable, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import time
+from app.utils.exceptions import AgentException
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Receives the outputs of the node's dependencies, keyed by node name
+NodeFunction = Callable[[Dict[str, Any]], Any]
+
+
+class AgentDAG:
+    """
+    Runs agents as a dependency graph.
+
+    Each node declares the nodes whose outputs it needs. A node starts as
+    soon as all of its dependencies have finished, so independent agents
+    run concurrently and a new agent only lengthens the critical path if
+    it depends on others. Per-node timings are kept in `timings`.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.nodes: Dict[str, Tuple[NodeFunction, Tuple[str, ...]]] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    def add(self, name: str, func: NodeFunction, depends_on: Tuple[str, ...] = ()) -> "AgentDAG":
+        """Register a node; returns self so graphs can be declared fluently."""
+        if name in self.nodes:
+            raise ValueError(f"Duplicate agent node: {name}")
+
+        self.nodes[name] = (func, tuple(depends_on))
+        return self
+
+    def _validate(self):
+        for name, (_, depends_on) in self.nodes.items():
+            missing = [dep for dep in depends_on if dep not in self.nodes]
+            if missing:
+                raise ValueError(f"Agent node {name} depends on unknown nodes: {missing}")
+
+        # Kahn's algorithm: every node must become ready eventually
+        remaining = {name: set(deps) for name, (_, deps) in self.nodes.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Agent graph has a cycle among: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Execute the graph.
+
+        Returns:
+            Output of every node, keyed by name
+
+        Raises:
+            AgentException: A node failed; nodes not yet started are skipped
+        """
+        self._validate()
+        self.timings = {}
+
+        outputs: Dict[str, Any] = {}
+        pending = dict(self.nodes)
+        running = {}
+        started = time.perf_counter()
+        ready_at = {name: 0.0 for name, (_, deps) in pending.items() if not deps}
+
+        def execute(name: str, func: NodeFunction, inputs: Dict[str, Any]):
+            node_started = time.perf_counter()
+            try:
+                return func(inputs)
+            finally:
+                self.timings[name] = {
+                    "ready": ready_at[name],
+                    "started": node_started - started,
+                    "finished": time.perf_counter() - started,
+                    "seconds": time.perf_counter() - node_started,
+                }
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="agent-dag") as executor:
+            while pending or running:
+                for name in [n for n, (_, deps) in pending.items() if all(d in outputs for d in deps)]:
+                    func, deps = pending.pop(name)
+                    ready_at.setdefault(name, time.perf_counter() - started)
+                    running[executor.submit(execute, name, func, {d: outputs[d] for d in deps})] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        outputs[name] = future.result()
+                    except Exception as e:
+                        for other in running:
+                            other.cancel()
+                        logger.error(f"[AGENT DAG] {name} failed: {e}")
+                        raise AgentException(f"Agent {name} failed: {e}") from e
+
+                    logger.info(f"[AGENT DAG] {name} finished in {self.timings[name]['seconds']:.2f}s")
+
+        logger.info(
+            f"[AGENT DAG] {len(self.nodes)} agents in {time.perf_counter() - started:.2f}s, "
+            f"critical path: {' -> '.join(self.critical_path())}"
+        )
+        return outputs
+
+    def critical_path(self) -> List[str]:
+        """Chain of nodes that determined the finish time of the last run."""
+        if not self.timings:
+            return []
+
+        path = [max(self.timings, key=lambda name: self.timings[name]["finished"])]
+        while True:
+            deps = self.nodes[path[-1]][1]
+            if not deps:
+                break
+            path.append(max(deps, key=lambda dep: self.timings[dep]["finished"]))
+
+        return list(reversed(path))
@@ -9,6 +9,13 @@ logger = get_logger(__name__)
 class ObjectionExpertAgent(BaseAgent):
     """Agent specialized in detecting and analyzing objection handling."""
     
+    CONTEXT_FIELDS = {
+        "Transcript Analyzer": (
+            "speaker_roles", "customer_pain_points", "questions_asked_by_customer",
+            "key_topics", "summary",
+        ),
+    }
+    
     def __init__(self):
         super().__init__(agent_name="Objection Expert")
     
@@ -34,8 +41,7 @@ Be thorough in identifying subtle objections and resistance."""
         previous_insights = ""
         if previous_analyses:
             previous_insights = "\n\n## Context from other agents:\n"
-            for analysis in previous_analyses:
-                previous_insights += f"\n### {analysis['agent_name']}:\n{json.dumps(analysis.get('analysis', {}), indent=2)}\n"
+            previous_insights += self.format_previous_analyses(previous_analyses) + "\n"
         
         prompt = f"""Analyze objection handling in this sales call:
 
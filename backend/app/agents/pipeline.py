@@ -0,0 +1,64 @@
+from typing import Dict, Tuple
+from app.agents.dag import AgentDAG
+from app.agents.objection_expert import ObjectionExpertAgent
+from app.agents.sales_coach import SalesCoachAgent
+from app.agents.supervisor import SupervisorAgent
+from app.agents.transcript_analyzer import TranscriptAnalyzerAgent
+from app.models import SalesReport
+
+# Node whose output is the final report
+REPORT_NODE = "Supervisor"
+
+
+def build_agent_graph(transcript: str, context: str = "", max_workers: int = 4) -> AgentDAG:
+    """
+    Declare the Bedrock agents as a graph.
+
+    Transcript Analyzer -> (Sales Coach, Objection Expert) -> Supervisor:
+    the coach and objection expert both only need the analyzer's output,
+    so they run concurrently. Keep each agent's CONTEXT_FIELDS to its
+    upstream nodes here.
+
+    This drives the Bedrock agents in app/agents only; the API pipeline
+    runs the Groq agents in agent_service, which share no outputs.
+    """
+    analyzer = TranscriptAnalyzerAgent()
+    coach = SalesCoachAgent()
+    objections = ObjectionExpertAgent()
+    supervisor = SupervisorAgent()
+
+    dag = AgentDAG(max_workers=max_workers)
+
+    dag.add(
+        analyzer.agent_name,
+        lambda inputs: analyzer.analyze(transcript, context),
+    )
+    dag.add(
+        coach.agent_name,
+        lambda inputs: coach.analyze(transcript, context, list(inputs.values())),
+        depends_on=(analyzer.agent_name,),
+    )
+    dag.add(
+        objections.agent_name,
+        lambda inputs: objections.analyze(transcript, context, list(inputs.values())),
+        depends_on=(analyzer.agent_name,),
+    )
+    dag.add(
+        REPORT_NODE,
+        lambda inputs: supervisor.synthesize_report(transcript, list(inputs.values())),
+        depends_on=(analyzer.agent_name, coach.agent_name, objections.agent_name),
+    )
+
+    return dag
+
+
+def run_agent_pipeline(transcript: str, context: str = "") -> Tuple[SalesReport, Dict[str, Dict[str, float]]]:
+    """
+    Run every agent and synthesize the report.
+
+    Returns:
+        (report, per-agent timings in seconds from the start of the run)
+    """
+    dag = build_agent_graph(transcript, context)
+    outputs = dag.run()
+    return outputs[REPORT_NODE], dag.timings
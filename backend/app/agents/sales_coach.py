@@ -9,6 +9,13 @@ logger = get_logger(__name__)
 class SalesCoachAgent(BaseAgent):
     """Agent that evaluates sales rep performance and provides coaching feedback."""
     
+    CONTEXT_FIELDS = {
+        "Transcript Analyzer": (
+            "call_phases", "customer_pain_points", "questions_asked_by_rep",
+            "key_topics", "conversation_quality", "summary",
+        ),
+    }
+    
     def __init__(self):
         super().__init__(agent_name="Sales Coach")
     
@@ -31,8 +38,7 @@ Be constructive, specific, and data-driven in your feedback."""
         previous_insights = ""
         if previous_analyses:
             previous_insights = "\n\n## Context from other agents:\n"
-            for analysis in previous_analyses:
-                previous_insights += f"\n### {analysis['agent_name']}:\n{json.dumps(analysis.get('analysis', {}), indent=2)}\n"
+            previous_insights += self.format_previous_analyses(previous_analyses) + "\n"
         
         prompt = f"""Evaluate the sales rep's performance in this call:
 
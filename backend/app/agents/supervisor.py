@@ -10,6 +10,15 @@ logger = get_logger(__name__)
 class SupervisorAgent(BaseAgent):
     """Orchestrates multiple agents and synthesizes final report."""
     
+    # Specialist findings feed the report directly; the analyzer's
+    # speaker and question breakdowns do not
+    CONTEXT_FIELDS = {
+        "Transcript Analyzer": (
+            "call_phases", "customer_pain_points", "key_topics",
+            "conversation_quality", "summary",
+        ),
+    }
+    
     def __init__(self):
         super().__init__(agent_name="Supervisor")
     
@@ -38,10 +47,7 @@ Be concise, prioritize action items, and focus on high-impact improvements."""
         """
         
         # Compile all agent insights
-        compiled_insights = "\n\n".join([
-            f"## {analysis['agent_name']}\n{json.dumps(analysis.get('analysis', {}), indent=2)}"
-            for analysis in agent_analyses
-        ])
+        compiled_insights = self.format_previous_analyses(agent_analyses)
         
         prompt = f"""Review these specialist analyses of a sales call:
 
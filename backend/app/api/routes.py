@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import Dict, Optional
+from fastapi import APIRouter, HTTPException, Header, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from typing import Dict, List, Literal, Optional
 from datetime import datetime
-import boto3
-import json
+import asyncio
+import time
 
 from fastapi import APIRouter
 from datetime import datetime
@@ -11,15 +12,29 @@ router = APIRouter()
 
 
 from app.models import (
+    AgentInsight,
     AudioUploadResponse,
     JobStatusResponse,
     ProcessingStatus,
     TranscriptResponse,
     SalesReport,
+    UploadCompleteRequest,
 )
-from app.services.s3_service import S3Service
-from app.services.transcribe_service import TranscribeService
-from app.services.agent_service import AgentOrchestrationService
+from app.services.client_registry import pool_stats
+from app.services.job_events import job_events
+from app.services.job_queue import get_job_queue
+from app.services.job_store import get_job_store
+from app.services.pipeline import (
+    agent_service,
+    first_incomplete_stage,
+    record_upload,
+    s3_service,
+    transcribe_service,
+    update_job_status,
+)
+from app.services.upload_events import get_upload_event_source, queue_started_job, upload_recorded
+from app.utils.concurrency import run_blocking
+from app.utils.exceptions import S3Exception
 from app.utils.logger import get_logger
 from app.config import get_settings
 
@@ -28,107 +43,45 @@ settings = get_settings()
 
 router = APIRouter(prefix="/api/v1", tags=["Sales Coach API"])
 
-job_status_store: Dict[str, Dict] = {}
-
-s3_service = S3Service()
-transcribe_service = TranscribeService()
-agent_service = AgentOrchestrationService()
-
-s3_client = boto3.client(
-    "s3",
-    region_name=settings.AWS_REGION,
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-)
+job_store = get_job_store()
+job_queue = get_job_queue()
 
 # ----------------------------------------------------------
 # JOB STATUS HELPER
 # ----------------------------------------------------------
-def update_job_status(
-    job_id: str,
-    status: ProcessingStatus,
-    progress: int,
-    step: str,
-    transcript: Optional[TranscriptResponse] = None,
-    report: Optional[SalesReport] = None,
-    error: Optional[str] = None,
-):
-    job_status_store[job_id] = {
-        "job_id": job_id,
-        "status": status,
-        "progress_percentage": progress,
-        "current_step": step,
-        "transcript": transcript,
-        "report": report,
-        "error_message": error,
-        "updated_at": datetime.utcnow(),
-    }
-
-    logger.info(f"Job {job_id}: {status.value} - {step} ({progress}%)")
-
-
-# ----------------------------------------------------------
-# MAIN PIPELINE
-# ----------------------------------------------------------
-async def process_audio_pipeline(job_id: str, file_extension: str):
-
-    try:
-        update_job_status(job_id, ProcessingStatus.TRANSCRIBING, 10, "Starting transcription")
-
-        audio_uri = s3_service.get_audio_uri(job_id, file_extension)
-        logger.info(f"[PIPELINE] Audio URI resolved: {audio_uri}")
-
-        transcription_job_name = transcribe_service.start_transcription_job(job_id, audio_uri)
+TERMINAL_STATUSES = {ProcessingStatus.COMPLETED.value, ProcessingStatus.FAILED.value}
 
-        update_job_status(job_id, ProcessingStatus.TRANSCRIBING, 20, "Transcription in progress")
 
-        job_result = transcribe_service.wait_for_completion(transcription_job_name)
+def build_job_status(
+    job_data: Dict, include_payloads: bool = True, include_partials: bool = True
+) -> JobStatusResponse:
+    job_id = job_data["job_id"]
 
-        update_job_status(job_id, ProcessingStatus.TRANSCRIBING, 50, "Transcription completed")
+    partial_insights = None
+    if include_partials and job_data.get("partial_version"):
+        partial_insights = [
+            AgentInsight(agent_name=name, analysis=text, key_points=[])
+            for name, text in job_store.get_partial_insights(job_id).items()
+        ]
 
-        # 🔥 FETCH TRANSCRIPT FROM S3 DIRECTLY (PRODUCTION SAFE)
-        bucket = settings.S3_BUCKET_NAME
-        key = f"{settings.TRANSCRIBE_JOB_PREFIX}{job_id}.json"
+    transcript = None
+    report = None
+    if include_payloads:
+        if job_data.get("has_transcript"):
+            transcript = job_store.get_transcript(job_id)
+        if job_data.get("has_report"):
+            report = job_store.get_report(job_id)
 
-        logger.info(f"[TRANSCRIBE] Fetching transcript via S3 API")
-        logger.info(f"[TRANSCRIBE] Bucket: {bucket}")
-        logger.info(f"[TRANSCRIBE] Key: {key}")
-
-        obj = s3_client.get_object(Bucket=bucket, Key=key)
-        transcript_json = json.loads(obj["Body"].read().decode("utf-8"))
-
-        logger.info("[TRANSCRIBE] Transcript loaded successfully from S3")
-
-        s3_service.save_transcript(job_id, transcript_json)
-
-        transcript_response = transcribe_service.parse_transcript_with_speakers(transcript_json)
-        transcript_response.job_id = job_id
-
-        update_job_status(
-            job_id,
-            ProcessingStatus.ANALYZING,
-            60,
-            "Running AI agent analysis",
-            transcript=transcript_response,
-        )
-
-        logger.info(f"Starting agent orchestration for job {job_id}")
-        sales_report = agent_service.analyze_call(job_id, transcript_response)
-
-        update_job_status(
-            job_id,
-            ProcessingStatus.COMPLETED,
-            100,
-            "Analysis complete",
-            transcript=transcript_response,
-            report=sales_report,
-        )
-
-        logger.info(f"✓ Job {job_id} completed successfully")
-
-    except Exception as e:
-        logger.error(f"Error processing job {job_id}: {e}")
-        update_job_status(job_id, ProcessingStatus.FAILED, 0, "Processing failed", error=str(e))
+    return JobStatusResponse(
+        job_id=job_id,
+        status=job_data["status"],
+        progress_percentage=job_data["progress_percentage"],
+        current_step=job_data["current_step"],
+        transcript=transcript,
+        report=report,
+        error_message=job_data.get("error_message"),
+        partial_insights=partial_insights,
+    )
 
 
 # ----------------------------------------------------------
@@ -148,7 +101,7 @@ async def upload_audio(file_extension: str = "mp3"):
     )
 
     # 🔥 NEW LINE (store extension)
-    job_status_store[job_id]["file_extension"] = file_extension
+    job_store.update(job_id, file_extension=file_extension)
 
     return AudioUploadResponse(
         job_id=job_id,
@@ -162,38 +115,274 @@ async def upload_audio(file_extension: str = "mp3"):
 # 🔥 START PIPELINE AFTER UPLOAD (CRITICAL FIX)
 # ----------------------------------------------------------
 @router.post("/start/{job_id}")
-async def start_pipeline(job_id: str, background_tasks: BackgroundTasks):
+async def start_pipeline(
+    job_id: str, request: Request, upload: Optional[UploadCompleteRequest] = None
+):
+    """
+    Confirm the upload and queue the job for a pipeline worker.
+
+    The client calls this once its PUT succeeded, optionally with the size
+    and ETag it uploaded; the object is verified with one head_object
+    instead of the pipeline polling for it. With S3 upload events enabled,
+    a job whose upload has not landed yet is queued when its event arrives.
+    Starting a job that is already queued or running is a no-op.
+    """
+
+    job_data = job_store.get(job_id)
 
-    if job_id not in job_status_store:
+    if job_data is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
     # ⭐ GET REAL EXTENSION
-    file_extension = job_status_store[job_id].get("file_extension", "mp3")
+    file_extension = job_data.get("file_extension", "mp3")
+    upload = upload or UploadCompleteRequest()
+
+    if not upload_recorded(job_data):
+        try:
+            stored = await run_blocking(
+                s3_service.verify_upload, job_id, file_extension, upload.size, upload.etag
+            )
+        except S3Exception as e:
+            raise HTTPException(status_code=409, detail=str(e))
+
+        if stored is not None:
+            record_upload(job_id, stored["size"], stored["etag"])
+        elif get_upload_event_source() is None:
+            raise HTTPException(
+                status_code=409, detail="Upload not found; call /start after the upload completes"
+            )
+
+    job_store.update(job_id, start_requested=True)
+    queued = await run_blocking(queue_started_job, job_id)
+
+    if queued:
+        _wake_embedded_worker(request)
+        return {"status": "started"}
+
+    if not upload_recorded(job_store.get(job_id) or {}):
+        return {"status": "awaiting upload"}
+
+    return {"status": "already started"}
+
+
+def _wake_embedded_worker(request: Request):
+    # Embedded worker picks the job up now rather than on its next poll
+    worker = getattr(request.app.state, "pipeline_worker", None)
+    if worker is not None:
+        worker.wake()
+
+
+# ----------------------------------------------------------
+# 🔁 RETRY FROM THE FIRST INCOMPLETE STAGE
+# ----------------------------------------------------------
+@router.post("/jobs/{job_id}/retry")
+async def retry_job(job_id: str, request: Request):
+    """
+    Resume a failed job, or a completed one where some agents failed,
+    from its first incomplete stage.
+
+    Checkpointed stages are not repeated, so a transient LLM error costs
+    the failed agent calls rather than a new upload and transcription.
+    """
+
+    job_data = job_store.get(job_id)
+
+    if job_data is None:
+        raise HTTPException(status_code=404, detail="Job not found")
 
-    background_tasks.add_task(process_audio_pipeline, job_id, file_extension)
+    resume_from = first_incomplete_stage(job_data)
 
-    return {"status": "started"}
+    if resume_from is None or job_data["status"] not in (
+        ProcessingStatus.FAILED.value,
+        ProcessingStatus.COMPLETED.value,
+    ):
+        raise HTTPException(status_code=409, detail="Job has nothing to retry")
+
+    # Only touch the record once the job is actually queued again
+    queued = await run_blocking(
+        job_queue.enqueue, job_id, {"file_extension": job_data.get("file_extension", "mp3")}
+    )
+    if not queued:
+        raise HTTPException(status_code=409, detail="Job is already queued or running")
+
+    job_store.update(job_id, failed_stage=None)
+    update_job_status(
+        job_id,
+        ProcessingStatus.PENDING,
+        job_data["progress_percentage"],
+        f"Retrying from {resume_from}",
+    )
+
+    _wake_embedded_worker(request)
+
+    return {"status": "retrying", "resume_from": resume_from}
 
 
 # ----------------------------------------------------------
 # STATUS
 # ----------------------------------------------------------
+PAYLOAD_FIELDS = {"transcript", "report"}
+
+
 @router.get("/status/{job_id}", response_model=JobStatusResponse)
-async def get_job_status(job_id: str):
+async def get_job_status(
+    job_id: str,
+    view: Literal["summary", "full"] = "full",
+    fields: Optional[str] = Query(
+        None, description="Comma-separated JobStatusResponse fields to return"
+    ),
+):
+    """
+    Job status.
+
+    `view=summary` leaves out the transcript and report, which is all a
+    progress bar needs; `fields=` narrows the response further. Use
+    /jobs/{job_id}/transcript and /jobs/{job_id}/report for the payloads.
+    """
 
-    if job_id not in job_status_store:
+    job_data = job_store.get(job_id)
+
+    if job_data is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    job_data = job_status_store[job_id]
+    selected = None
+    if fields:
+        selected = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = selected - set(JobStatusResponse.model_fields)
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+
+    include_payloads = view == "full" and (selected is None or bool(selected & PAYLOAD_FIELDS))
+    job_status = build_job_status(
+        job_data, include_payloads=include_payloads, include_partials=view == "full"
+    )
 
-    return JobStatusResponse(
-        job_id=job_data["job_id"],
-        status=job_data["status"],
-        progress_percentage=job_data["progress_percentage"],
-        current_step=job_data["current_step"],
-        transcript=job_data.get("transcript"),
-        report=job_data.get("report"),
-        error_message=job_data.get("error_message"),
+    if selected is None:
+        return job_status
+
+    return JSONResponse(job_status.model_dump(mode="json", include=selected))
+
+
+# ----------------------------------------------------------
+# TRANSCRIPT / REPORT RESOURCES (ETAG CACHED)
+# ----------------------------------------------------------
+def _payload_response(job_id: str, name: str, if_none_match: Optional[str]) -> Response:
+
+    job_data = job_store.get(job_id)
+
+    if job_data is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if not job_data.get(f"has_{name}"):
+        raise HTTPException(status_code=404, detail=f"{name.capitalize()} not available yet")
+
+    etag = f'"{job_data[f"{name}_etag"]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    # Payloads are stored as JSON already; send them without re-serializing
+    body = job_store.get_payload(job_id, name)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/jobs/{job_id}/transcript", response_model=TranscriptResponse)
+async def get_job_transcript(job_id: str, if_none_match: Optional[str] = Header(None)):
+    return _payload_response(job_id, "transcript", if_none_match)
+
+
+@router.get("/jobs/{job_id}/report", response_model=SalesReport)
+async def get_job_report(job_id: str, if_none_match: Optional[str] = Header(None)):
+    return _payload_response(job_id, "report", if_none_match)
+
+
+# ----------------------------------------------------------
+# 📡 STATUS STREAM (SERVER-SENT EVENTS)
+# ----------------------------------------------------------
+def _sse(event: str, payload: JobStatusResponse) -> str:
+    return f"event: {event}\ndata: {payload.model_dump_json()}\n\n"
+
+
+def _partial_updates(job_id: str, sent_lengths: Dict[str, int]) -> List[AgentInsight]:
+    updates = []
+    for name, text in job_store.get_partial_insights(job_id).items():
+        sent = sent_lengths.get(name, 0)
+        if len(text) > sent:
+            updates.append(AgentInsight(agent_name=name, analysis=text[sent:], key_points=[]))
+            sent_lengths[name] = len(text)
+    return updates
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_status(job_id: str):
+    """
+    Push status transitions as they happen.
+
+    Sends a lightweight `status` event (no transcript or report) for every
+    change, then a single `complete` event carrying the full payloads once
+    the job reaches a terminal state, and closes the stream. While agents
+    stream, `status` events carry only the text appended since the
+    previous event in `partial_updates`.
+    """
+
+    if job_store.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    # Worker processes update the job store only; poll it when they run
+    wait_seconds = (
+        settings.JOB_EVENTS_HEARTBEAT_SECONDS
+        if settings.JOB_WORKER_EMBEDDED
+        else settings.JOB_EVENTS_STORE_POLL_SECONDS
+    )
+
+    async def event_stream():
+        queue = job_events.subscribe(job_id)
+
+        try:
+            job_data = job_store.get(job_id)
+            last_sent = None
+            last_write = time.monotonic()
+            # Characters of each agent's text already sent on this stream
+            sent_lengths: Dict[str, int] = {}
+
+            while job_data is not None:
+
+                if job_data["status"] in TERMINAL_STATUSES:
+                    yield _sse("complete", build_job_status(job_data))
+                    return
+
+                if job_data != last_sent:
+                    update = build_job_status(job_data, include_payloads=False, include_partials=False)
+
+                    version = job_data.get("partial_version")
+                    if version and version != (last_sent or {}).get("partial_version"):
+                        update.partial_updates = _partial_updates(job_id, sent_lengths)
+
+                    yield _sse("status", update)
+                    last_sent = job_data
+                    last_write = time.monotonic()
+
+                try:
+                    job_data = await asyncio.wait_for(queue.get(), timeout=wait_seconds)
+                except asyncio.TimeoutError:
+                    # Pick up updates made by other worker processes
+                    job_data = job_store.get(job_id)
+
+                    # Keep proxies from closing an idle stream
+                    if time.monotonic() - last_write >= settings.JOB_EVENTS_HEARTBEAT_SECONDS:
+                        yield ": keep-alive\n\n"
+                        last_write = time.monotonic()
+
+        finally:
+            job_events.unsubscribe(job_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 # =====================================================
@@ -206,3 +395,24 @@ def health_check():
         "service": "ai-sales-coach-api",
         "timestamp": datetime.utcnow().isoformat()
     }
+
+
+# =====================================================
+# METRICS
+# =====================================================
+@router.get("/metrics")
+def get_metrics(request: Request):
+    upload_events = getattr(request.app.state, "upload_events", None)
+
+    return {
+        "job_store": job_store.stats(),
+        "job_queue": job_queue.stats(),
+        "upload_events": upload_events.stats() if upload_events else None,
+        "transcribe_watcher": transcribe_service.watcher.stats(),
+        "event_subscribers": job_events.subscriber_count(),
+        "llm_cache": agent_service.cache.stats() if agent_service.cache else None,
+        "llm_usage": agent_service.usage_stats(),
+        "rag": agent_service.rag.stats() if agent_service.rag else None,
+        "client_pools": pool_stats(),
+    }
+
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict
 
 
 class Settings(BaseSettings):
@@ -11,6 +12,12 @@ class Settings(BaseSettings):
     AWS_ACCESS_KEY_ID: str = ""
     AWS_SECRET_ACCESS_KEY: str = ""
 
+    # Shared client pools (see app.services.client_registry)
+    AWS_MAX_POOL_CONNECTIONS: int = 50
+    AWS_MAX_RETRY_ATTEMPTS: int = 5
+    AWS_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    AWS_READ_TIMEOUT_SECONDS: float = 60.0
+
     # =====================================================
     # S3 SETTINGS
     # =====================================================
@@ -22,11 +29,159 @@ class Settings(BaseSettings):
     TRANSCRIBE_OUTPUT_BUCKET: str = "ai-sales-coach-audio"
     TRANSCRIBE_JOB_PREFIX: str = "transcribe-job-"
 
+    # Transcribe jobs are checked on a schedule scaled to the audio length:
+    # expected turnaround = BASE + REALTIME_FACTOR * audio seconds, with the
+    # audio length estimated from the upload size. The first check is
+    # halfway there, then every POLL_FRACTION of the estimate, backing off by
+    # BACKOFF_FACTOR once overdue, within MIN..MAX
+    TRANSCRIBE_AUDIO_BYTES_PER_SECOND: float = 16000.0
+    TRANSCRIBE_EXPECTED_BASE_SECONDS: float = 10.0
+    TRANSCRIBE_EXPECTED_REALTIME_FACTOR: float = 0.3
+    TRANSCRIBE_POLL_FRACTION: float = 0.1
+    TRANSCRIBE_POLL_MIN_INTERVAL_SECONDS: float = 1.0
+    TRANSCRIBE_POLL_MAX_INTERVAL_SECONDS: float = 15.0
+    TRANSCRIBE_POLL_BACKOFF_FACTOR: float = 1.5
+    # Give up on a job after TIMEOUT_FACTOR times its expected turnaround,
+    # but never sooner than TIMEOUT_MIN_SECONDS
+    TRANSCRIBE_TIMEOUT_FACTOR: float = 3.0
+    TRANSCRIBE_TIMEOUT_MIN_SECONDS: float = 600.0
+
+    # Reuse the saved transcript when identical audio is uploaded again.
+    # "etag" uses the S3 ETag; "sha256" streams and hashes the object.
+    AUDIO_DEDUP_ENABLED: bool = True
+    AUDIO_DEDUP_MODE: str = "etag"
+
+    # Upload completion is confirmed once by /start. With "sqs", S3
+    # ObjectCreated notifications also record uploads as they land and
+    # queue jobs started before their upload finished; "local" is an
+    # in-process stand-in for tests
+    UPLOAD_EVENTS_BACKEND: str = "none"
+    UPLOAD_EVENTS_SQS_QUEUE_URL: str = ""
+    # SQS long-poll wait per receive call
+    UPLOAD_EVENTS_WAIT_SECONDS: int = 20
+
     # =====================================================
     # GROQ / LLM SETTINGS
     # =====================================================
     GROQ_API_KEY: str = ""
     GROQ_MODEL: str = "llama-3.3-70b-versatile"
+    GROQ_MAX_CONNECTIONS: int = 20
+
+    # =====================================================
+    # BEDROCK SETTINGS
+    # =====================================================
+    BEDROCK_MODEL_ID: str = "anthropic.claude-3-sonnet-20240229-v1:0"
+    BEDROCK_EMBEDDING_MODEL: str = "amazon.titan-embed-text-v1"
+
+    # =====================================================
+    # RAG / KNOWLEDGE BASE
+    # =====================================================
+    # Relative to the project root
+    KNOWLEDGE_BASE_PATH: str = "data/knowledge_base"
+    CHUNK_SIZE: int = 1000
+    CHUNK_OVERLAP: int = 200
+    TOP_K_RESULTS: int = 3
+
+    # Versioned index artifact written by build_embeddings.py and
+    # memory-mapped read-only at startup
+    RAG_INDEX_PATH: str = "data/embeddings"
+    # Embed the knowledge base at startup when no artifact exists (calls Bedrock)
+    RAG_BUILD_INDEX_ON_STARTUP: bool = False
+
+    # Ground agent prompts in retrieved knowledge-base context; retrieval
+    # failures fall back to prompts without context
+    RAG_ENABLED: bool = True
+    RAG_QUERY_CACHE_SIZE: int = 256
+
+    # "hybrid" fuses dense and BM25 rankings (reciprocal rank fusion over
+    # RAG_HYBRID_CANDIDATES from each); "dense" or "keyword" use one alone
+    RAG_RETRIEVAL_MODE: str = "hybrid"
+    RAG_HYBRID_CANDIDATES: int = 20
+    RAG_RRF_K: int = 60
+
+    # Token budget for the knowledge-base context in each agent prompt;
+    # RAG_AGENT_CONTEXT_BUDGETS overrides it per agent name (JSON object)
+    RAG_CONTEXT_TOKEN_BUDGET: int = 1000
+    RAG_AGENT_CONTEXT_BUDGETS: Dict[str, int] = {}
+
+    # "bedrock" (Titan via AWS) or "local" (offline hashed term frequencies on CPU)
+    EMBEDDING_BACKEND: str = "bedrock"
+    LOCAL_EMBEDDING_DIMENSION: int = 4096
+
+    # Embedding calls are deduplicated against an on-disk vector store and
+    # sent in batches by a bounded pool (see app.services.embedding_cache)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PATH: str = "data/embedding_cache.sqlite3"
+    EMBEDDING_BATCH_SIZE: int = 16
+    EMBEDDING_MAX_CONCURRENCY: int = 4
+    EMBEDDING_QUERY_CACHE_SIZE: int = 1024
+
+    # =====================================================
+    # AGENT ORCHESTRATION
+    # =====================================================
+    # Max agent LLM calls in flight per process (1 = sequential)
+    AGENT_MAX_CONCURRENCY: int = 3
+    # Per-agent completion timeout in seconds, counted from when the call starts
+    AGENT_TIMEOUT_SECONDS: float = 90.0
+
+    # On-disk cache of completions keyed on model/temperature/prompts
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = "data/llm_cache.sqlite3"
+    LLM_CACHE_TTL_SECONDS: float = 604800.0
+    LLM_CACHE_MAX_ENTRIES: int = 5000
+
+    # Transcripts longer than this (estimated tokens) are analysed in
+    # speaker-turn chunks of ANALYSIS_CHUNK_TOKENS and the findings merged
+    ANALYSIS_MAP_REDUCE_THRESHOLD_TOKENS: int = 6000
+    ANALYSIS_CHUNK_TOKENS: int = 3000
+
+    # Stream agent completions into the job record as partial insights
+    ANALYSIS_STREAMING: bool = True
+    ANALYSIS_PARTIAL_PUBLISH_INTERVAL_SECONDS: float = 0.5
+
+    # =====================================================
+    # PIPELINE EXECUTOR
+    # =====================================================
+    # Threads available for blocking SDK calls made by pipeline jobs
+    PIPELINE_MAX_WORKERS: int = 16
+
+    # =====================================================
+    # JOB STORE
+    # =====================================================
+    # "sqlite" (durable, shared by all workers) or "memory" (single process;
+    # stage checkpoints are lost on restart, so queued jobs start over)
+    JOB_STORE_BACKEND: str = "sqlite"
+    JOB_STORE_SQLITE_PATH: str = "data/jobs.sqlite3"
+    JOB_STORE_MAX_JOBS: int = 1000
+    JOB_STORE_TTL_SECONDS: float = 86400.0
+    # Parsed transcripts kept in memory per process
+    JOB_STORE_TRANSCRIPT_CACHE_SIZE: int = 32
+
+    # Idle interval between keep-alives on the job event stream
+    JOB_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    # Without the embedded worker, progress is written by other processes
+    # and never reaches the in-process event bus; streams re-read the job
+    # store this often instead
+    JOB_EVENTS_STORE_POLL_SECONDS: float = 1.0
+
+    # =====================================================
+    # JOB QUEUE / WORKERS
+    # =====================================================
+    # Pipeline jobs are queued durably and run by workers holding a lease;
+    # a job whose worker dies is picked up again once the lease expires
+    JOB_QUEUE_BACKEND: str = "sqlite"
+    JOB_QUEUE_SQLITE_PATH: str = "data/job_queue.sqlite3"
+    JOB_QUEUE_LEASE_SECONDS: float = 60.0
+    JOB_QUEUE_MAX_ATTEMPTS: int = 3
+    JOB_QUEUE_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_QUEUE_RETENTION_SECONDS: float = 86400.0
+
+    # Jobs each worker process runs at once
+    JOB_WORKER_CONCURRENCY: int = 8
+    # Run a worker inside the API process (single-process deployments).
+    # Disable when running `python -m app.worker`, which needs the sqlite
+    # job store so the API sees the workers' progress.
+    JOB_WORKER_EMBEDDED: bool = True
 
     # =====================================================
     # APP SETTINGS
@@ -1,5 +1,7 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
+import asyncio
+import os
 from fastapi.middleware.cors import CORSMiddleware   # ⭐ ADD THIS
 
 from app.api.routes import router
@@ -24,10 +26,53 @@ async def lifespan(app: FastAPI):
     logger.info(f"S3 Bucket: {settings.S3_BUCKET_NAME}")
     logger.info("================================================================================")
 
+    # Run queued pipeline jobs in this process unless `python -m app.worker` does
+    worker_task = None
+    stop_background = asyncio.Event()
+
+    if settings.JOB_WORKER_EMBEDDED:
+        if settings.JOB_STORE_BACKEND.lower() != "sqlite":
+            # The queue is durable but the checkpoints are not: jobs handed
+            # back after a restart would run again from the first stage
+            logger.warning(
+                "[WORKER] JOB_STORE_BACKEND is not 'sqlite'; queued jobs cannot "
+                "resume after a restart"
+            )
+
+        from app.services.job_queue import get_job_queue
+        from app.worker import PipelineWorker
+
+        app.state.pipeline_worker = PipelineWorker(
+            get_job_queue(), f"api-{os.getpid()}", settings.JOB_WORKER_CONCURRENCY
+        )
+        worker_task = asyncio.create_task(app.state.pipeline_worker.run(stop_background))
+
+    # Record uploads from S3 event notifications as they land
+    events_task = None
+
+    from app.services.upload_events import UploadEventConsumer, get_upload_event_source
+
+    source = get_upload_event_source()
+    if source is not None:
+        worker = getattr(app.state, "pipeline_worker", None)
+        app.state.upload_events = UploadEventConsumer(
+            source, on_queued=worker.wake if worker else None
+        )
+        events_task = asyncio.create_task(app.state.upload_events.run(stop_background))
+
     yield
 
     logger.info("Shutting down AI Sales Coach API...")
 
+    stop_background.set()
+
+    if events_task is not None:
+        # Don't wait out a long poll
+        events_task.cancel()
+
+    if worker_task is not None:
+        await worker_task
+
 
 # ==========================================================
 # 🚀 FASTAPI APP
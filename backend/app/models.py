@@ -22,6 +22,12 @@ class AudioUploadResponse(BaseModel):
     message: str
 
 
+class UploadCompleteRequest(BaseModel):
+    """What the client's PUT to the presigned URL reported."""
+    size: Optional[int] = None
+    etag: Optional[str] = None
+
+
 class TranscriptSegment(BaseModel):
     """Individual transcript segment with speaker."""
     speaker: str
@@ -68,4 +74,8 @@ class JobStatusResponse(BaseModel):
     current_step: str
     transcript: Optional[TranscriptResponse] = None
     report: Optional[SalesReport] = None
-    error_message: Optional[str] = None
\ No newline at end of file
+    error_message: Optional[str] = None
+    # Agent output streamed so far while the job is analyzing
+    partial_insights: Optional[List[AgentInsight]] = None
+    # SSE status events only: agent text appended since the previous event
+    partial_updates: Optional[List[AgentInsight]] = None
\ No newline at end of file
@@ -1,11 +1,102 @@
-from groq import Groq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
 from app.config import get_settings
 from app.models import SalesReport, TranscriptResponse
+from app.services.client_registry import get_groq_client
+from app.services.context_packer import pack_context
+from app.services.llm_cache import LLMCache
+from app.services.rag_service import RAGService
 from app.utils.logger import get_logger
+from app.utils.paths import resolve_data_path
+from app.utils.tokens import estimate_tokens
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+LLM_ERROR_MESSAGE = "AI analysis unavailable due to model error."
+LLM_EMPTY_MESSAGE = "No response generated."
+AGENT_TIMEOUT_MESSAGE = "AI analysis unavailable: agent timed out."
+FAILED_OUTPUTS = (LLM_ERROR_MESSAGE, AGENT_TIMEOUT_MESSAGE)
+
+# Knowledge-base queries retrieved for each agent's prompt
+AGENT_RAG_QUERIES = {
+    "Transcript Analyzer": [
+        "tone, empathy and active listening in sales conversations",
+    ],
+    "Sales Coach": [
+        "discovery questions to uncover needs, budget, authority and timeline",
+        "closing techniques to gain commitment and agree next steps",
+    ],
+    "Objection Expert": [
+        "handling price, timing, authority and competitor objections",
+    ],
+}
+
+# Receives the text generated so far by a streaming completion
+ProgressCallback = Callable[[str], None]
+# Receives (agent name, text so far) during analyze_call
+PartialInsightCallback = Callable[[str, str], None]
+
+
+def chunk_transcript(lines: List[str], max_tokens: int) -> List[str]:
+    """
+    Group "speaker: text" turns into chunks of at most max_tokens.
+
+    Chunks only break between speaker turns; a single turn longer than the
+    budget is split on word boundaries, keeping its speaker prefix.
+    """
+    chunks = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for line in lines:
+        for piece in _split_turn(line, max_tokens):
+            piece_tokens = estimate_tokens(piece) + 1
+
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n".join(current))
+                current = []
+                current_tokens = 0
+
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        chunks.append("\n".join(current))
+
+    return chunks
+
+
+def _split_turn(line: str, max_tokens: int) -> List[str]:
+    if estimate_tokens(line) < max_tokens:
+        return [line]
+
+    speaker, _, text = line.partition(": ")
+    prefix = f"{speaker}: "
+    budget = max(1, max_tokens * 4 - len(prefix) - 4)
+
+    pieces = []
+    words: List[str] = []
+    length = 0
+
+    for word in text.split():
+        if words and length + len(word) + 1 > budget:
+            pieces.append(prefix + " ".join(words))
+            words = []
+            length = 0
+
+        words.append(word)
+        length += len(word) + 1
+
+    if words:
+        pieces.append(prefix + " ".join(words))
+
+    return pieces
+
 
 class AgentOrchestrationService:
     """
@@ -13,36 +104,255 @@ class AgentOrchestrationService:
     """
 
     def __init__(self):
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
+        self.client = get_groq_client()
 
         # ✅ Always use supported Groq model
         self.model = settings.GROQ_MODEL or "llama-3.3-70b-versatile"
+        self.temperature = 0.3
+
+        # Completions for identical prompts are served from disk
+        self.cache: Optional[LLMCache] = None
+        if settings.LLM_CACHE_ENABLED:
+            self.cache = LLMCache(
+                resolve_data_path(settings.LLM_CACHE_PATH),
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+                max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            )
+
+        # Shared pool caps concurrent agent calls across all jobs
+        self.max_concurrency = max(1, settings.AGENT_MAX_CONCURRENCY)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="agent",
+        )
+
+        self._usage_lock = threading.Lock()
+        self.usage = {"llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        # Knowledge-base context tokens before and after packing
+        self.context_tokens = {"in": 0, "out": 0}
+
+        # Knowledge-base retrieval is optional; analysis runs without it
+        self.rag: Optional[RAGService] = None
+        if settings.RAG_ENABLED:
+            try:
+                self.rag = RAGService()
+            except Exception as e:
+                logger.error(f"[RAG] Retrieval disabled, service failed to start: {e}")
 
     # ───────────────────────────────────────────────
     # 🔥 SAFE CORE LLM CALL
     # ───────────────────────────────────────────────
-    def _invoke_llm(self, system_prompt: str, user_prompt: str) -> str:
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                temperature=0.3,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
+    def _invoke_llm(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> str:
+        """
+        Run one completion, abandoned after AGENT_TIMEOUT_SECONDS.
+
+        The completion is always streamed so the deadline can be checked
+        between token chunks; with on_progress the callback gets the
+        accumulated text after every chunk.
+        """
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.make_key(
+                self.model, self.temperature, system_prompt, user_prompt
             )
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                if on_progress:
+                    on_progress(cached)
+                return cached
 
-            content = response.choices[0].message.content
-            return content.strip() if content else "No response generated."
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+        try:
+            content = self._stream_completion(messages, on_progress)
+
+        except TimeoutError as e:
+            logger.error(f"[GROQ] {e}")
+            return AGENT_TIMEOUT_MESSAGE
 
         except Exception as e:
             logger.error(f"[GROQ] LLM invocation failed: {e}")
-            return "AI analysis unavailable due to model error."
+            return LLM_ERROR_MESSAGE
+
+        if not content:
+            return LLM_EMPTY_MESSAGE
+
+        content = content.strip()
+        if cache_key:
+            self._cache_set(cache_key, content)
+        return content
+
+    def _stream_completion(
+        self, messages: List[Dict], on_progress: Optional[ProgressCallback] = None
+    ) -> str:
+        # The HTTP timeout bounds each read, not the whole call; a slowly
+        # trickling stream is closed here so its executor slot is freed
+        deadline = time.monotonic() + settings.AGENT_TIMEOUT_SECONDS
+
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            temperature=self.temperature,
+            messages=messages,
+            stream=True,
+        )
+
+        content = ""
+        usage = None
+
+        for chunk in stream:
+            if time.monotonic() > deadline:
+                stream.close()
+                raise TimeoutError(
+                    f"Completion exceeded {settings.AGENT_TIMEOUT_SECONDS:g}s, stream closed"
+                )
+
+            if chunk.choices:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    content += delta
+                    if on_progress:
+                        on_progress(content)
+
+            # Groq reports token usage on the final chunk
+            x_groq = getattr(chunk, "x_groq", None)
+            if x_groq is not None and getattr(x_groq, "usage", None) is not None:
+                usage = x_groq.usage
+
+        self._record_usage(usage)
+        return content
+
+    def _record_usage(self, usage):
+        with self._usage_lock:
+            self.usage["llm_calls"] += 1
+            if usage is not None:
+                self.usage["prompt_tokens"] += usage.prompt_tokens or 0
+                self.usage["completion_tokens"] += usage.completion_tokens or 0
+
+    def _record_context_packing(self, job_id: str, packing: Dict[str, Dict]):
+        if not packing:
+            return
+
+        tokens_in = sum(stats["tokens_in"] for stats in packing.values())
+        tokens_out = sum(stats["tokens_out"] for stats in packing.values())
+
+        with self._usage_lock:
+            self.context_tokens["in"] += tokens_in
+            self.context_tokens["out"] += tokens_out
+
+        logger.info(
+            f"[RAG] Context for job {job_id}: {tokens_in} -> {tokens_out} tokens "
+            f"({tokens_in - tokens_out} saved)"
+        )
+
+    def usage_stats(self) -> Dict:
+        with self._usage_lock:
+            return {
+                **self.usage,
+                "context_tokens_retrieved": self.context_tokens["in"],
+                "context_tokens_sent": self.context_tokens["out"],
+                "context_tokens_saved": self.context_tokens["in"] - self.context_tokens["out"],
+            }
+
+    # ───────────────────────────────────────────────
+    # 💾 COMPLETION CACHE (NEVER FAILS THE CALL)
+    # ───────────────────────────────────────────────
+    def _cache_get(self, key: str) -> Optional[str]:
+        try:
+            return self.cache.get(key)
+        except Exception as e:
+            logger.warning(f"[LLM CACHE] Lookup failed: {e}")
+            return None
+
+    def _cache_set(self, key: str, content: str):
+        try:
+            self.cache.set(key, content)
+        except Exception as e:
+            logger.warning(f"[LLM CACHE] Store failed: {e}")
+
+    # ───────────────────────────────────────────────
+    # 📚 KNOWLEDGE-BASE CONTEXT (NEVER FAILS THE CALL)
+    # ───────────────────────────────────────────────
+    def _retrieve_context(
+        self, agent_name: str, packing: Optional[Dict[str, Dict]] = None
+    ) -> str:
+        """
+        Knowledge-base context for an agent, packed into its token budget,
+        or "" without RAG. Packing stats are recorded in packing[agent_name].
+        """
+        queries = AGENT_RAG_QUERIES.get(agent_name)
+        if not self.rag or not queries:
+            return ""
+
+        started = time.perf_counter()
+        try:
+            ranked = self.rag.retrieve_contexts(queries)
+        except Exception as e:
+            logger.warning(f"[RAG] Retrieval for {agent_name} failed: {e}")
+            return ""
+
+        # Interleave the queries' results so each contributes its best chunks first
+        docs = [
+            results[rank]
+            for rank in range(max(len(results) for results in ranked))
+            for results in ranked
+            if rank < len(results)
+        ]
+
+        budget = settings.RAG_AGENT_CONTEXT_BUDGETS.get(
+            agent_name, settings.RAG_CONTEXT_TOKEN_BUDGET
+        )
+        context, stats = pack_context(docs, budget)
+        if packing is not None:
+            packing[agent_name] = stats
+
+        logger.info(
+            f"[RAG] {len(docs)} context chunks for {agent_name} in "
+            f"{(time.perf_counter() - started) * 1000:.1f}ms, packed "
+            f"{stats['tokens_in']} -> {stats['tokens_out']} tokens"
+        )
+        return context
+
+    @staticmethod
+    def _context_section(context: str) -> str:
+        if not context:
+            return ""
+        return f"""
+Ground your advice in this coaching knowledge where relevant:
+{context}
+"""
+
+    def _with_context(
+        self,
+        agent_name: str,
+        agent: Callable[..., str],
+        transcript_text: str,
+        on_progress: Optional[ProgressCallback] = None,
+        packing: Optional[Dict[str, Dict]] = None,
+    ) -> str:
+        # Runs on the agent executor, so retrieval overlaps other agents' LLM calls
+        return agent(
+            transcript_text,
+            on_progress,
+            context=self._retrieve_context(agent_name, packing),
+        )
 
     # ───────────────────────────────────────────────
     # 🧠 AGENT 1 — TRANSCRIPT ANALYZER
     # ───────────────────────────────────────────────
-    def _transcript_analyzer(self, transcript_text: str) -> str:
+    def _transcript_analyzer(
+        self,
+        transcript_text: str,
+        on_progress: Optional[ProgressCallback] = None,
+        context: str = "",
+    ) -> str:
         system = "You are an expert sales conversation analyst."
 
         user = f"""
@@ -53,16 +363,21 @@ Return:
 - weaknesses
 - customer sentiment
 - conversation flow
-
+{self._context_section(context)}
 Transcript:
 {transcript_text}
 """
-        return self._invoke_llm(system, user)
+        return self._invoke_llm(system, user, on_progress)
 
     # ───────────────────────────────────────────────
     # 🎯 AGENT 2 — SALES COACH
     # ───────────────────────────────────────────────
-    def _sales_coach(self, transcript_text: str) -> str:
+    def _sales_coach(
+        self,
+        transcript_text: str,
+        on_progress: Optional[ProgressCallback] = None,
+        context: str = "",
+    ) -> str:
         system = "You are a world-class enterprise sales coach."
 
         user = f"""
@@ -73,43 +388,224 @@ Focus on:
 - closing
 - objection handling
 - tone
-
+{self._context_section(context)}
 Transcript:
 {transcript_text}
 """
-        return self._invoke_llm(system, user)
+        return self._invoke_llm(system, user, on_progress)
 
     # ───────────────────────────────────────────────
     # ⚡ AGENT 3 — OBJECTION EXPERT
     # ───────────────────────────────────────────────
-    def _objection_expert(self, transcript_text: str) -> str:
+    def _objection_expert(
+        self,
+        transcript_text: str,
+        on_progress: Optional[ProgressCallback] = None,
+        context: str = "",
+    ) -> str:
         system = "You detect objections and suggest improvements."
 
         user = f"""
 Identify objections and how well they were handled.
-
+{self._context_section(context)}
 Transcript:
 {transcript_text}
 """
-        return self._invoke_llm(system, user)
+        return self._invoke_llm(system, user, on_progress)
+
+    # ───────────────────────────────────────────────
+    # 🔀 PARALLEL FAN-OUT
+    # ───────────────────────────────────────────────
+    def _run_agents(self, tasks: Dict[str, Callable[[], str]]) -> Dict[str, str]:
+        """
+        Run independent agent calls concurrently on the shared executor.
+
+        The executor is shared by every job in the process, so a call may
+        wait for a slot behind other jobs' calls; that wait is not bounded.
+        Once running, each call stops itself after AGENT_TIMEOUT_SECONDS
+        (see _stream_completion) and returns the timeout fallback. A call
+        that raises gets a fallback message so the other results are kept.
+        """
+        started = time.monotonic()
+
+        futures = {
+            name: self.executor.submit(task)
+            for name, task in tasks.items()
+        }
+
+        outputs = {}
+        for name, future in futures.items():
+            try:
+                outputs[name] = future.result()
+
+            except Exception as e:
+                logger.error(f"[GROQ] {name} failed: {e}")
+                outputs[name] = LLM_ERROR_MESSAGE
+
+        failed = [name for name, output in outputs.items() if output in FAILED_OUTPUTS]
+        if failed:
+            logger.warning(f"[GROQ] Partial analysis, failed agents: {failed}")
+
+        logger.info(
+            f"[GROQ] {len(tasks)} agent calls finished in "
+            f"{time.monotonic() - started:.2f}s"
+        )
+        return outputs
+
+    # ───────────────────────────────────────────────
+    # 🧩 MAP-REDUCE FOR LONG TRANSCRIPTS
+    # ───────────────────────────────────────────────
+    def _map_reduce(
+        self,
+        agents: Dict[str, Callable[..., str]],
+        lines: List[str],
+        on_partial: Optional[PartialInsightCallback] = None,
+        packing: Optional[Dict[str, Dict]] = None,
+    ) -> Dict[str, str]:
+        """
+        Run every agent over token-budgeted transcript chunks in parallel,
+        then merge each agent's partial findings with one reduce call.
+        Knowledge-base context is added to the reduce step only, and only
+        the reduce step is streamed to on_partial.
+        """
+        chunks = chunk_transcript(lines, settings.ANALYSIS_CHUNK_TOKENS)
+        logger.info(f"[GROQ] Map-reduce analysis over {len(chunks)} chunks")
+
+        map_tasks = {}
+        for name, agent in agents.items():
+            for i, chunk in enumerate(chunks, 1):
+                excerpt = f"[Excerpt {i} of {len(chunks)} from a longer call]\n{chunk}"
+                map_tasks[f"{name} #{i}"] = partial(agent, excerpt)
+
+        partials = self._run_agents(map_tasks)
+
+        reduce_tasks = {
+            name: partial(
+                self._reduce_findings,
+                name,
+                [partials[f"{name} #{i}"] for i in range(1, len(chunks) + 1)],
+                self._agent_progress(on_partial, name),
+                packing,
+            )
+            for name in agents
+        }
+
+        return self._run_agents(reduce_tasks)
+
+    def _reduce_findings(
+        self,
+        agent_name: str,
+        findings: List[str],
+        on_progress: Optional[ProgressCallback] = None,
+        packing: Optional[Dict[str, Dict]] = None,
+    ) -> str:
+        findings = [finding for finding in findings if finding not in FAILED_OUTPUTS]
+
+        if not findings:
+            return LLM_ERROR_MESSAGE
+
+        if len(findings) == 1:
+            if on_progress:
+                on_progress(findings[0])
+            return findings[0]
+
+        system = f"You are the {agent_name} on a sales coaching team."
+
+        excerpts = "\n\n".join(
+            f"### Excerpt {i}\n{finding}" for i, finding in enumerate(findings, 1)
+        )
+
+        user = f"""
+You analysed one long sales call in consecutive excerpts.
+Merge these partial findings into a single analysis of the whole call,
+in the same format. Remove duplicates and keep the most important points.
+
+Partial findings:
+{excerpts}
+{self._context_section(self._retrieve_context(agent_name, packing))}"""
+        return self._invoke_llm(system, user, on_progress)
+
+    @staticmethod
+    def _agent_progress(
+        on_partial: Optional[PartialInsightCallback], agent_name: str
+    ) -> Optional[ProgressCallback]:
+        return partial(on_partial, agent_name) if on_partial else None
 
     # ───────────────────────────────────────────────
     # 🚀 MAIN PIPELINE
     # ───────────────────────────────────────────────
-    def analyze_call(self, job_id: str, transcript: TranscriptResponse) -> SalesReport:
+    def run_agents(
+        self,
+        job_id: str,
+        transcript: TranscriptResponse,
+        on_partial: Optional[PartialInsightCallback] = None,
+        previous_outputs: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, str]:
+        """
+        Run the agents and return their outputs by name.
+
+        Agents with a usable output in previous_outputs (from an earlier,
+        partially failed run) are not called again. on_partial(agent_name,
+        text_so_far) is called from worker threads as completions stream in.
+        """
 
         logger.info(f"[GROQ] Running agent orchestration for job {job_id}")
 
         if not transcript or not transcript.segments:
             raise Exception("Transcript is empty — cannot run analysis.")
 
-        transcript_text = "\n".join(
-            [f"{seg.speaker}: {seg.text}" for seg in transcript.segments]
-        )
+        lines = [f"{seg.speaker}: {seg.text}" for seg in transcript.segments]
+        transcript_text = "\n".join(lines)
+
+        agents = {
+            "Transcript Analyzer": self._transcript_analyzer,
+            "Sales Coach": self._sales_coach,
+            "Objection Expert": self._objection_expert,
+        }
+
+        outputs = {
+            name: output
+            for name, output in (previous_outputs or {}).items()
+            if name in agents and output not in FAILED_OUTPUTS
+        }
+        agents = {name: agent for name, agent in agents.items() if name not in outputs}
+
+        if outputs:
+            logger.info(f"[GROQ] Reusing {len(outputs)} agent outputs, running {list(agents)}")
+
+        if not agents:
+            return outputs
 
-        analyzer_output = self._transcript_analyzer(transcript_text)
-        coach_output = self._sales_coach(transcript_text)
-        objection_output = self._objection_expert(transcript_text)
+        # Context packing stats per agent, filled in from worker threads
+        packing: Dict[str, Dict] = {}
+
+        if estimate_tokens(transcript_text) > settings.ANALYSIS_MAP_REDUCE_THRESHOLD_TOKENS:
+            outputs.update(self._map_reduce(agents, lines, on_partial, packing))
+        else:
+            outputs.update(self._run_agents(
+                {
+                    name: partial(
+                        self._with_context,
+                        name,
+                        agent,
+                        transcript_text,
+                        self._agent_progress(on_partial, name),
+                        packing,
+                    )
+                    for name, agent in agents.items()
+                }
+            ))
+
+        self._record_context_packing(job_id, packing)
+
+        return outputs
+
+    def build_report(self, job_id: str, outputs: Dict[str, str]) -> SalesReport:
+        """Assemble the report from run_agents() outputs."""
+
+        analyzer_output = outputs["Transcript Analyzer"]
+        coach_output = outputs["Sales Coach"]
+        objection_output = outputs["Objection Expert"]
 
         # ✅ FINAL STRUCTURE MATCHES YOUR PYDANTIC MODEL
         return SalesReport(
@@ -146,3 +642,12 @@ Transcript:
                 },
             ],
         )
+
+    def analyze_call(
+        self,
+        job_id: str,
+        transcript: TranscriptResponse,
+        on_partial: Optional[PartialInsightCallback] = None,
+    ) -> SalesReport:
+        """Run all agents and build the report."""
+        return self.build_report(job_id, self.run_agents(job_id, transcript, on_partial))
@@ -0,0 +1,160 @@
+import threading
+from typing import Dict, Optional
+
+import boto3
+import httpx
+from botocore.client import BaseClient, Config
+from groq import Groq
+
+from app.config import get_settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+_lock = threading.Lock()
+_boto3_clients: Dict[str, BaseClient] = {}
+_groq_client: Optional[Groq] = None
+_pool_monitors: Dict[str, "PoolMonitor"] = {}
+
+
+class PoolMonitor:
+    """Tracks in-flight requests on one client against its pool size."""
+
+    def __init__(self, name: str, max_connections: int):
+        self.name = name
+        self.max_connections = max_connections
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.saturated_requests = 0
+
+    def request_started(self, **kwargs):
+        with self._lock:
+            if self.in_flight >= self.max_connections:
+                self.saturated_requests += 1
+            self.in_flight += 1
+            self.requests += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def request_finished(self, **kwargs):
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "max_connections": self.max_connections,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "requests": self.requests,
+                # Requests issued while every pooled connection was busy
+                "saturated_requests": self.saturated_requests,
+                "peak_utilization": round(self.peak_in_flight / self.max_connections, 3),
+            }
+
+
+class _MonitoredTransport(httpx.HTTPTransport):
+    def __init__(self, monitor: PoolMonitor, **kwargs):
+        super().__init__(**kwargs)
+        self.monitor = monitor
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.monitor.request_started()
+        try:
+            return super().handle_request(request)
+        finally:
+            self.monitor.request_finished()
+
+
+def _credentials() -> Dict[str, str]:
+    # Empty settings fall through to the default AWS credential chain
+    credentials = {}
+    if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
+        credentials["aws_access_key_id"] = settings.AWS_ACCESS_KEY_ID
+        credentials["aws_secret_access_key"] = settings.AWS_SECRET_ACCESS_KEY
+    return credentials
+
+
+def get_boto3_client(service_name: str) -> BaseClient:
+    """
+    Process-wide boto3 client for an AWS service.
+
+    Each client is created once with a tuned connection pool, keep-alive and
+    retry config, and shared by every service and agent (boto3 clients are
+    thread-safe). S3 clients always sign with SigV4 so presigned browser
+    uploads work.
+    """
+    client = _boto3_clients.get(service_name)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _boto3_clients.get(service_name)
+        if client is not None:
+            return client
+
+        config = Config(
+            region_name=settings.AWS_REGION,
+            signature_version="s3v4" if service_name == "s3" else None,
+            max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS,
+            tcp_keepalive=True,
+            connect_timeout=settings.AWS_CONNECT_TIMEOUT_SECONDS,
+            read_timeout=settings.AWS_READ_TIMEOUT_SECONDS,
+            retries={
+                "max_attempts": settings.AWS_MAX_RETRY_ATTEMPTS,
+                "mode": "adaptive",
+            },
+        )
+
+        client = boto3.client(service_name, config=config, **_credentials())
+
+        monitor = PoolMonitor(f"aws:{service_name}", settings.AWS_MAX_POOL_CONNECTIONS)
+        client.meta.events.register("before-send", monitor.request_started)
+        client.meta.events.register("response-received", monitor.request_finished)
+
+        _pool_monitors[monitor.name] = monitor
+        _boto3_clients[service_name] = client
+
+        logger.info(f"[CLIENTS] Created shared {service_name} client")
+        return client
+
+
+def get_groq_client() -> Groq:
+    """Process-wide Groq client on a pooled keep-alive HTTP connection pool."""
+    global _groq_client
+
+    if _groq_client is not None:
+        return _groq_client
+
+    with _lock:
+        if _groq_client is None:
+            monitor = PoolMonitor("groq", settings.GROQ_MAX_CONNECTIONS)
+            http_client = httpx.Client(
+                transport=_MonitoredTransport(
+                    monitor,
+                    limits=httpx.Limits(
+                        max_connections=settings.GROQ_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.GROQ_MAX_CONNECTIONS,
+                        keepalive_expiry=60.0,
+                    ),
+                    retries=1,
+                ),
+                timeout=settings.AGENT_TIMEOUT_SECONDS,
+            )
+
+            _groq_client = Groq(
+                api_key=settings.GROQ_API_KEY,
+                timeout=settings.AGENT_TIMEOUT_SECONDS,
+                http_client=http_client,
+            )
+            _pool_monitors[monitor.name] = monitor
+
+            logger.info("[CLIENTS] Created shared Groq client")
+
+    return _groq_client
+
+
+def pool_stats() -> Dict[str, Dict]:
+    return {name: monitor.stats() for name, monitor in _pool_monitors.items()}
@@ -0,0 +1,155 @@
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.tokens import estimate_tokens
+
+CONTEXT_HEADER = "# SALES COACHING KNOWLEDGE BASE\n\n"
+
+# Shortest suffix/prefix match treated as chunk overlap when chunks carry
+# no start_index (artifacts built before it was recorded)
+MIN_TEXT_OVERLAP = 30
+# Whitespace the splitter strips between two adjacent chunks
+MAX_MERGE_GAP = 2
+# Don't bother truncating a chunk into a smaller remaining budget
+MIN_TRUNCATED_TOKENS = 50
+
+
+def _section(i: int, doc: Dict) -> str:
+    category = doc["metadata"].get("category", "general")
+    return f"## Context {i} ({category})\n{doc['content']}\n\n"
+
+
+def format_context(context_docs: List[Dict]) -> str:
+    """Every chunk verbatim, in the given order."""
+    return CONTEXT_HEADER + "".join(
+        _section(i, doc) for i, doc in enumerate(context_docs, 1)
+    )
+
+
+def _text_overlap(first: str, second: str) -> int:
+    """Length of the longest suffix of first that is a prefix of second."""
+    probe = second[:MIN_TEXT_OVERLAP]
+    if len(probe) < MIN_TEXT_OVERLAP:
+        return 0
+
+    position = first.find(probe)
+    while position != -1:
+        if second.startswith(first[position:]):
+            return len(first) - position
+        position = first.find(probe, position + 1)
+
+    return 0
+
+
+def _join(first: Dict, second: Dict) -> Optional[Dict]:
+    """first followed by second as one chunk, if they overlap or touch."""
+    if first["metadata"].get("source") != second["metadata"].get("source"):
+        return None
+
+    a, b = first["content"], second["content"]
+    start_a = first["metadata"].get("start_index")
+    start_b = second["metadata"].get("start_index")
+
+    if start_a is not None and start_b is not None:
+        end_a = start_a + len(a)
+        if not start_a <= start_b <= end_a + MAX_MERGE_GAP:
+            return None
+        overlap = end_a - start_b
+        content = a + b[overlap:] if overlap >= 0 else a + "\n" + b
+    else:
+        overlap = _text_overlap(a, b)
+        if not overlap:
+            return None
+        content = a + b[overlap:]
+
+    return {
+        "content": content,
+        "metadata": dict(first["metadata"]),
+        "rank": min(first["rank"], second["rank"]),
+    }
+
+
+def _truncate(content: str, max_chars: int) -> str:
+    """Cut at the last line or sentence break that fits."""
+    cut = content[:max_chars]
+    boundary = max(cut.rfind("\n"), cut.rfind(". "))
+    return cut[: boundary + 1].rstrip() if boundary > max_chars // 2 else cut.rstrip()
+
+
+def pack_context(context_docs: List[Dict], max_tokens: Optional[int] = None) -> Tuple[str, Dict]:
+    """
+    Pack retrieved chunks into a prompt section within a token budget.
+
+    context_docs must be ordered most relevant first. Duplicate and
+    contained chunks are dropped, overlapping or adjacent chunks of the
+    same source are merged into one passage, and passages are added in
+    relevance order until max_tokens is reached (the last one truncated at
+    a sentence break if enough budget remains).
+
+    Returns:
+        (prompt section, stats with tokens before/after packing)
+    """
+    entries: List[Dict] = []
+    deduped = 0
+
+    for rank, doc in enumerate(context_docs):
+        if any(doc["content"] in kept["content"] for kept in entries):
+            deduped += 1
+            continue
+        entries.append({"content": doc["content"], "metadata": doc["metadata"], "rank": rank})
+
+    merged = 0
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(entries)):
+            for j in range(len(entries)):
+                if i == j:
+                    continue
+                joined = _join(entries[i], entries[j])
+                if joined is not None:
+                    entries[i] = joined
+                    del entries[j]
+                    merged += 1
+                    changed = True
+                    break
+            if changed:
+                break
+
+    entries.sort(key=lambda entry: entry["rank"])
+
+    packed = CONTEXT_HEADER
+    included = 0
+    truncated = 0
+
+    for entry in entries:
+        section = _section(included + 1, entry)
+
+        if max_tokens is not None and estimate_tokens(packed + section) > max_tokens:
+            remaining = max_tokens - estimate_tokens(packed + _section(included + 1, {**entry, "content": ""}))
+            if remaining < MIN_TRUNCATED_TOKENS:
+                break
+            section = _section(included + 1, {**entry, "content": _truncate(entry["content"], remaining * 4)})
+            truncated += 1
+            packed += section
+            included += 1
+            break
+
+        packed += section
+        included += 1
+
+    if not included:
+        packed = ""
+
+    tokens_in = estimate_tokens(format_context(context_docs)) if context_docs else 0
+    tokens_out = estimate_tokens(packed)
+
+    return packed, {
+        "chunks_in": len(context_docs),
+        "passages_out": included,
+        "deduplicated": deduped,
+        "merged": merged,
+        "truncated": truncated,
+        "tokens_in": tokens_in,
+        "tokens_out": tokens_out,
+        "tokens_saved": tokens_in - tokens_out,
+    }
@@ -0,0 +1,206 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.utils.logger import get_logger
+from app.utils.sqlite import SQLiteDatabase
+
+logger = get_logger(__name__)
+
+
+class EmbeddingStore:
+    """
+    On-disk vectors keyed on (model, text hash).
+
+    Vectors are stored as raw float32 blobs (4 bytes per dimension) in
+    SQLite, so every worker and every index rebuild shares them.
+    """
+
+    LOOKUP_BATCH = 500
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db = SQLiteDatabase(path)
+
+        self.db.connection().execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " vector BLOB NOT NULL,"
+            " created REAL NOT NULL)"
+        )
+
+        logger.info(f"[EMBEDDINGS] On-disk store at {path}")
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        conn = self.db.connection()
+        found = {}
+
+        for start in range(0, len(keys), self.LOOKUP_BATCH):
+            batch = keys[start:start + self.LOOKUP_BATCH]
+            rows = conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                batch,
+            ).fetchall()
+
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+
+        return found
+
+    def put_many(self, vectors: Dict[str, List[float]]):
+        now = time.time()
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, created) VALUES (?, ?, ?)",
+                [
+                    (key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                    for key, vector in vectors.items()
+                ],
+            )
+
+    def count(self) -> int:
+        return self.db.connection().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that deduplicates, caches and batches requests.
+
+    Texts already in the store (or, for queries, the in-memory LRU) are
+    served without a model call. The rest are split into batches of
+    batch_size and embedded by at most max_concurrency threads; each batch
+    is persisted as soon as it returns, so an interrupted rebuild keeps its
+    progress.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_id: str,
+        store: Optional[EmbeddingStore] = None,
+        batch_size: int = 16,
+        max_concurrency: int = 4,
+        query_cache_size: int = 1024,
+    ):
+        self.embeddings = embeddings
+        self.model_id = model_id
+        self.store = store
+        self.batch_size = max(1, batch_size)
+        self.query_cache_size = query_cache_size
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_concurrency), thread_name_prefix="embed"
+        )
+        self._lock = threading.Lock()
+        self._query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._metrics = {
+            "texts": 0,
+            "query_cache_hits": 0,
+            "store_hits": 0,
+            "embedded": 0,
+            "batches": 0,
+        }
+
+    # ======================================================
+    # EMBEDDINGS INTERFACE
+    # ======================================================
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [EmbeddingStore.make_key(self.model_id, text) for text in texts]
+        unique = dict(zip(keys, texts))
+
+        vectors = self.store.get_many(list(unique)) if self.store else {}
+        missing = [(key, text) for key, text in unique.items() if key not in vectors]
+
+        self._count("texts", len(unique))
+        self._count("store_hits", len(unique) - len(missing))
+
+        if missing:
+            vectors.update(self._embed_missing(missing))
+
+        return [np.asarray(vectors[key], dtype=np.float32).tolist() for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Query vectors from the in-memory LRU; misses go through embed_documents in one call."""
+        keys = [EmbeddingStore.make_key(self.model_id, text) for text in texts]
+        vectors = {}
+
+        with self._lock:
+            for key in keys:
+                vector = self._query_cache.get(key)
+                if vector is not None:
+                    self._query_cache.move_to_end(key)
+                    vectors[key] = vector
+            hits = sum(1 for key in keys if key in vectors)
+            self._metrics["texts"] += hits
+            self._metrics["query_cache_hits"] += hits
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            vectors.update(zip(missing, self.embed_documents(list(missing.values()))))
+
+            with self._lock:
+                for key in missing:
+                    self._query_cache[key] = vectors[key]
+                while len(self._query_cache) > self.query_cache_size:
+                    self._query_cache.popitem(last=False)
+
+        return [vectors[key] for key in keys]
+
+    # ======================================================
+    # BATCHED MODEL CALLS
+    # ======================================================
+    def _embed_missing(self, missing: List[Tuple[str, str]]) -> Dict[str, List[float]]:
+        batches = [
+            missing[start:start + self.batch_size]
+            for start in range(0, len(missing), self.batch_size)
+        ]
+        futures = {
+            self._executor.submit(self.embeddings.embed_documents, [text for _, text in batch]): batch
+            for batch in batches
+        }
+
+        vectors = {}
+        for future in as_completed(futures):
+            batch = futures[future]
+            embedded = dict(zip((key for key, _ in batch), future.result()))
+
+            if self.store:
+                self.store.put_many(embedded)
+
+            vectors.update(embedded)
+            self._count("batches")
+            self._count("embedded", len(batch))
+
+        logger.info(f"[EMBEDDINGS] Embedded {len(missing)} texts in {len(batches)} batches")
+        return vectors
+
+    # ======================================================
+    # METRICS
+    # ======================================================
+    def _count(self, metric: str, amount: int = 1):
+        with self._lock:
+            self._metrics[metric] += amount
+
+    def stats(self) -> Dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+
+        served = metrics["query_cache_hits"] + metrics["store_hits"]
+        metrics.update({
+            "stored_vectors": self.store.count() if self.store else 0,
+            "hit_rate": round(served / metrics["texts"], 3) if metrics["texts"] else 0.0,
+        })
+        return metrics
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+from typing import Dict, List, Tuple
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class JobEventBus:
+    """
+    In-process fan-out of job status updates to async subscribers.
+
+    publish() is safe to call from any thread; each event is delivered on
+    the subscriber's own event loop. Updates written by other worker
+    processes are not seen here, so subscribers also re-read the job store
+    on their heartbeat.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append((loop, queue))
+
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = [
+                entry for entry in self._subscribers.get(job_id, [])
+                if entry[1] is not queue
+            ]
+
+            if subscribers:
+                self._subscribers[job_id] = subscribers
+            else:
+                self._subscribers.pop(job_id, None)
+
+    def publish(self, job_id: str, event: Dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(job_id, []))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # Subscriber's loop already closed
+                self.unsubscribe(job_id, queue)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._subscribers.values())
+
+
+job_events = JobEventBus()
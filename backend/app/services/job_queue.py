@@ -0,0 +1,314 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+from app.config import get_settings
+from app.utils.logger import get_logger
+from app.utils.paths import resolve_data_path
+from app.utils.sqlite import SQLiteDatabase
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobQueue(ABC):
+    """
+    Durable queue of pipeline jobs, consumed by worker processes.
+
+    A worker claims a job with a lease and must extend it while the job
+    runs. If the worker dies, the lease expires and the job is handed to
+    the next worker that asks, up to max_attempts claims in total. A job
+    that runs out of attempts is passed to on_abandon(job_id, error).
+    """
+
+    def __init__(
+        self,
+        lease_seconds: float,
+        max_attempts: int,
+        on_abandon: Optional[Callable[[str, str], None]] = None,
+    ):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.on_abandon = on_abandon
+
+    def _abandoned(self, job_id: str, error: str):
+        if self.on_abandon is None:
+            return
+
+        try:
+            self.on_abandon(job_id, error)
+        except Exception as e:
+            logger.error(f"[QUEUE] Failed to mark abandoned job {job_id}: {e}")
+
+    # ======================================================
+    # BROKER INTERFACE
+    # ======================================================
+    @abstractmethod
+    def enqueue(self, job_id: str, payload: Dict) -> bool:
+        """Queue a job; False if it is already queued or running."""
+
+    @abstractmethod
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        """Lease the oldest runnable job: {job_id, payload, attempts}, or None."""
+
+    @abstractmethod
+    def extend(self, job_id: str, worker_id: str) -> bool:
+        """Renew a lease; False if the worker no longer holds it."""
+
+    @abstractmethod
+    def release(self, job_id: str, worker_id: str):
+        """Hand a leased job back without counting the attempt (shutdown)."""
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str):
+        """Mark a leased job done."""
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str):
+        """Mark a leased job failed; it is not retried."""
+
+    @abstractmethod
+    def stats(self) -> Dict:
+        """Queue depth, in-flight jobs and recent throughput."""
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    Job queue in a SQLite file in WAL mode, shared by the API and every
+    worker process on the host.
+
+    Claims run in a BEGIN IMMEDIATE transaction, so two workers never lease
+    the same job. Finished jobs are kept for retention_seconds for the
+    throughput metrics, then pruned.
+    """
+
+    PRUNE_EVERY_WRITES = 100
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float,
+        max_attempts: int,
+        retention_seconds: float,
+        on_abandon: Optional[Callable[[str, str], None]] = None,
+    ):
+        super().__init__(lease_seconds, max_attempts, on_abandon)
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self.db = SQLiteDatabase(path)
+        self._writes_since_prune = 0
+
+        with self.db.transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_queue ("
+                " job_id TEXT PRIMARY KEY,"
+                " payload TEXT NOT NULL,"
+                " state TEXT NOT NULL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " worker_id TEXT,"
+                " lease_expires REAL,"
+                " enqueued_at REAL NOT NULL,"
+                " claimed_at REAL,"
+                " finished_at REAL,"
+                " error TEXT)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS job_queue_state ON job_queue (state, enqueued_at)"
+            )
+
+        logger.info(f"[QUEUE] SQLite job queue at {path}")
+
+    # ======================================================
+    # PRODUCER
+    # ======================================================
+    def enqueue(self, job_id: str, payload: Dict) -> bool:
+        # Finished jobs may be queued again; queued or leased ones are left alone
+        cursor = self.db.connection().execute(
+            "INSERT INTO job_queue (job_id, payload, state, enqueued_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (job_id) DO UPDATE SET "
+            "payload = excluded.payload, state = excluded.state, attempts = 0, "
+            "worker_id = NULL, lease_expires = NULL, enqueued_at = excluded.enqueued_at, "
+            "claimed_at = NULL, finished_at = NULL, error = NULL "
+            "WHERE job_queue.state IN (?, ?)",
+            (job_id, json.dumps(payload), QUEUED, time.time(), DONE, FAILED),
+        )
+
+        queued = cursor.rowcount == 1
+        if queued:
+            logger.info(f"[QUEUE] Enqueued job {job_id}")
+        return queued
+
+    # ======================================================
+    # CONSUMER
+    # ======================================================
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        now = time.time()
+        abandoned = []
+
+        with self.db.transaction() as conn:
+            while True:
+                row = conn.execute(
+                    "SELECT job_id, payload, attempts, state FROM job_queue "
+                    "WHERE state = ? OR (state = ? AND lease_expires < ?) "
+                    "ORDER BY enqueued_at LIMIT 1",
+                    (QUEUED, LEASED, now),
+                ).fetchone()
+
+                if row is None:
+                    break
+
+                job_id, payload, attempts, state = row
+
+                if attempts >= self.max_attempts:
+                    # Its workers keep dying; stop handing it out
+                    error = f"Lease expired {attempts} times"
+                    conn.execute(
+                        "UPDATE job_queue SET state = ?, finished_at = ?, error = ?, "
+                        "worker_id = NULL, lease_expires = NULL WHERE job_id = ?",
+                        (FAILED, now, error, job_id),
+                    )
+                    logger.error(f"[QUEUE] Job {job_id} abandoned after {attempts} attempts")
+                    abandoned.append((job_id, error))
+                    continue
+
+                conn.execute(
+                    "UPDATE job_queue SET state = ?, worker_id = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, claimed_at = ? WHERE job_id = ?",
+                    (LEASED, worker_id, now + self.lease_seconds, now, job_id),
+                )
+                break
+
+        # Outside the transaction, so the callback's own writes never wait on it
+        for abandoned_id, error in abandoned:
+            self._abandoned(abandoned_id, error)
+
+        if row is None:
+            return None
+
+        if state == LEASED:
+            logger.warning(f"[QUEUE] Reclaimed job {job_id} after an expired lease")
+
+        return {"job_id": job_id, "payload": json.loads(payload), "attempts": attempts + 1}
+
+    def extend(self, job_id: str, worker_id: str) -> bool:
+        cursor = self.db.connection().execute(
+            "UPDATE job_queue SET lease_expires = ? "
+            "WHERE job_id = ? AND worker_id = ? AND state = ?",
+            (time.time() + self.lease_seconds, job_id, worker_id, LEASED),
+        )
+        return cursor.rowcount == 1
+
+    def release(self, job_id: str, worker_id: str):
+        self.db.connection().execute(
+            "UPDATE job_queue SET state = ?, worker_id = NULL, lease_expires = NULL, "
+            "attempts = MAX(attempts - 1, 0) "
+            "WHERE job_id = ? AND worker_id = ? AND state = ?",
+            (QUEUED, job_id, worker_id, LEASED),
+        )
+        logger.info(f"[QUEUE] Released job {job_id}")
+
+    def _finish(self, job_id: str, worker_id: str, state: str, error: Optional[str] = None):
+        self.db.connection().execute(
+            "UPDATE job_queue SET state = ?, finished_at = ?, error = ?, lease_expires = NULL "
+            "WHERE job_id = ? AND worker_id = ? AND state = ?",
+            (state, time.time(), error, job_id, worker_id, LEASED),
+        )
+        self._maybe_prune()
+
+    def complete(self, job_id: str, worker_id: str):
+        self._finish(job_id, worker_id, DONE)
+
+    def fail(self, job_id: str, worker_id: str, error: str):
+        self._finish(job_id, worker_id, FAILED, error)
+
+    # ======================================================
+    # METRICS
+    # ======================================================
+    def stats(self) -> Dict:
+        now = time.time()
+        conn = self.db.connection()
+
+        counts = {QUEUED: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        for state, count in conn.execute(
+            "SELECT state, COUNT(*) FROM job_queue GROUP BY state"
+        ):
+            counts[state] = count
+
+        expired_leases, oldest_queued = conn.execute(
+            "SELECT"
+            " (SELECT COUNT(*) FROM job_queue WHERE state = ? AND lease_expires < ?),"
+            " (SELECT MIN(enqueued_at) FROM job_queue WHERE state = ?)",
+            (LEASED, now, QUEUED),
+        ).fetchone()
+
+        window = 300.0
+        finished, failed, avg_wait, avg_run = conn.execute(
+            "SELECT COUNT(*), SUM(state = ?), AVG(claimed_at - enqueued_at), AVG(finished_at - claimed_at) "
+            "FROM job_queue WHERE state IN (?, ?) AND finished_at >= ?",
+            (FAILED, DONE, FAILED, now - window),
+        ).fetchone()
+
+        return {
+            "backend": type(self).__name__,
+            "depth": counts[QUEUED],
+            "in_flight": counts[LEASED] - expired_leases,
+            "expired_leases": expired_leases,
+            "done": counts[DONE],
+            "failed": counts[FAILED],
+            "oldest_queued_seconds": round(now - oldest_queued, 1) if oldest_queued else 0.0,
+            "finished_last_5m": finished,
+            "failed_last_5m": failed or 0,
+            "throughput_per_minute": round(finished / (window / 60), 2),
+            "avg_wait_seconds": round(avg_wait, 2) if avg_wait is not None else None,
+            "avg_run_seconds": round(avg_run, 2) if avg_run is not None else None,
+            "lease_seconds": self.lease_seconds,
+            "max_attempts": self.max_attempts,
+        }
+
+    # ======================================================
+    # RETENTION
+    # ======================================================
+    def _maybe_prune(self):
+        self._writes_since_prune += 1
+        if self._writes_since_prune < self.PRUNE_EVERY_WRITES:
+            return
+
+        self._writes_since_prune = 0
+        self.prune()
+
+    def prune(self):
+        """Drop finished jobs older than retention_seconds."""
+        self.db.connection().execute(
+            "DELETE FROM job_queue WHERE state IN (?, ?) AND finished_at < ?",
+            (DONE, FAILED, time.time() - self.retention_seconds),
+        )
+
+
+def _fail_abandoned_job(job_id: str, error: str):
+    # Imported here so the queue stays usable without the pipeline's clients
+    from app.services.pipeline import fail_abandoned_job
+
+    fail_abandoned_job(job_id, error)
+
+
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    backend = settings.JOB_QUEUE_BACKEND.lower()
+
+    if backend == "sqlite":
+        return SQLiteJobQueue(
+            resolve_data_path(settings.JOB_QUEUE_SQLITE_PATH),
+            lease_seconds=settings.JOB_QUEUE_LEASE_SECONDS,
+            max_attempts=settings.JOB_QUEUE_MAX_ATTEMPTS,
+            retention_seconds=settings.JOB_QUEUE_RETENTION_SECONDS,
+            on_abandon=_fail_abandoned_job,
+        )
+
+    raise ValueError(f"Unknown JOB_QUEUE_BACKEND: {settings.JOB_QUEUE_BACKEND}")
@@ -0,0 +1,408 @@
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional
+
+from app.config import get_settings
+from app.models import SalesReport, TranscriptResponse
+from app.utils.logger import get_logger
+from app.utils.paths import resolve_data_path
+from app.utils.sqlite import SQLiteDatabase
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class JobStore(ABC):
+    """
+    Storage for pipeline job state.
+
+    A job is a small JSON record (status, progress, step, error, ...) read on
+    every status poll, plus named payloads (transcript, report, streamed
+    partial insights) stored out-of-line so status reads never deserialize
+    them.
+
+    Parsed transcripts are also kept in a small per-process LRU, checked
+    against the transcript ETag in the record, so analysis and repeated
+    reads skip deserializing the payload.
+    """
+
+    def __init__(self, max_jobs: int, ttl_seconds: float, transcript_cache_size: int = 0):
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+
+        self.transcript_cache_size = transcript_cache_size
+        self._transcripts_lock = threading.Lock()
+        self._transcripts: "OrderedDict[str, tuple]" = OrderedDict()
+
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "reads": 0,
+            "writes": 0,
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "transcript_cache_hits": 0,
+        }
+
+    # ======================================================
+    # BACKEND INTERFACE
+    # ======================================================
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return the job record, or None if unknown or expired."""
+
+    @abstractmethod
+    def update(self, job_id: str, **fields) -> Dict:
+        """Merge fields into the job record (creating it) and return it."""
+
+    @abstractmethod
+    def put_payload(self, job_id: str, name: str, body: str):
+        """Store a serialized payload under a job."""
+
+    @abstractmethod
+    def get_payload(self, job_id: str, name: str) -> Optional[str]:
+        """Return a serialized payload, or None."""
+
+    @abstractmethod
+    def delete(self, job_id: str):
+        """Remove a job and its payloads."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of jobs currently stored."""
+
+    # ======================================================
+    # TYPED PAYLOAD HELPERS
+    # ======================================================
+    @staticmethod
+    def _etag(body: str) -> str:
+        return hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]
+
+    def _save_model(self, job_id: str, name: str, body: str) -> str:
+        # Recording the ETag alongside has_<name> lets conditional requests
+        # be answered from the small job record alone.
+        etag = self._etag(body)
+        self.put_payload(job_id, name, body)
+        self.update(job_id, **{f"has_{name}": True, f"{name}_etag": etag})
+        return etag
+
+    def save_transcript(self, job_id: str, transcript: TranscriptResponse):
+        etag = self._save_model(job_id, "transcript", transcript.model_dump_json())
+        self._cache_transcript(job_id, etag, transcript)
+
+    def get_transcript(self, job_id: str) -> Optional[TranscriptResponse]:
+        """The parsed transcript; shared with other readers, do not modify."""
+        etag = (self.get(job_id) or {}).get("transcript_etag")
+
+        with self._transcripts_lock:
+            cached = self._transcripts.get(job_id)
+            if cached is not None and etag and cached[0] == etag:
+                self._transcripts.move_to_end(job_id)
+                self._count("transcript_cache_hits")
+                return cached[1]
+
+        body = self.get_payload(job_id, "transcript")
+        if not body:
+            return None
+
+        transcript = TranscriptResponse.model_validate_json(body)
+        self._cache_transcript(job_id, self._etag(body), transcript)
+        return transcript
+
+    def _cache_transcript(self, job_id: str, etag: str, transcript: TranscriptResponse):
+        if self.transcript_cache_size <= 0:
+            return
+
+        with self._transcripts_lock:
+            self._transcripts[job_id] = (etag, transcript)
+            self._transcripts.move_to_end(job_id)
+
+            while len(self._transcripts) > self.transcript_cache_size:
+                self._transcripts.popitem(last=False)
+
+    def save_report(self, job_id: str, report: SalesReport):
+        self._save_model(job_id, "report", report.model_dump_json())
+
+    def get_report(self, job_id: str) -> Optional[SalesReport]:
+        body = self.get_payload(job_id, "report")
+        return SalesReport.model_validate_json(body) if body else None
+
+    def save_partial_insights(self, job_id: str, partials: Dict[str, str], version: int) -> Dict:
+        # The text lives in a payload; the record only carries a version
+        # counter, so record reads and status events stay small
+        self.put_payload(job_id, "partial_insights", json.dumps(partials))
+        return self.update(job_id, partial_version=version)
+
+    def get_partial_insights(self, job_id: str) -> Dict[str, str]:
+        body = self.get_payload(job_id, "partial_insights")
+        return json.loads(body) if body else {}
+
+    def clear_partial_insights(self, job_id: str):
+        self.put_payload(job_id, "partial_insights", "")
+
+    def __contains__(self, job_id: str) -> bool:
+        return self.get(job_id) is not None
+
+    # ======================================================
+    # METRICS
+    # ======================================================
+    def _count(self, metric: str, amount: int = 1):
+        with self._metrics_lock:
+            self._metrics[metric] += amount
+
+    def stats(self) -> Dict:
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+
+        metrics.update({
+            "backend": type(self).__name__,
+            "jobs": self.count(),
+            "max_jobs": self.max_jobs,
+            "ttl_seconds": self.ttl_seconds,
+            "cached_transcripts": len(self._transcripts),
+        })
+        return metrics
+
+
+class InMemoryJobStore(JobStore):
+    """Process-local LRU store with TTL expiry."""
+
+    def __init__(self, max_jobs: int, ttl_seconds: float, transcript_cache_size: int = 0):
+        super().__init__(max_jobs, ttl_seconds, transcript_cache_size)
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+
+    def _expired(self, entry: Dict) -> bool:
+        return time.time() - entry["touched"] > self.ttl_seconds
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        self._count("reads")
+
+        with self._lock:
+            entry = self._jobs.get(job_id)
+
+            if entry is not None and self._expired(entry):
+                del self._jobs[job_id]
+                self._count("expirations")
+                entry = None
+
+            if entry is None:
+                self._count("misses")
+                return None
+
+            self._jobs.move_to_end(job_id)
+            self._count("hits")
+            return dict(entry["record"])
+
+    def _touch(self, job_id: str) -> Dict:
+        # Caller holds self._lock
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            entry = {"record": {"job_id": job_id}, "payloads": {}}
+            self._jobs[job_id] = entry
+
+        entry["touched"] = time.time()
+        self._jobs.move_to_end(job_id)
+
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+            self._count("evictions")
+
+        return entry
+
+    def update(self, job_id: str, **fields) -> Dict:
+        self._count("writes")
+
+        with self._lock:
+            entry = self._touch(job_id)
+            entry["record"].update(fields)
+            return dict(entry["record"])
+
+    def put_payload(self, job_id: str, name: str, body: str):
+        self._count("writes")
+
+        with self._lock:
+            self._touch(job_id)["payloads"][name] = body
+
+    def get_payload(self, job_id: str, name: str) -> Optional[str]:
+        self._count("reads")
+
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            return entry["payloads"].get(name) if entry else None
+
+    def delete(self, job_id: str):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+
+class SQLiteJobStore(JobStore):
+    """
+    SQLite store in WAL mode, shared by every worker process on the host.
+
+    Records and payloads live in separate tables so status reads only touch
+    the small jobs table. Expired and excess jobs are pruned on write.
+    """
+
+    PRUNE_EVERY_WRITES = 100
+
+    def __init__(self, path: str, max_jobs: int, ttl_seconds: float, transcript_cache_size: int = 0):
+        super().__init__(max_jobs, ttl_seconds, transcript_cache_size)
+        self.path = path
+        self.db = SQLiteDatabase(path)
+        self._writes_since_prune = 0
+
+        with self.db.transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " job_id TEXT PRIMARY KEY,"
+                " record TEXT NOT NULL,"
+                " touched REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_touched ON jobs (touched)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_payloads ("
+                " job_id TEXT NOT NULL,"
+                " name TEXT NOT NULL,"
+                " body TEXT NOT NULL,"
+                " PRIMARY KEY (job_id, name))"
+            )
+
+        logger.info(f"[JOBS] SQLite job store at {path}")
+
+    # ======================================================
+    # RECORDS
+    # ======================================================
+    def get(self, job_id: str) -> Optional[Dict]:
+        self._count("reads")
+
+        row = self.db.connection().execute(
+            "SELECT record, touched FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+
+        if row is None:
+            self._count("misses")
+            return None
+
+        if time.time() - row[1] > self.ttl_seconds:
+            self.delete(job_id)
+            self._count("expirations")
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return json.loads(row[0])
+
+    def update(self, job_id: str, **fields) -> Dict:
+        self._count("writes")
+
+        with self.db.transaction() as conn:
+            row = conn.execute(
+                "SELECT record FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+
+            record = json.loads(row[0]) if row else {"job_id": job_id}
+            record.update(fields)
+
+            conn.execute(
+                "INSERT INTO jobs (job_id, record, touched) VALUES (?, ?, ?) "
+                "ON CONFLICT (job_id) DO UPDATE SET "
+                "record = excluded.record, touched = excluded.touched",
+                (job_id, json.dumps(record, default=str), time.time()),
+            )
+
+        self._maybe_prune()
+        return record
+
+    def put_payload(self, job_id: str, name: str, body: str):
+        self._count("writes")
+
+        self.db.connection().execute(
+            "INSERT INTO job_payloads (job_id, name, body) VALUES (?, ?, ?) "
+            "ON CONFLICT (job_id, name) DO UPDATE SET body = excluded.body",
+            (job_id, name, body),
+        )
+
+    def get_payload(self, job_id: str, name: str) -> Optional[str]:
+        self._count("reads")
+
+        row = self.db.connection().execute(
+            "SELECT body FROM job_payloads WHERE job_id = ? AND name = ?",
+            (job_id, name),
+        ).fetchone()
+        return row[0] if row else None
+
+    def delete(self, job_id: str):
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM job_payloads WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    def count(self) -> int:
+        return self.db.connection().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    # ======================================================
+    # EVICTION
+    # ======================================================
+    def _maybe_prune(self):
+        self._writes_since_prune += 1
+        if self._writes_since_prune < self.PRUNE_EVERY_WRITES:
+            return
+
+        self._writes_since_prune = 0
+        self.prune()
+
+    def prune(self):
+        """Drop expired jobs, then the least recently touched beyond max_jobs."""
+        cutoff = time.time() - self.ttl_seconds
+
+        with self.db.transaction() as conn:
+            expired = conn.execute(
+                "DELETE FROM jobs WHERE touched < ?", (cutoff,)
+            ).rowcount
+
+            evicted = conn.execute(
+                "DELETE FROM jobs WHERE job_id IN ("
+                " SELECT job_id FROM jobs ORDER BY touched DESC"
+                " LIMIT -1 OFFSET ?)",
+                (self.max_jobs,),
+            ).rowcount
+
+            conn.execute(
+                "DELETE FROM job_payloads "
+                "WHERE job_id NOT IN (SELECT job_id FROM jobs)"
+            )
+
+        self._count("expirations", expired)
+        self._count("evictions", evicted)
+
+
+@lru_cache()
+def get_job_store() -> JobStore:
+    backend = settings.JOB_STORE_BACKEND.lower()
+
+    if backend == "sqlite":
+        return SQLiteJobStore(
+            resolve_data_path(settings.JOB_STORE_SQLITE_PATH),
+            max_jobs=settings.JOB_STORE_MAX_JOBS,
+            ttl_seconds=settings.JOB_STORE_TTL_SECONDS,
+            transcript_cache_size=settings.JOB_STORE_TRANSCRIPT_CACHE_SIZE,
+        )
+
+    if backend == "memory":
+        return InMemoryJobStore(
+            max_jobs=settings.JOB_STORE_MAX_JOBS,
+            ttl_seconds=settings.JOB_STORE_TTL_SECONDS,
+            transcript_cache_size=settings.JOB_STORE_TRANSCRIPT_CACHE_SIZE,
+        )
+
+    raise ValueError(f"Unknown JOB_STORE_BACKEND: {settings.JOB_STORE_BACKEND}")
@@ -0,0 +1,100 @@
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from app.services.local_embeddings import tokenize
+
+
+class KeywordIndex:
+    """
+    Okapi BM25 over knowledge-base chunks from a precomputed inverted index.
+
+    The postings (term -> [[row, term frequency], ...]) and chunk lengths
+    are built once with the index artifact; loading turns them into
+    per-term BM25 weight arrays so a query is a handful of numpy adds.
+    """
+
+    def __init__(self, postings: Dict[str, List[List[int]]], doc_lengths: List[int], k1: float = 1.5, b: float = 0.75):
+        self.postings = postings
+        self.doc_lengths = doc_lengths
+        self.k1 = k1
+        self.b = b
+
+        lengths = np.asarray(doc_lengths, dtype=np.float32)
+        avg_length = float(lengths.mean()) if len(lengths) else 0.0
+        count = len(doc_lengths)
+
+        self._weights: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for term, entries in postings.items():
+            rows = np.asarray([row for row, _ in entries], dtype=np.int64)
+            tf = np.asarray([freq for _, freq in entries], dtype=np.float32)
+
+            idf = math.log(1.0 + (count - len(rows) + 0.5) / (len(rows) + 0.5))
+            norm = k1 * (1.0 - b + b * lengths[rows] / avg_length) if avg_length else k1
+            self._weights[term] = (rows, idf * tf * (k1 + 1.0) / (tf + norm))
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    # ======================================================
+    # BUILD / SERIALISE
+    # ======================================================
+    @classmethod
+    def build(cls, texts: List[str]) -> "KeywordIndex":
+        postings: Dict[str, List[List[int]]] = {}
+        doc_lengths = []
+
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_lengths.append(len(tokens))
+
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for term, freq in counts.items():
+                postings.setdefault(term, []).append([row, freq])
+
+        return cls(postings, doc_lengths)
+
+    def to_dict(self) -> Dict:
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "doc_lengths": self.doc_lengths,
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "KeywordIndex":
+        return cls(data["postings"], data["doc_lengths"], k1=data["k1"], b=data["b"])
+
+    # ======================================================
+    # SEARCH
+    # ======================================================
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """Top-k (row, BM25 score) for chunks sharing at least one query term."""
+        scores = np.zeros(len(self.doc_lengths), dtype=np.float32)
+
+        for term in set(tokenize(query)):
+            weights = self._weights.get(term)
+            if weights is not None:
+                scores[weights[0]] += weights[1]
+
+        matched = np.flatnonzero(scores)
+        if not len(matched):
+            return []
+
+        top = matched[np.argsort(-scores[matched], kind="stable")[:k]]
+        return [(int(row), float(scores[row])) for row in top]
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int = 60) -> List[Tuple[int, float]]:
+    """Fuse ranked row lists: score(row) = sum of 1 / (k + rank), best first."""
+    scores: Dict[int, float] = {}
+
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, 1):
+            scores[row] = scores.get(row, 0.0) + 1.0 / (k + rank)
+
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, Optional
+
+from app.utils.logger import get_logger
+from app.utils.sqlite import SQLiteDatabase
+
+logger = get_logger(__name__)
+
+
+class LLMCache:
+    """
+    Content-addressed on-disk cache of LLM completions.
+
+    Entries are keyed on (model, temperature, system prompt, user prompt
+    hash), expire after ttl_seconds and are pruned least-recently-used
+    beyond max_entries. Backed by SQLite so all workers share one cache.
+    """
+
+    PRUNE_EVERY_WRITES = 50
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.db = SQLiteDatabase(path)
+
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+        self._writes_since_prune = 0
+
+        self.db.connection().execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self.db.connection().execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed)"
+        )
+
+        logger.info(f"[LLM CACHE] On-disk cache at {path}")
+
+    @staticmethod
+    def make_key(model: str, temperature: float, system_prompt: str, user_prompt: str) -> str:
+        user_hash = hashlib.sha256(user_prompt.encode("utf-8")).hexdigest()
+        material = json.dumps([model, temperature, system_prompt, user_hash])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    # ======================================================
+    # LOOKUP / STORE
+    # ======================================================
+    def get(self, key: str) -> Optional[str]:
+        conn = self.db.connection()
+        row = conn.execute(
+            "SELECT response, created FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            self._count("misses")
+            return None
+
+        now = time.time()
+        if now - row[1] > self.ttl_seconds:
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._count("expirations")
+            self._count("misses")
+            return None
+
+        conn.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+        self._count("hits")
+        return row[0]
+
+    def set(self, key: str, response: str):
+        now = time.time()
+        self.db.connection().execute(
+            "INSERT INTO llm_cache (key, response, created, accessed) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "response = excluded.response, created = excluded.created, accessed = excluded.accessed",
+            (key, response, now, now),
+        )
+        self._count("writes")
+
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= self.PRUNE_EVERY_WRITES:
+            self._writes_since_prune = 0
+            self.prune()
+
+    def prune(self):
+        """Drop expired entries, then the least recently used beyond max_entries."""
+        with self.db.transaction() as conn:
+            expired = conn.execute(
+                "DELETE FROM llm_cache WHERE created < ?",
+                (time.time() - self.ttl_seconds,),
+            ).rowcount
+
+            evicted = conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                " SELECT key FROM llm_cache ORDER BY accessed DESC"
+                " LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+
+        self._count("expirations", expired)
+        self._count("evictions", evicted)
+
+    # ======================================================
+    # METRICS
+    # ======================================================
+    def _count(self, metric: str, amount: int = 1):
+        with self._metrics_lock:
+            self._metrics[metric] += amount
+
+    def stats(self) -> Dict:
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics.update({
+            "entries": self.db.connection().execute(
+                "SELECT COUNT(*) FROM llm_cache"
+            ).fetchone()[0],
+            "max_entries": self.max_entries,
+            "hit_rate": round(metrics["hits"] / lookups, 3) if lookups else 0.0,
+        })
+        return metrics
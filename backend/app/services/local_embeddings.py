@@ -0,0 +1,84 @@
+import re
+import zlib
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers herself him
+himself his how i if in into is it its itself just me more most my myself no
+nor not now of off on once only or other our ours ourselves out over own same
+she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what when
+where which while who whom why will with would you your yours yourself
+yourselves i'm you're we're they're it's don't
+""".split())
+
+SUFFIXES = ("ations", "ation", "ings", "ing", "ies", "ers", "er", "ed", "es", "s")
+
+
+def _stem(token: str) -> str:
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 4:
+            return token[: -len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, stopword-free, lightly stemmed word tokens."""
+    return [
+        _stem(token.replace("'", ""))
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOPWORDS
+    ]
+
+
+class HashedTfEmbeddings(Embeddings):
+    """
+    Offline CPU embeddings: hashed unigram + bigram term frequencies.
+
+    Terms are hashed (crc32, stable across processes) into `dimension`
+    signed buckets with sublinear term frequency, and each vector is
+    L2-normalised, so squared L2 distance ranks like cosine similarity.
+    No network, no model weights and no corpus state: the same text always
+    maps to the same vector, which keeps incremental re-indexing and the
+    embedding cache valid.
+    """
+
+    def __init__(self, dimension: int = 4096, bigram_weight: float = 0.5):
+        self.dimension = dimension
+        self.bigram_weight = bigram_weight
+
+    @property
+    def model_id(self) -> str:
+        return f"local-hashed-tf-v1-{self.dimension}"
+
+    def _vector(self, text: str) -> np.ndarray:
+        tokens = tokenize(text)
+        terms = [(token, 1.0) for token in tokens] + [
+            (f"{a} {b}", self.bigram_weight) for a, b in zip(tokens, tokens[1:])
+        ]
+
+        counts = {}
+        for term, weight in terms:
+            counts[term] = counts.get(term, 0.0) + weight
+
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for term, count in counts.items():
+            digest = zlib.crc32(term.encode("utf-8"))
+            sign = 1.0 if digest & 0x80000000 else -1.0
+            vector[digest % self.dimension] += sign * (1.0 + np.log(count))
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._vector(text).tolist() for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._vector(text).tolist()
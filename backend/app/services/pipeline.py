@@ -0,0 +1,419 @@
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.config import get_settings
+from app.models import ProcessingStatus, SalesReport, TranscriptResponse
+from app.services.agent_service import FAILED_OUTPUTS, AgentOrchestrationService
+from app.services.job_events import job_events
+from app.services.job_store import get_job_store
+from app.services.s3_service import S3Service
+from app.services.transcribe_service import TranscribeService
+from app.utils.concurrency import run_blocking
+from app.utils.exceptions import S3Exception, TranscriptionException
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+job_store = get_job_store()
+
+s3_service = S3Service()
+transcribe_service = TranscribeService()
+agent_service = AgentOrchestrationService()
+
+
+# ----------------------------------------------------------
+# JOB STATUS UPDATES
+# ----------------------------------------------------------
+def update_job_status(
+    job_id: str,
+    status: ProcessingStatus,
+    progress: int,
+    step: str,
+    transcript: Optional[TranscriptResponse] = None,
+    report: Optional[SalesReport] = None,
+    error: Optional[str] = None,
+):
+    # Payloads first, so a record never reports a stage whose output is missing
+    if transcript is not None:
+        job_store.save_transcript(job_id, transcript)
+
+    if report is not None:
+        job_store.save_report(job_id, report)
+
+    fields = {}
+    if report is not None or status == ProcessingStatus.FAILED:
+        # The report supersedes the streamed partial output; a failed
+        # job keeps none of it
+        job_store.clear_partial_insights(job_id)
+        fields["partial_version"] = None
+
+    record = job_store.update(
+        job_id,
+        status=status.value,
+        progress_percentage=progress,
+        current_step=step,
+        error_message=error,
+        updated_at=datetime.utcnow().isoformat(),
+        **fields,
+    )
+
+    job_events.publish(job_id, record)
+
+    logger.info(f"Job {job_id}: {status.value} - {step} ({progress}%)")
+
+
+class PartialInsightPublisher:
+    """
+    Collects streamed agent text for one job and saves it at most once per
+    ANALYSIS_PARTIAL_PUBLISH_INTERVAL_SECONDS, and only when an agent has
+    produced new text. The text goes to a job payload; the record just
+    bumps partial_version, so status events stay small and SSE streams
+    send each client only the text appended since its last event.
+    Called from agent worker threads.
+    """
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.partials: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._last_published = 0.0
+        self._changed = False
+        self._version = 0
+        self._closed = False
+
+    def close(self):
+        """Drop any later text, e.g. from a call still running after the stage ended."""
+        with self._lock:
+            self._closed = True
+
+    def __call__(self, agent_name: str, text: str):
+        with self._lock:
+            if self._closed:
+                return
+
+            if self.partials.get(agent_name) != text:
+                self.partials[agent_name] = text
+                self._changed = True
+
+            now = time.monotonic()
+            if not self._changed or now - self._last_published < settings.ANALYSIS_PARTIAL_PUBLISH_INTERVAL_SECONDS:
+                return
+
+            self._last_published = now
+            self._changed = False
+            self._version += 1
+
+            record = job_store.save_partial_insights(self.job_id, self.partials, self._version)
+            job_events.publish(self.job_id, record)
+
+
+# ----------------------------------------------------------
+# MAIN PIPELINE
+# ----------------------------------------------------------
+# Stage checkpoints live in the job record under "stages"; a resumed or
+# retried job skips every stage already marked done
+STAGES = ["await-upload", "transcribe", "persist", "parse", "analyze", "synthesize"]
+STAGE_DONE = "done"
+# Analysis finished but some agents failed; a retry re-runs only those
+STAGE_PARTIAL = "partial"
+
+
+def record_upload(job_id: str, size: Optional[int], etag: Optional[str]) -> Dict:
+    """
+    Checkpoint the await-upload stage for a verified upload.
+
+    Called when /start has confirmed the object or an S3 upload event
+    reports it, so the pipeline never waits for the upload itself.
+    """
+    stages = dict((job_store.get(job_id) or {}).get("stages") or {})
+    stages["await-upload"] = {
+        "status": STAGE_DONE,
+        "finished_at": datetime.utcnow().isoformat(),
+        "size": size,
+        "etag": etag,
+    }
+    return job_store.update(job_id, stages=stages)
+
+
+def first_incomplete_stage(job_data: Dict) -> Optional[str]:
+    stages = job_data.get("stages") or {}
+
+    for stage in STAGES:
+        if (stages.get(stage) or {}).get("status") != STAGE_DONE:
+            return stage
+
+    return None
+
+
+def fail_abandoned_job(job_id: str, error: str):
+    """
+    Fail a job the queue stopped handing out, so clients stop waiting and
+    /jobs/{id}/retry can resume it from its first incomplete stage.
+    """
+    record = job_store.get(job_id)
+    if record is None or record.get("status") in (
+        ProcessingStatus.COMPLETED.value,
+        ProcessingStatus.FAILED.value,
+    ):
+        return
+
+    stage = first_incomplete_stage(record)
+    job_store.update(job_id, failed_stage=stage)
+    update_job_status(
+        job_id,
+        ProcessingStatus.FAILED,
+        record.get("progress_percentage", 0),
+        f"Processing failed during {stage}",
+        error=error,
+    )
+
+
+class PipelineRun:
+    """
+    One execution of the pipeline for a job.
+
+    Each stage takes its input from the previous stage's in-memory output,
+    or from that stage's checkpoint when this run resumed past it, and
+    checkpoints its own output before the next stage starts.
+    """
+
+    def __init__(self, job_id: str, file_extension: str):
+        self.job_id = job_id
+        self.file_extension = file_extension
+        self.record = job_store.get(job_id) or {}
+        self.stages: Dict[str, Dict] = dict(self.record.get("stages") or {})
+        self.current_stage: Optional[str] = None
+        self._checkpointed = set()
+
+        self.transcript_json: Optional[dict] = None
+        self.transcript: Optional[TranscriptResponse] = None
+        self.agent_outputs: Optional[Dict[str, str]] = None
+
+    def checkpoint(self, stage: str, status: str = STAGE_DONE, **outputs):
+        self.stages[stage] = {
+            "status": status,
+            "finished_at": datetime.utcnow().isoformat(),
+            **outputs,
+        }
+        self.record = job_store.update(self.job_id, stages=self.stages)
+        self._checkpointed.add(stage)
+
+    def output(self, stage: str, name: str):
+        return (self.stages.get(stage) or {}).get(name)
+
+    async def run(self):
+        handlers = {
+            "await-upload": self.await_upload,
+            "transcribe": self.transcribe,
+            "persist": self.persist,
+            "parse": self.parse,
+            "analyze": self.analyze,
+            "synthesize": self.synthesize,
+        }
+
+        # Once a stage re-runs, the checkpoints after it are stale, except
+        # those it wrote itself (a reused transcript also completes persist)
+        rerun = False
+
+        for stage in STAGES:
+            done = (self.stages.get(stage) or {}).get("status") == STAGE_DONE
+            if done and (not rerun or stage in self._checkpointed):
+                continue
+
+            rerun = True
+            self.current_stage = stage
+            logger.info(f"[PIPELINE] Job {self.job_id}: stage {stage}")
+            await handlers[stage]()
+
+    # ======================================================
+    # STAGES
+    # ======================================================
+    async def await_upload(self):
+        # Normally checkpointed already by /start or an S3 upload event;
+        # otherwise confirm the object once rather than polling for it
+        upload = await run_blocking(s3_service.verify_upload, self.job_id, self.file_extension)
+
+        if upload is None:
+            raise S3Exception(f"Upload not found for job {self.job_id}")
+
+        self.checkpoint("await-upload", **upload)
+
+    async def transcribe(self):
+        update_job_status(self.job_id, ProcessingStatus.TRANSCRIBING, 10, "Starting transcription")
+
+        transcription_job_name = self.record.get("transcription_job_name")
+        fingerprint = self.record.get("audio_fingerprint")
+
+        # ♻️ Identical audio already transcribed? Skip AWS Transcribe
+        if settings.AUDIO_DEDUP_ENABLED and not fingerprint:
+            upload = self.stages["await-upload"]
+            fingerprint = await run_blocking(
+                s3_service.get_audio_fingerprint,
+                s3_service.get_audio_key(self.job_id, self.file_extension),
+                {"ETag": upload.get("etag"), "ContentLength": upload.get("size")},
+            )
+
+            if fingerprint:
+                self.record = job_store.update(self.job_id, audio_fingerprint=fingerprint)
+
+        if fingerprint and not transcription_job_name:
+            self.transcript_json = await run_blocking(
+                s3_service.find_transcript_by_fingerprint, fingerprint
+            )
+
+            if self.transcript_json is not None:
+                logger.info(f"[PIPELINE] Reusing transcript for fingerprint {fingerprint}")
+
+                self.checkpoint("transcribe", reused=True)
+                self.checkpoint(
+                    "persist",
+                    transcript_uri=f"s3://{settings.S3_BUCKET_NAME}/"
+                    f"{s3_service.get_fingerprint_transcript_key(fingerprint)}",
+                )
+                update_job_status(self.job_id, ProcessingStatus.TRANSCRIBING, 50, "Reused existing transcript")
+                return
+
+        if transcription_job_name:
+            logger.info(f"[PIPELINE] Resuming transcription job {transcription_job_name}")
+
+        else:
+            audio_uri = s3_service.get_audio_uri(self.job_id, self.file_extension)
+            logger.info(f"[PIPELINE] Audio URI resolved: {audio_uri}")
+
+            attempt = self.record.get("transcription_attempts", 0) + 1
+            transcription_job_name = await transcribe_service.start_transcription_job(
+                self.job_id, audio_uri, attempt
+            )
+
+            # A run taking over waits on this job instead of starting another
+            self.record = job_store.update(
+                self.job_id,
+                transcription_job_name=transcription_job_name,
+                transcription_attempts=attempt,
+            )
+
+        update_job_status(self.job_id, ProcessingStatus.TRANSCRIBING, 20, "Transcription in progress")
+
+        try:
+            await transcribe_service.wait_for_completion(
+                transcription_job_name, audio_bytes=self.stages["await-upload"].get("size")
+            )
+
+        except TranscriptionException:
+            # The Transcribe job itself failed; a retry starts a new one
+            self.record = job_store.update(self.job_id, transcription_job_name=None)
+            raise
+
+        self.checkpoint("transcribe", transcription_job_name=transcription_job_name)
+        update_job_status(self.job_id, ProcessingStatus.TRANSCRIBING, 50, "Transcription completed")
+
+    async def persist(self):
+        # 🔥 Server-side copy of the Transcribe output; nothing is uploaded
+        transcript_uri = await run_blocking(
+            s3_service.persist_transcript,
+            self.job_id,
+            settings.TRANSCRIBE_OUTPUT_BUCKET,
+            f"{self.output('transcribe', 'transcription_job_name')}.json",
+            self.record.get("audio_fingerprint"),
+        )
+
+        self.checkpoint("persist", transcript_uri=transcript_uri)
+
+    async def parse(self):
+        # Downloaded once, here; a reused transcript is already in memory
+        transcript_json = self.transcript_json
+        if transcript_json is None:
+            transcript_json = await run_blocking(
+                s3_service.download_transcript, self.output("persist", "transcript_uri")
+            )
+
+        logger.info("[TRANSCRIBE] Transcript loaded successfully from S3")
+
+        transcript = await run_blocking(
+            transcribe_service.parse_transcript_with_speakers, transcript_json
+        )
+        transcript.job_id = self.job_id
+
+        # The raw Transcribe output is not needed past this point
+        self.transcript_json = None
+
+        job_store.save_transcript(self.job_id, transcript)
+        self.transcript = transcript
+
+        self.checkpoint("parse", segments=len(transcript.segments), duration=transcript.duration)
+
+    async def analyze(self):
+        transcript = self.transcript or job_store.get_transcript(self.job_id)
+
+        update_job_status(self.job_id, ProcessingStatus.ANALYZING, 60, "Running AI agent analysis")
+
+        # Outputs of agents that succeeded on an earlier run are reused
+        previous = job_store.get_payload(self.job_id, "agent_outputs")
+
+        logger.info(f"Starting agent orchestration for job {self.job_id}")
+        on_partial = PartialInsightPublisher(self.job_id) if settings.ANALYSIS_STREAMING else None
+        try:
+            outputs = await run_blocking(
+                agent_service.run_agents,
+                self.job_id,
+                transcript,
+                on_partial,
+                json.loads(previous) if previous else None,
+            )
+        finally:
+            if on_partial:
+                on_partial.close()
+
+        job_store.put_payload(self.job_id, "agent_outputs", json.dumps(outputs))
+        self.agent_outputs = outputs
+
+        failed = [name for name, output in outputs.items() if output in FAILED_OUTPUTS]
+        self.checkpoint(
+            "analyze", status=STAGE_PARTIAL if failed else STAGE_DONE, failed_agents=failed
+        )
+
+    async def synthesize(self):
+        outputs = self.agent_outputs or json.loads(job_store.get_payload(self.job_id, "agent_outputs"))
+
+        sales_report = agent_service.build_report(self.job_id, outputs)
+
+        self.checkpoint("synthesize")
+        update_job_status(
+            self.job_id,
+            ProcessingStatus.COMPLETED,
+            100,
+            "Analysis complete",
+            report=sales_report,
+        )
+
+
+async def process_audio_pipeline(job_id: str, file_extension: str):
+    """
+    Run a job from its first incomplete stage.
+
+    Safe to call again for a job interrupted by a crash or failed by a
+    transient error: finished stages are not repeated.
+    """
+
+    run = PipelineRun(job_id, file_extension)
+
+    try:
+        await run.run()
+        logger.info(f"✓ Job {job_id} completed successfully")
+
+    except Exception as e:
+        logger.error(f"Error processing job {job_id} in stage {run.current_stage}: {e}")
+
+        # Progress stays where the job stopped; /jobs/{id}/retry resumes there
+        record = job_store.update(job_id, failed_stage=run.current_stage)
+        update_job_status(
+            job_id,
+            ProcessingStatus.FAILED,
+            record.get("progress_percentage", 0),
+            f"Processing failed during {run.current_stage}",
+            error=str(e),
+        )
@@ -1,15 +1,23 @@
 import os
-from typing import List, Dict
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 
-from langchain_community.vectorstores import FAISS
+import numpy as np
 from langchain_community.embeddings import BedrockEmbeddings
+from langchain_core.embeddings import Embeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.docstore.document import Document
 
-import boto3
-
 from app.config import get_settings
+from app.services.client_registry import get_boto3_client
+from app.services.context_packer import pack_context
+from app.services.embedding_cache import CachedEmbeddings, EmbeddingStore
+from app.services.keyword_index import reciprocal_rank_fusion
+from app.services.local_embeddings import HashedTfEmbeddings
+from app.services.vector_index import VectorIndex, chunk_sha256, file_sha256, write_artifact
 from app.utils.logger import get_logger
+from app.utils.paths import resolve_data_path
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -23,18 +31,45 @@ class RAGService:
     def __init__(self):
         self.settings = settings
 
-        # ✅ USE DEFAULT AWS CREDENTIAL CHAIN (DO NOT PASS KEYS)
-        self.embeddings = BedrockEmbeddings(
-            client=boto3.client(
-                "bedrock-runtime",
-                region_name=settings.AWS_REGION
-            ),
-            model_id=settings.BEDROCK_EMBEDDING_MODEL,
-        )
+        self.embeddings, self.embedding_model_id = self.create_embeddings()
+
+        # LRU of (index version, mode, query, top_k) -> retrieved context
+        self._cache_lock = threading.Lock()
+        self._retrieval_cache: "OrderedDict[Tuple, List[Dict]]" = OrderedDict()
+        self._cache_metrics = {"hits": 0, "misses": 0}
 
         self.vector_store = None
         self.load_or_create_index()
 
+    # ==========================================================
+    # EMBEDDING BACKEND
+    # ==========================================================
+    def create_embeddings(self) -> Tuple[Embeddings, str]:
+        """Embeddings for EMBEDDING_BACKEND and the model id recorded in the index."""
+        if settings.EMBEDDING_BACKEND == "local":
+            local = HashedTfEmbeddings(dimension=settings.LOCAL_EMBEDDING_DIMENSION)
+            logger.info(f"Using local embeddings ({local.model_id})")
+            return local, local.model_id
+
+        if settings.EMBEDDING_BACKEND != "bedrock":
+            raise ValueError(f"Unknown EMBEDDING_BACKEND: {settings.EMBEDDING_BACKEND}")
+
+        bedrock = CachedEmbeddings(
+            BedrockEmbeddings(
+                client=get_boto3_client("bedrock-runtime"),
+                model_id=settings.BEDROCK_EMBEDDING_MODEL,
+            ),
+            model_id=settings.BEDROCK_EMBEDDING_MODEL,
+            store=(
+                EmbeddingStore(resolve_data_path(settings.EMBEDDING_CACHE_PATH))
+                if settings.EMBEDDING_CACHE_ENABLED else None
+            ),
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            max_concurrency=settings.EMBEDDING_MAX_CONCURRENCY,
+            query_cache_size=settings.EMBEDDING_QUERY_CACHE_SIZE,
+        )
+        return bedrock, settings.BEDROCK_EMBEDDING_MODEL
+
     # ==========================================================
     # PATH HELPERS
     # ==========================================================
@@ -57,7 +92,7 @@ class RAGService:
             logger.warning(f"Knowledge base path not found: {kb_path}")
             return documents
 
-        for filename in os.listdir(kb_path):
+        for filename in sorted(os.listdir(kb_path)):
             if filename.endswith(".txt"):
                 filepath = os.path.join(kb_path, filename)
 
@@ -85,6 +120,8 @@ class RAGService:
             chunk_size=settings.CHUNK_SIZE,
             chunk_overlap=settings.CHUNK_OVERLAP,
             length_function=len,
+            # Lets the context packer merge overlapping and adjacent chunks
+            add_start_index=True,
         )
 
         chunks = text_splitter.split_documents(documents)
@@ -92,96 +129,346 @@ class RAGService:
         return chunks
 
     # ==========================================================
-    # BUILD VECTOR INDEX
+    # BUILD VECTOR INDEX (INCREMENTAL)
     # ==========================================================
-    def build_vector_index(self, documents: List[Document]) -> FAISS:
-        chunks = self.chunk_documents(documents)
+    def update_index(self, full_rebuild: bool = False) -> Dict:
+        """
+        Bring the index artifact in line with the knowledge base.
+
+        Files whose hash matches the current artifact keep their chunks and
+        vectors as-is. Changed files are re-chunked and only chunks whose
+        content hash is not already indexed are embedded; chunks of removed
+        files are dropped.
+
+        Args:
+            full_rebuild: Ignore the current artifact and embed every chunk
+
+        Returns:
+            Counts of files and chunks reused, embedded and removed
+        """
+        previous = None if full_rebuild else self._load_reusable_index()
+        previous_sources = previous.manifest["sources"] if previous else {}
+
+        sources = self.get_source_hashes()
+        documents = self.load_knowledge_base_documents()
+
+        stats = {
+            "files": len(documents),
+            "files_unchanged": 0,
+            "files_changed": 0,
+            "files_added": 0,
+            "files_removed": len(set(previous_sources) - set(sources)),
+            "chunks": 0,
+            "chunks_reused": 0,
+            "chunks_embedded": 0,
+            "chunks_removed": 0,
+            "embedding_calls_saved": 0,
+            "written": False,
+        }
+
+        if previous and previous_sources == sources:
+            stats.update({
+                "files_unchanged": len(documents),
+                "chunks": len(previous),
+                "chunks_reused": len(previous),
+                "embedding_calls_saved": len(previous),
+            })
+            logger.info("Knowledge base unchanged; index artifact is up to date")
+            return stats
+
+        previous_rows: Dict[str, int] = {}
+        rows_by_source: Dict[str, List[int]] = {}
+        if previous:
+            for row, (doc, digest) in enumerate(zip(previous.documents, previous.chunk_hashes)):
+                previous_rows.setdefault(digest, row)
+                rows_by_source.setdefault(doc.metadata.get("source"), []).append(row)
+
+        chunks: List[Document] = []
+        # Previous artifact row for each chunk, or None if it must be embedded
+        reuse: List[Optional[int]] = []
+
+        for document in documents:
+            source = document.metadata["source"]
+
+            if source in previous_sources and previous_sources[source] == sources.get(source):
+                stats["files_unchanged"] += 1
+                for row in rows_by_source.get(source, []):
+                    chunks.append(previous.documents[row])
+                    reuse.append(row)
+                continue
+
+            stats["files_changed" if source in previous_sources else "files_added"] += 1
+            for chunk in self.chunk_documents([document]):
+                chunks.append(chunk)
+                reuse.append(previous_rows.get(chunk_sha256(chunk.page_content)))
+
+        to_embed = [i for i, row in enumerate(reuse) if row is None]
+        if not chunks:
+            logger.warning("No chunks to index")
+            return stats
+
+        logger.info(f"Embedding {len(to_embed)} of {len(chunks)} chunks...")
+        embedded = self.embeddings.embed_documents(
+            [chunks[i].page_content for i in to_embed]
+        ) if to_embed else []
+
+        dimension = previous.vectors.shape[1] if previous else len(embedded[0])
+        vectors = np.empty((len(chunks), dimension), dtype=np.float32)
+        for i, row in enumerate(reuse):
+            if row is not None:
+                vectors[i] = previous.vectors[row]
+        for i, vector in zip(to_embed, embedded):
+            vectors[i] = vector
+
+        kept = {row for row in reuse if row is not None}
+        stats.update({
+            "chunks": len(chunks),
+            "chunks_reused": len(chunks) - len(to_embed),
+            "chunks_embedded": len(to_embed),
+            "chunks_removed": len(previous) - len(kept) if previous else 0,
+            "embedding_calls_saved": len(chunks) - len(to_embed),
+        })
+
+        self.save_index(chunks, vectors, sources)
+        stats["written"] = True
+
+        logger.info(
+            f"Index updated: {stats['chunks_embedded']} embedded, "
+            f"{stats['chunks_reused']} reused, {stats['chunks_removed']} removed"
+        )
+        return stats
+
+    def _load_reusable_index(self) -> Optional[VectorIndex]:
+        """Current artifact if its vectors are compatible with the settings."""
+        try:
+            vector_store = VectorIndex.load(self.get_index_dir())
+        except Exception as e:
+            logger.info(f"No reusable index artifact ({e}); embedding every chunk")
+            return None
 
-        logger.info("Building FAISS index...")
-        vector_store = FAISS.from_documents(chunks, self.embeddings)
-        logger.info("FAISS index built successfully")
+        if not self._matches_settings(vector_store.manifest):
+            logger.info("Embedding model or chunking changed; embedding every chunk")
+            return None
 
         return vector_store
 
     # ==========================================================
-    # SAVE / LOAD INDEX (🔥 FIXED — NO PICKLE)
+    # SAVE / LOAD INDEX ARTIFACT
     # ==========================================================
-    def save_index(self, vector_store: FAISS):
-        index_dir = self.resolve_path("backend/data/embeddings")
-
-        os.makedirs(index_dir, exist_ok=True)
+    def get_index_dir(self) -> str:
+        index_dir = resolve_data_path(settings.RAG_INDEX_PATH)
+        # Local vectors live beside the Bedrock artifact so switching
+        # backends never maps vectors of the wrong model
+        if settings.EMBEDDING_BACKEND == "local":
+            return os.path.join(index_dir, "local")
+        return index_dir
+
+    def get_source_hashes(self) -> Dict[str, str]:
+        kb_path = self.resolve_path(settings.KNOWLEDGE_BASE_PATH)
+        if not os.path.exists(kb_path):
+            return {}
+
+        return {
+            filename: file_sha256(os.path.join(kb_path, filename))
+            for filename in sorted(os.listdir(kb_path))
+            if filename.endswith(".txt")
+        }
+
+    def build_manifest(self, sources: Dict[str, str]) -> Dict:
+        return {
+            "embedding_model": self.embedding_model_id,
+            "chunk_size": settings.CHUNK_SIZE,
+            "chunk_overlap": settings.CHUNK_OVERLAP,
+            "sources": sources,
+        }
+
+    def save_index(self, chunks: List[Document], vectors: np.ndarray, sources: Dict[str, str]) -> str:
+        path = write_artifact(
+            self.get_index_dir(), vectors, chunks, self.build_manifest(sources)
+        )
 
-        vector_store.save_local(index_dir)
+        logger.info(f"Saved index artifact to {path}")
+        return path
 
-        logger.info(f"Saved FAISS index to {index_dir}")
+    def load_index(self) -> VectorIndex:
+        vector_store = VectorIndex.load(self.get_index_dir())
 
-    def load_index(self) -> FAISS:
-        index_dir = self.resolve_path("backend/data/embeddings")
+        if vector_store.manifest.get("embedding_model") != self.embedding_model_id:
+            raise ValueError(
+                f"Index was built with {vector_store.manifest.get('embedding_model')}, "
+                f"not {self.embedding_model_id}"
+            )
 
-        vector_store = FAISS.load_local(
-    index_dir,
-    self.embeddings
-)
+        logger.info(
+            f"Memory-mapped index {vector_store.manifest['version']} "
+            f"({len(vector_store)} chunks) from {vector_store.path}"
+        )
+        return vector_store
 
+    def _matches_settings(self, manifest: Dict) -> bool:
+        return (
+            manifest.get("embedding_model") == self.embedding_model_id
+            and manifest.get("chunk_size") == settings.CHUNK_SIZE
+            and manifest.get("chunk_overlap") == settings.CHUNK_OVERLAP
+        )
 
-        logger.info(f"Loaded FAISS index from {index_dir}")
-        return vector_store
+    def is_index_stale(self, vector_store: VectorIndex) -> bool:
+        """True if the knowledge base or chunking changed since the artifact was built."""
+        return (
+            not self._matches_settings(vector_store.manifest)
+            or vector_store.manifest.get("sources") != self.get_source_hashes()
+        )
 
     # ==========================================================
     # INDEX MANAGEMENT
     # ==========================================================
     def load_or_create_index(self):
-        index_dir = self.resolve_path("backend/data/embeddings")
-
-        if os.path.exists(index_dir):
-            try:
-                self.vector_store = self.load_index()
-            except Exception as e:
+        try:
+            self.vector_store = self.load_index()
+        except Exception as e:
+            # Local embeddings need no network, so building is always cheap
+            if settings.RAG_BUILD_INDEX_ON_STARTUP or settings.EMBEDDING_BACKEND == "local":
                 logger.error(f"Error loading index: {e}. Creating new index...")
                 self.create_new_index()
-        else:
-            self.create_new_index()
+            else:
+                logger.error(
+                    f"Error loading index: {e}. Retrieval is disabled until "
+                    "infrastructure/scripts/build_embeddings.py is run"
+                )
+            return
+
+        if self.is_index_stale(self.vector_store):
+            logger.warning(
+                "Index artifact is stale for the current knowledge base; "
+                "re-run infrastructure/scripts/build_embeddings.py"
+            )
 
     def create_new_index(self):
-        documents = self.load_knowledge_base_documents()
+        stats = self.update_index()
 
-        if not documents:
-            logger.warning("No documents found. Creating empty index.")
+        if not stats["chunks"]:
+            logger.warning("No documents found. Retrieval is disabled.")
+            self.vector_store = None
+            return
 
-            self.vector_store = FAISS.from_texts(
-                ["Sales coaching knowledge base placeholder"],
-                self.embeddings,
-            )
-        else:
-            self.vector_store = self.build_vector_index(documents)
-            self.save_index(self.vector_store)
+        self.vector_store = self.load_index()
 
     # ==========================================================
     # RETRIEVE CONTEXT
     # ==========================================================
     def retrieve_context(self, query: str, top_k: int = None) -> List[Dict]:
+        return self.retrieve_contexts([query], top_k)[0]
+
+    def retrieve_contexts(self, queries: List[str], top_k: int = None) -> List[List[Dict]]:
+        """
+        Retrieve context for a batch of queries.
+
+        Queries not in the LRU are embedded in one call and searched in
+        one matrix product. In "hybrid" mode (RAG_RETRIEVAL_MODE) the dense
+        and BM25 rankings are fused with reciprocal rank fusion and
+        relevance_score is the fused score (higher is better); "dense"
+        returns squared L2 distances and "keyword" BM25 scores.
+        """
         if top_k is None:
             top_k = settings.TOP_K_RESULTS
 
-        results = self.vector_store.similarity_search_with_score(query, k=top_k)
-
-        context_docs = []
-        for doc, score in results:
-            context_docs.append({
-                "content": doc.page_content,
-                "metadata": doc.metadata,
-                "relevance_score": float(score),
-            })
+        if self.vector_store is None:
+            logger.warning("No index loaded; returning no context")
+            return [[] for _ in queries]
+
+        # Keyed on the index version so a rebuilt index is never served stale hits
+        version = self.vector_store.manifest["version"]
+        results: List[Optional[List[Dict]]] = [None] * len(queries)
+
+        with self._cache_lock:
+            for i, query in enumerate(queries):
+                cache_key = (version, settings.RAG_RETRIEVAL_MODE, query, top_k)
+                cached = self._retrieval_cache.get(cache_key)
+                if cached is not None:
+                    self._retrieval_cache.move_to_end(cache_key)
+                    self._cache_metrics["hits"] += 1
+                    results[i] = list(cached)
+                else:
+                    self._cache_metrics["misses"] += 1
+
+        misses = sorted({query for query, result in zip(queries, results) if result is None})
+        if misses:
+            searched = dict(zip(misses, self._search(misses, top_k)))
+            logger.info(f"Retrieved context for {len(misses)} queries")
+
+            with self._cache_lock:
+                for query, context_docs in searched.items():
+                    self._retrieval_cache[(version, settings.RAG_RETRIEVAL_MODE, query, top_k)] = context_docs
+                while len(self._retrieval_cache) > settings.RAG_QUERY_CACHE_SIZE:
+                    self._retrieval_cache.popitem(last=False)
+
+            for i, query in enumerate(queries):
+                if results[i] is None:
+                    results[i] = list(searched[query])
+
+        return results
+
+    def _search(self, queries: List[str], top_k: int) -> List[List[Dict]]:
+        mode = settings.RAG_RETRIEVAL_MODE
+        if mode not in ("hybrid", "dense", "keyword"):
+            raise ValueError(f"Unknown RAG_RETRIEVAL_MODE: {mode}")
+
+        # Fusion re-ranks a deeper candidate list from each retriever
+        depth = max(top_k, settings.RAG_HYBRID_CANDIDATES) if mode == "hybrid" else top_k
+
+        dense = keyword = None
+        if mode != "keyword":
+            if isinstance(self.embeddings, CachedEmbeddings):
+                # Repeated queries skip the persistent store via the query LRU
+                query_vectors = self.embeddings.embed_queries(queries)
+            else:
+                query_vectors = self.embeddings.embed_documents(queries)
+            dense = self.vector_store.search(query_vectors, k=depth)
+        if mode != "dense":
+            keyword = [self.vector_store.keyword_index.search(query, depth) for query in queries]
+
+        batch = []
+        for i in range(len(queries)):
+            if mode == "dense":
+                ranked = dense[i]
+            elif mode == "keyword":
+                ranked = keyword[i]
+            else:
+                ranked = reciprocal_rank_fusion(
+                    [[row for row, _ in dense[i]], [row for row, _ in keyword[i]]],
+                    k=settings.RAG_RRF_K,
+                )
 
-        logger.info(f"Retrieved {len(context_docs)} context documents for query")
-        return context_docs
+            batch.append([
+                {
+                    "content": self.vector_store.documents[row].page_content,
+                    "metadata": self.vector_store.documents[row].metadata,
+                    "relevance_score": float(score),
+                }
+                for row, score in ranked[:top_k]
+            ])
 
-    def format_context_for_prompt(self, context_docs: List[Dict]) -> str:
-        formatted_context = "# SALES COACHING KNOWLEDGE BASE\n\n"
+        return batch
 
-        for i, doc in enumerate(context_docs, 1):
-            category = doc["metadata"].get("category", "general")
-            formatted_context += f"## Context {i} ({category})\n"
-            formatted_context += f"{doc['content']}\n\n"
+    def format_context_for_prompt(self, context_docs: List[Dict], max_tokens: Optional[int] = None) -> str:
+        """Deduplicated, merged and token-budgeted context (see context_packer)."""
+        return pack_context(context_docs, max_tokens)[0]
 
-        return formatted_context
+    # ==========================================================
+    # METRICS
+    # ==========================================================
+    def stats(self) -> Dict:
+        with self._cache_lock:
+            metrics = dict(self._cache_metrics)
+            metrics["cached_queries"] = len(self._retrieval_cache)
+
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics.update({
+            "index_version": self.vector_store.manifest["version"] if self.vector_store else None,
+            "chunks": len(self.vector_store) if self.vector_store else 0,
+            "hit_rate": round(metrics["hits"] / lookups, 3) if lookups else 0.0,
+        })
+
+        if isinstance(self.embeddings, CachedEmbeddings):
+            metrics["embeddings"] = self.embeddings.stats()
+        return metrics
@@ -1,10 +1,12 @@
-import boto3
+import hashlib
 import uuid
 import json
+from typing import Optional
 from botocore.exceptions import ClientError
-from botocore.client import Config
 
 from app.config import get_settings
+from app.services.client_registry import get_boto3_client
+from app.utils.exceptions import S3Exception
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -24,14 +26,9 @@ class S3Service:
 
     def __init__(self):
         # ⭐ CRITICAL FIX:
-        # Force Signature V4 (required for browser PUT uploads)
-        self.s3_client = boto3.client(
-            "s3",
-            region_name=settings.AWS_REGION,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            config=Config(signature_version="s3v4"),
-        )
+        # Shared S3 client always signs with Signature V4
+        # (required for browser PUT uploads)
+        self.s3_client = get_boto3_client("s3")
 
         self.bucket_name = settings.S3_BUCKET_NAME
 
@@ -65,24 +62,130 @@ class S3Service:
     # ======================================================
     # GET AUDIO S3 URI
     # ======================================================
+    def get_audio_key(self, job_id: str, file_extension: str = "mp3") -> str:
+        return f"{settings.S3_AUDIO_PREFIX}{job_id}.{file_extension}"
+
     def get_audio_uri(self, job_id: str, file_extension: str = "mp3") -> str:
-        object_key = f"{settings.S3_AUDIO_PREFIX}{job_id}.{file_extension}"
+        object_key = self.get_audio_key(job_id, file_extension)
         return f"s3://{self.bucket_name}/{object_key}"
 
     # ======================================================
-    # SAVE TRANSCRIPT JSON TO S3
+    # VERIFY A COMPLETED UPLOAD
     # ======================================================
-    def save_transcript(self, job_id: str, transcript_data: dict) -> str:
-        object_key = f"{settings.S3_TRANSCRIPT_PREFIX}{job_id}.json"
+    def verify_upload(
+        self,
+        job_id: str,
+        file_extension: str = "mp3",
+        size: Optional[int] = None,
+        etag: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Confirm an upload with a single head_object.
+
+        Returns {"size", "etag"} of the stored object, or None if it does
+        not exist. Raises S3Exception when the object differs from the
+        size or ETag the client reported for its PUT.
+        """
+        object_key = self.get_audio_key(job_id, file_extension)
 
         try:
-            self.s3_client.put_object(
+            head = self.s3_client.head_object(Bucket=self.bucket_name, Key=object_key)
+
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404", "NotFound"):
+                return None
+            raise
+
+        stored = {
+            "size": head.get("ContentLength"),
+            "etag": (head.get("ETag") or "").strip('"'),
+        }
+
+        if size is not None and stored["size"] is not None and size != stored["size"]:
+            raise S3Exception(f"Upload incomplete: {stored['size']} of {size} bytes stored")
+
+        if etag and stored["etag"] and etag.strip('"') != stored["etag"]:
+            raise S3Exception("Upload does not match the reported ETag")
+
+        logger.info(f"Verified upload {object_key} ({stored['size']} bytes)")
+        return stored
+
+    # ======================================================
+    # AUDIO FINGERPRINT (DEDUP IDENTICAL UPLOADS)
+    # ======================================================
+    def get_audio_fingerprint(self, object_key: str, head: Optional[dict] = None) -> Optional[str]:
+        """
+        Identify uploaded audio by content.
+
+        "etag" mode reuses the ETag from head_object (the MD5 of the body
+        for single-part browser uploads) at no extra cost; "sha256" mode
+        streams the object through a hash without loading it into memory.
+        """
+        if settings.AUDIO_DEDUP_MODE == "sha256":
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=object_key)
+            digest = hashlib.sha256()
+            for chunk in response["Body"].iter_chunks(chunk_size=1024 * 1024):
+                digest.update(chunk)
+            return f"sha256-{digest.hexdigest()}"
+
+        if head is None:
+            head = self.s3_client.head_object(Bucket=self.bucket_name, Key=object_key)
+
+        etag = (head.get("ETag") or "").strip('"')
+        if not etag:
+            return None
+
+        return f"etag-{etag}-{head.get('ContentLength', 0)}"
+
+    def get_fingerprint_transcript_key(self, fingerprint: str) -> str:
+        return f"{settings.S3_TRANSCRIPT_PREFIX}fingerprints/{fingerprint}.json"
+
+    def find_transcript_by_fingerprint(self, fingerprint: str) -> Optional[dict]:
+        object_key = self.get_fingerprint_transcript_key(fingerprint)
+
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=object_key)
+
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+
+        logger.info(f"Found transcript for audio fingerprint {fingerprint}")
+        return self._load_json(response)
+
+    # ======================================================
+    # PERSIST TRANSCRIPT (SERVER-SIDE COPY)
+    # ======================================================
+    def get_transcript_key(self, job_id: str) -> str:
+        return f"{settings.S3_TRANSCRIPT_PREFIX}{job_id}.json"
+
+    def persist_transcript(
+        self, job_id: str, source_bucket: str, source_key: str, fingerprint: Optional[str] = None
+    ) -> str:
+        """
+        Copy the Transcribe output under our transcript prefix.
+
+        The copies are made by S3 itself, so the transcript never passes
+        through this process on its way to storage.
+        """
+        object_key = self.get_transcript_key(job_id)
+
+        try:
+            self.s3_client.copy_object(
                 Bucket=self.bucket_name,
                 Key=object_key,
-                Body=json.dumps(transcript_data),
-                ContentType="application/json",
+                CopySource={"Bucket": source_bucket, "Key": source_key},
             )
 
+            # Index by audio fingerprint as well
+            if fingerprint:
+                self.s3_client.copy_object(
+                    Bucket=self.bucket_name,
+                    Key=self.get_fingerprint_transcript_key(fingerprint),
+                    CopySource={"Bucket": self.bucket_name, "Key": object_key},
+                )
+
             logger.info(f"Saved transcript for job {job_id}")
             return f"s3://{self.bucket_name}/{object_key}"
 
@@ -100,9 +203,18 @@ class S3Service:
 
         try:
             response = self.s3_client.get_object(Bucket=bucket, Key=key)
-            transcript_json = response["Body"].read().decode("utf-8")
-            return json.loads(transcript_json)
 
         except ClientError as e:
             logger.error(f"Error downloading transcript: {e}")
             raise
+
+        return self._load_json(response)
+
+    @staticmethod
+    def _load_json(response: dict) -> dict:
+        # Parsed straight off the stream, which is released right after
+        body = response["Body"]
+        try:
+            return json.load(body)
+        finally:
+            body.close()
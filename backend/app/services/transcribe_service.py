@@ -1,7 +1,9 @@
-import boto3
-import time
+from typing import Dict, List, Optional, Tuple
 from app.config import get_settings
 from app.models import TranscriptSegment, TranscriptResponse
+from app.services.client_registry import get_boto3_client
+from app.services.transcription_watcher import TranscriptionWatcher
+from app.utils.concurrency import run_blocking
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -13,49 +15,9 @@ class TranscribeService:
 
     def __init__(self):
 
-        self.transcribe_client = boto3.client(
-            "transcribe",
-            region_name=settings.AWS_REGION,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        )
-
-        self.s3_client = boto3.client(
-            "s3",
-            region_name=settings.AWS_REGION,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        )
-
-    # ============================================================
-    # WAIT UNTIL FILE EXISTS IN S3  🔥 FIXED INDENTATION
-    # ============================================================
-    def wait_for_s3_object(self, bucket: str, key: str, timeout: int = 120):
-
-        logger.info(f"[TRANSCRIBE] Waiting for S3 upload: {key}")
-
-        start = time.time()
-
-        while True:
-            try:
-                self.s3_client.head_object(Bucket=bucket, Key=key)
-                logger.info(f"[TRANSCRIBE] S3 object confirmed: {key}")
-                return
-
-            except Exception:
-
-                elapsed = time.time() - start
-
-                if elapsed > timeout:
-                    raise Exception(
-                        f"S3 object not found after waiting {timeout}s"
-                    )
-
-                logger.info(
-                    f"[TRANSCRIBE] Waiting for upload... ({int(elapsed)}s)"
-                )
-
-                time.sleep(3)
+        self.transcribe_client = get_boto3_client("transcribe")
+        self.s3_client = get_boto3_client("s3")
+        self.watcher = TranscriptionWatcher(lambda: self.transcribe_client)
 
     # ============================================================
     # Detect media format automatically
@@ -72,21 +34,21 @@ class TranscribeService:
     # ============================================================
     # START TRANSCRIPTION
     # ============================================================
-    def start_transcription_job(self, job_id: str, audio_s3_uri: str) -> str:
+    async def start_transcription_job(self, job_id: str, audio_s3_uri: str, attempt: int = 1) -> str:
 
+        # Job names are unique per account, so a retry after a failed job
+        # needs a new one; Transcribe writes the output to <name>.json
         transcription_job_name = f"{settings.TRANSCRIBE_JOB_PREFIX}{job_id}"
+        if attempt > 1:
+            transcription_job_name += f"-{attempt}"
 
         logger.info(f"[TRANSCRIBE] Starting job with URI: {audio_s3_uri}")
 
-        bucket = settings.S3_BUCKET_NAME
-        key = audio_s3_uri.replace(f"s3://{bucket}/", "")
-
-        # 🔥 Wait until upload finishes
-        self.wait_for_s3_object(bucket, key)
-
+        # Caller confirms the upload first (see S3Service.verify_upload)
         media_format = self._detect_media_format(audio_s3_uri)
 
-        self.transcribe_client.start_transcription_job(
+        await run_blocking(
+            self.transcribe_client.start_transcription_job,
             TranscriptionJobName=transcription_job_name,
             Media={"MediaFileUri": audio_s3_uri},
             MediaFormat=media_format,
@@ -104,34 +66,56 @@ class TranscribeService:
     # ============================================================
     # WAIT FOR COMPLETION
     # ============================================================
-    def wait_for_completion(self, transcription_job_name: str, timeout: int = 600) -> dict:
+    async def wait_for_completion(
+        self,
+        transcription_job_name: str,
+        timeout: Optional[float] = None,
+        audio_bytes: Optional[int] = None,
+    ) -> dict:
+
+        expected_seconds = self.watcher.expected_seconds(audio_bytes)
+
+        # Long calls take proportionally longer; scale the deadline with them
+        if timeout is None:
+            timeout = max(
+                settings.TRANSCRIBE_TIMEOUT_MIN_SECONDS,
+                settings.TRANSCRIBE_TIMEOUT_FACTOR * expected_seconds,
+            )
 
-        start_time = time.time()
+        # One watcher checks all of this process's jobs together
+        return await self.watcher.wait(
+            transcription_job_name, expected_seconds=expected_seconds, timeout=timeout
+        )
 
-        while True:
+    # ============================================================
+    # WORD INDEX (start time in centiseconds -> item positions)
+    # ============================================================
+    @staticmethod
+    def _index_words_by_start_time(items: list) -> Dict[int, List[Tuple[float, int]]]:
 
-            if time.time() - start_time > timeout:
-                raise TimeoutError(
-                    f"Transcription job timed out after {timeout}s"
-                )
+        index: Dict[int, List[Tuple[float, int]]] = {}
 
-            response = self.transcribe_client.get_transcription_job(
-                TranscriptionJobName=transcription_job_name
-            )
+        for position, word_item in enumerate(items):
+            if word_item.get("type") == "pronunciation":
+                word_start = float(word_item.get("start_time", 0))
+                index.setdefault(round(word_start * 100), []).append((word_start, position))
 
-            job = response["TranscriptionJob"]
-            status = job["TranscriptionJobStatus"]
+        return index
 
-            if status == "COMPLETED":
-                logger.info(f"Transcription completed: {transcription_job_name}")
-                return job
+    @staticmethod
+    def _lookup_words(index: Dict[int, List[Tuple[float, int]]], start_time: float) -> List[int]:
 
-            if status == "FAILED":
-                failure_reason = job.get("FailureReason", "Unknown")
-                raise Exception(f"Transcription failed: {failure_reason}")
+        # Keep the 0.01s matching tolerance; neighbouring buckets cover
+        # values that round across a centisecond boundary.
+        key = round(start_time * 100)
+        matches = []
 
-            logger.info(f"Transcription status: {status}. Waiting...")
-            time.sleep(10)
+        for bucket in (key - 1, key, key + 1):
+            for word_start, position in index.get(bucket, ()):
+                if abs(word_start - start_time) < 0.01:
+                    matches.append(position)
+
+        return sorted(matches)
 
     # ============================================================
     # 🔥 FINAL SAFE PARSER (WITH FALLBACK)
@@ -150,6 +134,8 @@ class TranscribeService:
         # --------------------------------------------------------
         if speaker_segments:
 
+            word_index = self._index_words_by_start_time(items)
+
             for segment in speaker_segments:
 
                 speaker = segment.get("speaker_label", "spk_0")
@@ -158,32 +144,24 @@ class TranscribeService:
                 for seg_item in segment.get("items", []):
                     start_time_item = float(seg_item.get("start_time", 0))
 
-                    for word_item in items:
-
-                        if word_item.get("type") == "pronunciation":
-
-                            word_start = float(word_item.get("start_time", 0))
+                    for position in self._lookup_words(word_index, start_time_item):
+                        text_parts.append(
+                            items[position]["alternatives"][0]["content"]
+                        )
 
-                            if abs(word_start - start_time_item) < 0.01:
-                                text_parts.append(
-                                    word_item["alternatives"][0]["content"]
-                                )
-
-                        elif word_item.get("type") == "punctuation":
-                            text_parts.append(
-                                word_item["alternatives"][0]["content"]
-                            )
-
-                segment_text = (
-                    " ".join(text_parts)
-                    .replace(" ,", ",")
-                    .replace(" .", ".")
-                )
+                        # Punctuation items follow their word in the stream
+                        following = position + 1
+                        while (
+                            following < len(items)
+                            and items[following].get("type") == "punctuation"
+                        ):
+                            text_parts[-1] += items[following]["alternatives"][0]["content"]
+                            following += 1
 
                 segments.append(
                     TranscriptSegment(
                         speaker=speaker,
-                        text=segment_text,
+                        text=" ".join(text_parts),
                         start_time=float(segment.get("start_time", 0)),
                         end_time=float(segment.get("end_time", 0)),
                     )
@@ -0,0 +1,281 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+from app.config import get_settings
+from app.utils.concurrency import run_blocking
+from app.utils.exceptions import TranscriptionException
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Statuses listed each round; a watched job missing from both has finished
+IN_FLIGHT_STATUSES = ("QUEUED", "IN_PROGRESS")
+
+# get_transcription_job errors meaning the job does not exist
+UNKNOWN_JOB_ERRORS = ("BadRequestException", "NotFoundException")
+
+
+class TranscriptionWatcher:
+    """
+    Tracks every in-flight Transcribe job of this process in one loop.
+
+    Each job is first checked halfway to its expected finish (scaled from
+    the audio length), then at an interval proportional to that estimate,
+    backing off exponentially once it is overdue. When several jobs are
+    due, a round lists our QUEUED and IN_PROGRESS jobs in two calls instead
+    of calling get_transcription_job per job; only jobs that dropped out of
+    the list are fetched, once, to read their final status.
+    """
+
+    def __init__(self, get_client: Callable):
+        self.get_client = get_client
+
+        self._watches: Dict[str, Dict] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "jobs_watched": 0,
+            "jobs_finished": 0,
+            "rounds": 0,
+            "list_calls": 0,
+            "get_calls": 0,
+            "list_errors": 0,
+            "get_errors": 0,
+        }
+
+    def _count(self, metric: str, amount: int = 1):
+        with self._metrics_lock:
+            self._metrics[metric] += amount
+
+    # ======================================================
+    # SCHEDULE
+    # ======================================================
+    @staticmethod
+    def expected_seconds(audio_bytes: Optional[int]) -> float:
+        """Estimated Transcribe turnaround for an upload of audio_bytes."""
+        audio_seconds = (audio_bytes or 0) / settings.TRANSCRIBE_AUDIO_BYTES_PER_SECOND
+        return settings.TRANSCRIBE_EXPECTED_BASE_SECONDS + (
+            settings.TRANSCRIBE_EXPECTED_REALTIME_FACTOR * audio_seconds
+        )
+
+    @staticmethod
+    def _next_delay(watch: Dict, now: float) -> float:
+        if now < watch["expected_at"]:
+            # Longer audio finishes less predictably; check it less often
+            delay = watch["interval"]
+        else:
+            # Overdue: back off from the last interval
+            delay = watch["delay"] * settings.TRANSCRIBE_POLL_BACKOFF_FACTOR
+
+        return min(
+            max(delay, settings.TRANSCRIBE_POLL_MIN_INTERVAL_SECONDS),
+            settings.TRANSCRIBE_POLL_MAX_INTERVAL_SECONDS,
+        )
+
+    # ======================================================
+    # WATCH
+    # ======================================================
+    async def wait(self, transcription_job_name: str, expected_seconds: float, timeout: float) -> dict:
+        """Resolve with the finished TranscriptionJob, or raise on failure."""
+        loop = asyncio.get_running_loop()
+
+        if self._loop is not loop or self._task is None or self._task.done():
+            # First job on this event loop (or the loop changed)
+            self._loop = loop
+            self._watches = {}
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+
+        now = time.monotonic()
+        interval = expected_seconds * settings.TRANSCRIBE_POLL_FRACTION
+        watch = {
+            "future": loop.create_future(),
+            "expected_at": now + expected_seconds,
+            "interval": interval,
+            "delay": interval,
+            # Nothing finishes much before its estimate; first look halfway
+            "next_check": now + max(expected_seconds / 2, settings.TRANSCRIBE_POLL_MIN_INTERVAL_SECONDS),
+        }
+
+        self._watches[transcription_job_name] = watch
+        self._count("jobs_watched")
+        self._wakeup.set()
+
+        logger.info(
+            f"[TRANSCRIBE] Watching {transcription_job_name} "
+            f"(expected in {expected_seconds:.0f}s, {len(self._watches)} in flight)"
+        )
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(watch["future"]), timeout)
+
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Transcription job timed out after {timeout}s")
+
+        finally:
+            if self._watches.get(transcription_job_name) is watch:
+                del self._watches[transcription_job_name]
+
+    async def _run(self):
+        while True:
+            if not self._watches:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            now = time.monotonic()
+            next_check = min(watch["next_check"] for watch in self._watches.values())
+
+            if next_check > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), next_check - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._check_round()
+            except Exception as e:
+                logger.error(f"[TRANSCRIBE] Status check failed: {e}")
+                # Try again after the minimum interval
+                retry_at = time.monotonic() + settings.TRANSCRIBE_POLL_MIN_INTERVAL_SECONDS
+                for watch in self._watches.values():
+                    watch["next_check"] = max(watch["next_check"], retry_at)
+
+    async def _check_round(self):
+        self._count("rounds")
+        now = time.monotonic()
+
+        # Jobs due within half their interval join this round, so the
+        # schedules of concurrent jobs line up into shared rounds
+        due = [
+            name for name, watch in self._watches.items()
+            if watch["next_check"] - watch["delay"] / 2 <= now
+        ]
+
+        finished = due
+        # Listing costs one call per status; only worth it for more jobs
+        if len(due) > len(IN_FLIGHT_STATUSES):
+            in_flight = await run_blocking(self._list_in_flight)
+            if in_flight is not None:
+                # The list covers every watched job, not only the due ones
+                finished = [name for name in self._watches if name not in in_flight]
+
+        for name in finished:
+            try:
+                response = await run_blocking(
+                    self.get_client().get_transcription_job, TranscriptionJobName=name
+                )
+            except Exception as e:
+                # One bad job must not hold up the others
+                self._count("get_errors")
+                self._fail_on_error(name, e)
+                continue
+            finally:
+                self._count("get_calls")
+
+            self._settle(name, response["TranscriptionJob"])
+
+        # Reschedule the due jobs that are still running
+        now = time.monotonic()
+        for name in due:
+            watch = self._watches.get(name)
+            if watch is not None:
+                watch["delay"] = self._next_delay(watch, now)
+                watch["next_check"] = now + watch["delay"]
+
+    def _list_in_flight(self) -> Optional[set]:
+        """Names of our QUEUED/IN_PROGRESS jobs, or None if listing failed."""
+        client = self.get_client()
+        names = set()
+
+        try:
+            for status in IN_FLIGHT_STATUSES:
+                kwargs = {
+                    "Status": status,
+                    "JobNameContains": settings.TRANSCRIBE_JOB_PREFIX,
+                    "MaxResults": 100,
+                }
+
+                while True:
+                    response = client.list_transcription_jobs(**kwargs)
+                    self._count("list_calls")
+
+                    names.update(
+                        summary["TranscriptionJobName"]
+                        for summary in response.get("TranscriptionJobSummaries", [])
+                    )
+
+                    if not response.get("NextToken"):
+                        break
+                    kwargs["NextToken"] = response["NextToken"]
+
+        except Exception as e:
+            # Fall back to checking each job on its own
+            self._count("list_errors")
+            logger.warning(f"[TRANSCRIBE] Listing jobs failed, checking individually: {e}")
+            return None
+
+        return names
+
+    def _fail_on_error(self, name: str, error: Exception):
+        code = error.response.get("Error", {}).get("Code") if isinstance(error, ClientError) else None
+
+        if code not in UNKNOWN_JOB_ERRORS:
+            # Throttling or a network error; checked again on its schedule
+            logger.warning(f"[TRANSCRIBE] Status check of {name} failed: {error}")
+            return
+
+        watch = self._watches.pop(name, None)
+        if watch is not None and not watch["future"].done():
+            watch["future"].set_exception(
+                TranscriptionException(f"Transcription job {name} not found: {error}")
+            )
+            self._count("jobs_finished")
+
+    def _settle(self, name: str, job: dict):
+        watch = self._watches.get(name)
+        if watch is None or watch["future"].done():
+            return
+
+        status = job["TranscriptionJobStatus"]
+
+        if status == "COMPLETED":
+            logger.info(f"Transcription completed: {name}")
+            watch["future"].set_result(job)
+
+        elif status == "FAILED":
+            failure_reason = job.get("FailureReason", "Unknown")
+            watch["future"].set_exception(
+                TranscriptionException(f"Transcription failed: {failure_reason}")
+            )
+
+        else:
+            logger.info(f"Transcription status of {name}: {status}. Waiting...")
+            return
+
+        self._count("jobs_finished")
+        del self._watches[name]
+
+    # ======================================================
+    # METRICS
+    # ======================================================
+    def stats(self) -> Dict:
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+
+        status_calls = metrics["list_calls"] + metrics["get_calls"]
+        metrics["in_flight"] = len(self._watches)
+        metrics["status_calls_per_job"] = (
+            round(status_calls / metrics["jobs_finished"], 2) if metrics["jobs_finished"] else None
+        )
+        return metrics
@@ -0,0 +1,240 @@
+import asyncio
+import json
+import queue
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+from urllib.parse import unquote_plus
+
+from app.config import get_settings
+from app.services.client_registry import get_boto3_client
+from app.services.job_queue import get_job_queue
+from app.services.job_store import get_job_store
+from app.services.pipeline import STAGE_DONE, record_upload
+from app.utils.concurrency import run_blocking
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+job_store = get_job_store()
+job_queue = get_job_queue()
+
+
+def parse_s3_event(body: str) -> List[Dict]:
+    """
+    Uploads under S3_AUDIO_PREFIX in an S3 event notification.
+
+    Returns [{job_id, file_extension, size, etag}]; test events and other
+    keys are skipped.
+    """
+    try:
+        message = json.loads(body)
+    except ValueError:
+        logger.warning("[UPLOAD EVENTS] Ignoring a message that is not JSON")
+        return []
+
+    uploads = []
+    for record in message.get("Records", []):
+        if not record.get("eventName", "").startswith("ObjectCreated:"):
+            continue
+
+        obj = record.get("s3", {}).get("object", {})
+        key = unquote_plus(obj.get("key", ""))
+
+        if not key.startswith(settings.S3_AUDIO_PREFIX):
+            continue
+
+        job_id, dot, file_extension = key[len(settings.S3_AUDIO_PREFIX):].rpartition(".")
+        if not dot:
+            job_id, file_extension = file_extension, ""
+
+        uploads.append({
+            "job_id": job_id,
+            "file_extension": file_extension,
+            "size": obj.get("size"),
+            "etag": obj.get("eTag"),
+        })
+
+    return uploads
+
+
+def upload_recorded(record: Dict) -> bool:
+    upload = (record.get("stages") or {}).get("await-upload") or {}
+    return upload.get("status") == STAGE_DONE
+
+
+def queue_started_job(job_id: str) -> bool:
+    """
+    Queue a job once both its upload is confirmed and /start was called.
+
+    Called from both sides, so whichever of the two arrives last queues
+    the job; enqueue() ignores a job that is already queued or running.
+    """
+    record = job_store.get(job_id)
+
+    if record is None or not record.get("start_requested"):
+        return False
+
+    if not upload_recorded(record):
+        return False
+
+    queued = job_queue.enqueue(job_id, {"file_extension": record.get("file_extension", "mp3")})
+    if queued:
+        # Redelivered notifications must not queue the job again
+        job_store.update(job_id, start_requested=False)
+    return queued
+
+
+class UploadEventSource(ABC):
+    """Delivers S3 upload notifications (the raw event JSON bodies)."""
+
+    @abstractmethod
+    def receive(self) -> List[Dict]:
+        """Block until messages arrive or the wait expires: [{body, receipt}]."""
+
+    @abstractmethod
+    def ack(self, message: Dict):
+        """Delete a handled message."""
+
+
+class SQSUploadEventSource(UploadEventSource):
+    """S3 event notifications delivered to an SQS queue, long-polled."""
+
+    def __init__(self, queue_url: str, wait_seconds: int):
+        self.queue_url = queue_url
+        self.wait_seconds = wait_seconds
+        self.sqs_client = get_boto3_client("sqs")
+
+    def receive(self) -> List[Dict]:
+        response = self.sqs_client.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=10,
+            WaitTimeSeconds=self.wait_seconds,
+        )
+        return [
+            {"body": message["Body"], "receipt": message["ReceiptHandle"]}
+            for message in response.get("Messages", [])
+        ]
+
+    def ack(self, message: Dict):
+        self.sqs_client.delete_message(QueueUrl=self.queue_url, ReceiptHandle=message["receipt"])
+
+
+class LocalUploadEventSource(UploadEventSource):
+    """In-process stand-in for the SQS queue, fed by publish()."""
+
+    def __init__(self, wait_seconds: float = 1.0):
+        self.wait_seconds = wait_seconds
+        self._messages: "queue.Queue[Dict]" = queue.Queue()
+
+    def publish(self, key: str, size: int, etag: str, bucket: Optional[str] = None):
+        """Enqueue the notification S3 would send for a completed PUT."""
+        body = json.dumps({
+            "Records": [{
+                "eventName": "ObjectCreated:Put",
+                "s3": {
+                    "bucket": {"name": bucket or settings.S3_BUCKET_NAME},
+                    "object": {"key": key, "size": size, "eTag": etag},
+                },
+            }]
+        })
+        self._messages.put({"body": body, "receipt": None})
+
+    def receive(self) -> List[Dict]:
+        try:
+            return [self._messages.get(timeout=self.wait_seconds)]
+        except queue.Empty:
+            return []
+
+    def ack(self, message: Dict):
+        pass
+
+
+class UploadEventConsumer:
+    """
+    Records uploads as S3 reports them and queues jobs waiting on them.
+
+    Runs as a task in the API process. on_queued is called on the event
+    loop whenever a job was queued, to wake an embedded worker.
+    """
+
+    def __init__(self, source: UploadEventSource, on_queued: Optional[Callable[[], None]] = None):
+        self.source = source
+        self.on_queued = on_queued
+
+        self._metrics_lock = threading.Lock()
+        self._metrics = {"messages": 0, "uploads": 0, "unknown_jobs": 0, "jobs_queued": 0, "errors": 0}
+
+    def _count(self, metric: str):
+        with self._metrics_lock:
+            self._metrics[metric] += 1
+
+    def handle(self, message: Dict) -> bool:
+        """Process one notification; True if it queued a job."""
+        self._count("messages")
+        queued = False
+
+        for upload in parse_s3_event(message["body"]):
+            job_id = upload["job_id"]
+            record = job_store.get(job_id)
+
+            if record is None:
+                self._count("unknown_jobs")
+                continue
+
+            self._count("uploads")
+            logger.info(f"[UPLOAD EVENTS] Upload landed for job {job_id} ({upload['size']} bytes)")
+
+            # Notifications are delivered at least once
+            if not upload_recorded(record):
+                record_upload(job_id, upload["size"], upload["etag"])
+
+            if queue_started_job(job_id):
+                self._count("jobs_queued")
+                queued = True
+
+        self.source.ack(message)
+        return queued
+
+    async def run(self, stop: asyncio.Event):
+        logger.info(f"[UPLOAD EVENTS] Consuming upload notifications ({type(self.source).__name__})")
+
+        while not stop.is_set():
+            try:
+                messages = await run_blocking(self.source.receive)
+
+                for message in messages:
+                    if await run_blocking(self.handle, message) and self.on_queued:
+                        self.on_queued()
+
+            except Exception as e:
+                self._count("errors")
+                logger.error(f"[UPLOAD EVENTS] Failed to process notifications: {e}")
+                await asyncio.sleep(5)
+
+    def stats(self) -> Dict:
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+
+        metrics["source"] = type(self.source).__name__
+        return metrics
+
+
+@lru_cache()
+def get_upload_event_source() -> Optional[UploadEventSource]:
+    backend = settings.UPLOAD_EVENTS_BACKEND.lower()
+
+    if backend == "none":
+        return None
+
+    if backend == "sqs":
+        return SQSUploadEventSource(
+            settings.UPLOAD_EVENTS_SQS_QUEUE_URL, settings.UPLOAD_EVENTS_WAIT_SECONDS
+        )
+
+    if backend == "local":
+        return LocalUploadEventSource()
+
+    raise ValueError(f"Unknown UPLOAD_EVENTS_BACKEND: {settings.UPLOAD_EVENTS_BACKEND}")
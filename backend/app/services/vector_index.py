@@ -0,0 +1,238 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain.docstore.document import Document
+
+from app.services.keyword_index import KeywordIndex
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FORMAT_VERSION = 1
+
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.npy"
+NORMS_FILE = "norms.npy"
+DOCSTORE_FILE = "docstore.json"
+KEYWORD_INDEX_FILE = "keyword_index.json"
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class VectorIndex:
+    """
+    Read-only exact L2 index over a precomputed on-disk artifact.
+
+    An artifact is a versioned directory holding the embedding matrix
+    (vectors.npy), its squared row norms (norms.npy), the chunk documents
+    and their content hashes (docstore.json), a BM25 inverted index over
+    the chunks (keyword_index.json) and a manifest of the embedding model
+    and source file hashes it was built from. The matrices are
+    memory-mapped read-only, so every worker process on a host shares one
+    page-cache copy of the vectors. Scores are squared L2 distances, as
+    FAISS IndexFlatL2 returns.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        manifest: Dict,
+        vectors: np.ndarray,
+        norms: np.ndarray,
+        documents: List[Document],
+        chunk_hashes: List[str],
+        keyword_index: KeywordIndex,
+    ):
+        self.path = path
+        self.manifest = manifest
+        self.vectors = vectors
+        self.norms = norms
+        self.documents = documents
+        self.chunk_hashes = chunk_hashes
+        self.keyword_index = keyword_index
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    # ======================================================
+    # LOAD
+    # ======================================================
+    @classmethod
+    def load(cls, root: str) -> "VectorIndex":
+        """Memory-map the artifact that root/CURRENT points at."""
+        path = current_artifact_path(root)
+        if path is None:
+            raise FileNotFoundError(f"No index artifact under {root}")
+
+        with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        if manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported index format {manifest.get('format_version')} in {path}"
+            )
+
+        vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r")
+        norms = np.load(os.path.join(path, NORMS_FILE), mmap_mode="r")
+
+        with open(os.path.join(path, DOCSTORE_FILE), "r", encoding="utf-8") as f:
+            entries = json.load(f)
+
+        documents = [
+            Document(page_content=entry["content"], metadata=entry["metadata"])
+            for entry in entries
+        ]
+        # Artifacts written before chunk hashes were stored
+        chunk_hashes = [
+            entry.get("hash") or chunk_sha256(entry["content"]) for entry in entries
+        ]
+
+        keyword_path = os.path.join(path, KEYWORD_INDEX_FILE)
+        if os.path.exists(keyword_path):
+            with open(keyword_path, "r", encoding="utf-8") as f:
+                keyword_index = KeywordIndex.from_dict(json.load(f))
+        else:
+            # Artifacts written before the inverted index was stored
+            keyword_index = KeywordIndex.build([doc.page_content for doc in documents])
+
+        if (
+            len(documents) != vectors.shape[0]
+            or vectors.shape[1] != manifest["dimension"]
+            or len(keyword_index) != len(documents)
+        ):
+            raise ValueError(f"Index artifact {path} is inconsistent with its manifest")
+
+        return cls(path, manifest, vectors, norms, documents, chunk_hashes, keyword_index)
+
+    # ======================================================
+    # SEARCH
+    # ======================================================
+    def search(self, query_vectors: List[List[float]], k: int) -> List[List[Tuple[int, float]]]:
+        """
+        Nearest chunks for a batch of query vectors in one matrix product.
+
+        Returns:
+            Per query, up to k (row, squared L2 distance), nearest first
+        """
+        if not self.documents:
+            return [[] for _ in query_vectors]
+
+        queries = np.asarray(query_vectors, dtype=np.float32).reshape(-1, self.vectors.shape[1])
+        distances = (
+            self.norms[None, :]
+            - 2.0 * (queries @ self.vectors.T)
+            + np.einsum("ij,ij->i", queries, queries)[:, None]
+        )
+
+        k = min(k, len(self.documents))
+        top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+
+        results = []
+        for row_distances, candidates in zip(distances, top):
+            ordered = candidates[np.argsort(row_distances[candidates])]
+            results.append([(int(i), float(max(row_distances[i], 0.0))) for i in ordered])
+        return results
+
+
+def current_artifact_path(root: str) -> Optional[str]:
+    pointer = os.path.join(root, CURRENT_FILE)
+    if not os.path.exists(pointer):
+        return None
+
+    with open(pointer, "r", encoding="utf-8") as f:
+        version = f.read().strip()
+
+    path = os.path.join(root, version)
+    return path if os.path.isdir(path) else None
+
+
+def write_artifact(root: str, vectors: np.ndarray, documents: List[Document], manifest: Dict) -> str:
+    """
+    Write a new index version under root and atomically point CURRENT at it.
+
+    Workers already running keep reading the version they mapped; older
+    versions other than the previous one are removed.
+
+    Returns:
+        Path of the new artifact directory
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if vectors.ndim != 2 or vectors.shape[0] != len(documents):
+        raise ValueError("vectors must be a (documents x dimension) matrix")
+
+    os.makedirs(root, exist_ok=True)
+    previous = current_artifact_path(root)
+
+    manifest = dict(manifest)
+    manifest.update({
+        "format_version": FORMAT_VERSION,
+        "dimension": int(vectors.shape[1]),
+        "count": len(documents),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    })
+
+    content_hash = hashlib.sha256(
+        json.dumps(manifest.get("sources", {}), sort_keys=True).encode("utf-8")
+        + vectors.tobytes()
+    ).hexdigest()[:12]
+    version = f"v{time.strftime('%Y%m%d%H%M%S', time.gmtime())}-{content_hash}"
+    manifest["version"] = version
+
+    staging = tempfile.mkdtemp(prefix=".staging-", dir=root)
+    os.chmod(staging, 0o755)
+    np.save(os.path.join(staging, VECTORS_FILE), vectors)
+    np.save(os.path.join(staging, NORMS_FILE), np.einsum("ij,ij->i", vectors, vectors))
+
+    with open(os.path.join(staging, DOCSTORE_FILE), "w", encoding="utf-8") as f:
+        json.dump(
+            [
+                {
+                    "content": doc.page_content,
+                    "metadata": doc.metadata,
+                    "hash": chunk_sha256(doc.page_content),
+                }
+                for doc in documents
+            ],
+            f,
+            ensure_ascii=False,
+        )
+
+    with open(os.path.join(staging, KEYWORD_INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump(KeywordIndex.build([doc.page_content for doc in documents]).to_dict(), f)
+
+    with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    path = os.path.join(root, version)
+    os.replace(staging, path)
+
+    pointer_tmp = os.path.join(root, f".{CURRENT_FILE}.tmp")
+    with open(pointer_tmp, "w", encoding="utf-8") as f:
+        f.write(version + "\n")
+    os.replace(pointer_tmp, os.path.join(root, CURRENT_FILE))
+
+    keep = {version, os.path.basename(previous) if previous else None}
+    for entry in os.listdir(root):
+        entry_path = os.path.join(root, entry)
+        if entry.startswith("v") and entry not in keep and os.path.isdir(entry_path):
+            shutil.rmtree(entry_path, ignore_errors=True)
+
+    logger.info(f"[RAG INDEX] Wrote {len(documents)} vectors to {path}")
+    return path
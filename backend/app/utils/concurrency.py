@@ -0,0 +1,32 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Bounded pool for blocking SDK work (boto3, Groq, JSON parsing) so it never
+# runs on the event loop thread.
+_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.PIPELINE_MAX_WORKERS),
+    thread_name_prefix="pipeline",
+)
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking callable on the pipeline executor.
+
+    Args:
+        func: Blocking callable
+        *args, **kwargs: Arguments forwarded to func
+
+    Returns:
+        The callable's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor, functools.partial(func, *args, **kwargs)
+    )
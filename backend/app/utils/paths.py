@@ -0,0 +1,16 @@
+import os
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+
+def resolve_data_path(path: str) -> str:
+    """
+    Resolve a path from settings.
+
+    Args:
+        path: Absolute path, or path relative to the backend directory
+
+    Returns:
+        Absolute path
+    """
+    return path if os.path.isabs(path) else os.path.join(BACKEND_ROOT, path)
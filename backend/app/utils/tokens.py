@@ -0,0 +1,6 @@
+import math
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (~4 characters per token for English)."""
+    return math.ceil(len(text) / 4)
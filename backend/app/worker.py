@@ -0,0 +1,210 @@
+"""
+Pipeline worker — runs queued audio jobs outside the API process.
+
+Each process claims jobs from the job queue with a lease, runs up to
+JOB_WORKER_CONCURRENCY of them at once, and renews the leases while they
+run. A job whose worker is killed is claimed again by another worker once
+its lease expires and resumes from its last checkpoint.
+
+Usage:
+  cd backend
+  python -m app.worker --processes 4
+
+Run the API with JOB_WORKER_EMBEDDED=false. The job store must stay on
+sqlite (the default) so job progress is shared between the API and the
+workers.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+from typing import Dict, Optional
+
+from app.config import get_settings
+from app.models import ProcessingStatus
+from app.services.job_queue import JobQueue
+from app.utils.concurrency import run_blocking
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class PipelineWorker:
+    """
+    Claims queued jobs and runs process_audio_pipeline for each.
+
+    Runs on an asyncio loop: in a worker process started by main(), or as a
+    task inside the API process when JOB_WORKER_EMBEDDED is set.
+    """
+
+    def __init__(self, queue: JobQueue, worker_id: str, concurrency: int):
+        self.queue = queue
+        self.worker_id = worker_id
+        self.concurrency = max(1, concurrency)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running: Dict[str, asyncio.Task] = {}
+
+    def wake(self):
+        """Check the queue now instead of after the poll interval."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run(self, stop: asyncio.Event):
+        """Claim and run jobs until stop is set, then hand running jobs back."""
+        self._wakeup = asyncio.Event()
+        logger.info(f"[WORKER] {self.worker_id} started (concurrency {self.concurrency})")
+
+        try:
+            while not stop.is_set():
+                self._wakeup.clear()
+
+                while len(self._running) < self.concurrency:
+                    job = await run_blocking(self.queue.claim, self.worker_id)
+                    if job is None:
+                        break
+
+                    self._running[job["job_id"]] = asyncio.create_task(self._run_job(job))
+
+                # Sleep until a job finishes, a job is queued, or the poll interval
+                waiters = [asyncio.ensure_future(self._wakeup.wait()), asyncio.ensure_future(stop.wait())]
+                await asyncio.wait(
+                    waiters + list(self._running.values()),
+                    timeout=settings.JOB_QUEUE_POLL_INTERVAL_SECONDS,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for waiter in waiters:
+                    waiter.cancel()
+
+        finally:
+            await self._shutdown()
+
+    async def _shutdown(self):
+        # Running jobs go back on the queue so another worker resumes them
+        # immediately rather than after the lease expires
+        for task in list(self._running.values()):
+            task.cancel()
+
+        if self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+        logger.info(f"[WORKER] {self.worker_id} stopped")
+
+    async def _run_job(self, job: Dict):
+        job_id = job["job_id"]
+        lease = asyncio.create_task(self._keep_lease(job_id))
+
+        # Imported here so the worker supervisor process stays lightweight
+        from app.services.pipeline import job_store, process_audio_pipeline
+
+        logger.info(f"[WORKER] {self.worker_id} running job {job_id} (attempt {job['attempts']})")
+
+        pipeline = asyncio.create_task(
+            process_audio_pipeline(job_id, job["payload"].get("file_extension", "mp3"))
+        )
+
+        try:
+            done, _ = await asyncio.wait({pipeline, lease}, return_when=asyncio.FIRST_COMPLETED)
+
+            if pipeline not in done:
+                # Lease lost: another worker owns the job now
+                pipeline.cancel()
+                logger.warning(f"[WORKER] {self.worker_id} lost the lease on job {job_id}")
+                return
+
+            record = job_store.get(job_id) or {}
+            if record.get("status") == ProcessingStatus.FAILED.value:
+                await run_blocking(
+                    self.queue.fail, job_id, self.worker_id, record.get("error_message") or "Processing failed"
+                )
+            else:
+                await run_blocking(self.queue.complete, job_id, self.worker_id)
+
+        except asyncio.CancelledError:
+            pipeline.cancel()
+            await run_blocking(self.queue.release, job_id, self.worker_id)
+            raise
+
+        except Exception as e:
+            logger.error(f"[WORKER] Job {job_id} crashed: {e}")
+            await run_blocking(self.queue.fail, job_id, self.worker_id, str(e))
+
+        finally:
+            lease.cancel()
+            self._running.pop(job_id, None)
+            self.wake()
+
+    async def _keep_lease(self, job_id: str):
+        """Renew the lease every third of its length; returns if it is lost."""
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+
+            if not await run_blocking(self.queue.extend, job_id, self.worker_id):
+                return
+
+
+# ==========================================================
+# WORKER PROCESSES
+# ==========================================================
+def run_worker_process(index: int, concurrency: int):
+    """Entry point of one worker process."""
+    from app.services.job_queue import get_job_queue
+
+    worker = PipelineWorker(
+        get_job_queue(), f"{socket.gethostname()}-{os.getpid()}-{index}", concurrency
+    )
+
+    async def serve():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+
+        await worker.run(stop)
+
+    asyncio.run(serve())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run pipeline worker processes")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY,
+                        help="Jobs each process runs at once")
+    args = parser.parse_args()
+
+    if settings.JOB_STORE_BACKEND.lower() != "sqlite":
+        logger.error("[WORKER] JOB_STORE_BACKEND must be 'sqlite' so the API sees worker progress")
+        return 1
+
+    # Spawned, not forked: each worker builds its own clients and pools
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_worker_process, args=(index, args.concurrency), name=f"worker-{index}")
+        for index in range(max(1, args.processes))
+    ]
+
+    def forward(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+
+    for process in processes:
+        process.start()
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+
+    logger.info(f"[WORKER] Started {len(processes)} worker processes x {args.concurrency} jobs")
+
+    for process in processes:
+        process.join()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,7 +15,7 @@ export default function AudioUpload({ setJobId }) {
       setJobId(jobId);
     } catch (err) {
       console.error(err);
-      alert("Upload failed");
+      alert(`Upload failed: ${err.message}`);
     }
   }
 
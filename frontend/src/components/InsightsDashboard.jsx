@@ -1,10 +1,11 @@
 import { useEffect, useState } from "react";
-import { uploadAudioFile, getJobStatus } from "../services/api";
+import { uploadAudioFile, getJobStatus, subscribeToJob } from "../services/api";
 
 export default function InsightsDashboard() {
 
   const [jobId, setJobId] = useState(null);
   const [status, setStatus] = useState(null);
+  const [partials, setPartials] = useState({});
   const [report, setReport] = useState(null);
   const [transcript, setTranscript] = useState(null);
   const [loading, setLoading] = useState(false);
@@ -24,43 +25,71 @@ export default function InsightsDashboard() {
 
       const newJobId = await uploadAudioFile(file);
 
+      setPartials({});
       setJobId(newJobId);
 
     } catch (err) {
       console.error(err);
-      setError("Upload failed.");
+      setError(`Upload failed: ${err.message}`);
       setLoading(false);
     }
   };
 
   // =========================================================
-  // POLLING LOOP (ULTRA SAFE)
+  // STATUS UPDATES (SSE, POLLING FALLBACK)
   // =========================================================
   useEffect(() => {
 
     if (!jobId) return;
 
     let interval;
+    let unsubscribe;
+    let finished = false;
 
-    const poll = async () => {
+    const applyStatus = (data) => {
 
-      try {
-        const data = await getJobStatus(jobId);
+      setStatus(data);
+
+      // Polls return each agent's full text; SSE events only the new text
+      if (data.partial_insights) {
+        setPartials(Object.fromEntries(
+          data.partial_insights.map((insight) => [insight.agent_name, insight.analysis])
+        ));
+      }
 
-        setStatus(data);
+      if (data.partial_updates?.length) {
+        setPartials((prev) => {
+          const next = { ...prev };
+          for (const update of data.partial_updates) {
+            next[update.agent_name] = (next[update.agent_name] || "") + update.analysis;
+          }
+          return next;
+        });
+      }
 
-        if (data.transcript) {
-          setTranscript(data.transcript);
-        }
+      if (data.transcript) {
+        setTranscript(data.transcript);
+      }
 
-        if (data.report) {
-          setReport(data.report);
-        }
+      if (data.report) {
+        setReport(data.report);
+      }
 
-        if (data.status === "completed" || data.status === "failed") {
-          setLoading(false);
-          clearInterval(interval);
-        }
+      if (data.status === "completed" || data.status === "failed") {
+        finished = true;
+        setLoading(false);
+        clearInterval(interval);
+      }
+    };
+
+    const poll = async () => {
+
+      try {
+        // Progress polls skip the transcript/report; fetch them once at the end
+        const summary = await getJobStatus(jobId, "summary");
+        const done = summary.status === "completed" || summary.status === "failed";
+
+        applyStatus(done ? await getJobStatus(jobId) : summary);
 
       } catch (err) {
         console.error(err);
@@ -70,10 +99,24 @@ export default function InsightsDashboard() {
       }
     };
 
-    poll();
-    interval = setInterval(poll, 3000);
+    const startPolling = () => {
+      if (finished) return;
+      poll();
+      interval = setInterval(poll, 3000);
+    };
+
+    unsubscribe = subscribeToJob(jobId, {
+      onStatus: applyStatus,
+      onComplete: applyStatus,
+      onError: startPolling,
+    });
 
-    return () => clearInterval(interval);
+    if (!unsubscribe) startPolling();
+
+    return () => {
+      unsubscribe?.();
+      clearInterval(interval);
+    };
 
   }, [jobId]);
 
@@ -95,6 +138,15 @@ export default function InsightsDashboard() {
 
   const renderReport = () => {
 
+    if (!report && status?.status !== "failed" && Object.keys(partials).length) {
+      return Object.entries(partials).map(([agentName, analysis]) => (
+        <div key={agentName}>
+          <h4>{agentName} (in progress)</h4>
+          <p style={{ whiteSpace: "pre-wrap" }}>{analysis}</p>
+        </div>
+      ));
+    }
+
     if (!report) return <p>No report yet.</p>;
 
     return (
@@ -39,7 +39,8 @@ export async function uploadToS3(presignedUrl, file, onProgress) {
 
     xhr.onload = () => {
       if (xhr.status === 200) {
-        resolve();
+        // Readable when the bucket CORS rule exposes ETag
+        resolve(xhr.getResponseHeader("ETag"));
       } else {
         console.error("S3 upload failed:", xhr.responseText);
         reject(new Error(`S3 upload failed (${xhr.status})`));
@@ -55,12 +56,37 @@ export async function uploadToS3(presignedUrl, file, onProgress) {
 /* ===================================================
    JOB STATUS
    =================================================== */
-export async function getJobStatus(jobId) {
-  const res = await fetch(`${API_BASE}/status/${jobId}`);
+export async function getJobStatus(jobId, view = "full") {
+  const res = await fetch(`${API_BASE}/status/${jobId}?view=${view}`);
   if (!res.ok) throw new Error("Status fetch failed");
   return res.json();
 }
 
+/* ===================================================
+   JOB STATUS STREAM (SERVER-SENT EVENTS)
+   Returns an unsubscribe function, or null when the
+   browser has no EventSource (caller should poll).
+   =================================================== */
+export function subscribeToJob(jobId, { onStatus, onComplete, onError }) {
+  if (typeof EventSource === "undefined") return null;
+
+  const source = new EventSource(`${API_BASE}/jobs/${jobId}/events`);
+
+  source.addEventListener("status", (e) => onStatus?.(JSON.parse(e.data)));
+
+  source.addEventListener("complete", (e) => {
+    source.close();
+    onComplete?.(JSON.parse(e.data));
+  });
+
+  source.onerror = (e) => {
+    source.close();
+    onError?.(e);
+  };
+
+  return () => source.close();
+}
+
 /* ===================================================
    🔥 FINAL PRODUCTION UPLOAD FLOW (EXTENSION SAFE)
    =================================================== */
@@ -71,12 +97,20 @@ export async function uploadAudioFile(file, onProgress) {
   const { job_id, upload_url } = await requestUploadUrl(ext);
 
   // STEP 2 — upload to S3
-  await uploadToS3(upload_url, file, onProgress);
+  const etag = await uploadToS3(upload_url, file, onProgress);
 
-  // STEP 3 — start pipeline AFTER upload
-  await fetch(`${API_BASE}/start/${job_id}`, {
+  // STEP 3 — start pipeline AFTER upload (the API verifies it once)
+  const res = await fetch(`${API_BASE}/start/${job_id}`, {
     method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ size: file.size, etag }),
   });
 
+  // 409 when the upload is missing or does not match what was sent
+  if (!res.ok) {
+    const body = await res.json().catch(() => ({}));
+    throw new Error(body.detail || `Start failed (${res.status})`);
+  }
+
   return job_id;
 }
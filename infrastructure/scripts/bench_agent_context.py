@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+bench_agent_context.py — Measure inter-agent prompt context size
+
+Renders the earlier agents' results each app/agents consumer receives
+(Sales Coach, Objection Expert, Supervisor) in the previous indented-JSON
+format and in the compact field-selected format, for a representative
+discovery call's analyses, and reports the estimated tokens per call.
+
+Usage:
+  cd backend
+  python ../infrastructure/scripts/bench_agent_context.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add backend to Python path so we can import from app/
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from app.agents.base_agent import format_agent_context
+from app.agents.objection_expert import ObjectionExpertAgent
+from app.agents.sales_coach import SalesCoachAgent
+from app.agents.supervisor import SupervisorAgent
+from app.utils.tokens import estimate_tokens
+
+
+ANALYZER = {
+    "agent_name": "Transcript Analyzer",
+    "analysis": {
+        "call_phases": ["introduction", "discovery", "product demo", "pricing discussion", "next steps"],
+        "speaker_roles": {"spk_0": "sales rep", "spk_1": "VP of Operations"},
+        "customer_pain_points": [
+            "Manual reporting takes the ops team two days every month",
+            "Current vendor has no API, so data is re-keyed into the ERP",
+            "Leadership wants visibility into regional performance",
+        ],
+        "questions_asked_by_rep": [
+            "How are you building the monthly reports today?",
+            "Who else is involved in evaluating a new tool?",
+            "What would it mean for your team to get those two days back?",
+        ],
+        "questions_asked_by_customer": [
+            "Does it integrate with NetSuite?",
+            "What does onboarding look like?",
+            "Is there a discount for a two-year contract?",
+        ],
+        "key_topics": ["reporting automation", "ERP integration", "pricing", "onboarding timeline"],
+        "conversation_quality": "Good rapport and a clear agenda; discovery was solid but the close was soft.",
+        "summary": "Discovery call with an ops leader frustrated by manual reporting; strong fit, "
+                   "pricing concerns raised, follow-up demo with finance proposed.",
+    },
+}
+
+COACH = {
+    "agent_name": "Sales Coach",
+    "analysis": {
+        "overall_score": 7.0,
+        "strengths": ["Set a clear agenda", "Quantified the cost of manual reporting", "Built rapport early"],
+        "weaknesses": ["Did not confirm the decision process", "Accepted the price objection without probing",
+                       "Ended without a firm next meeting"],
+        "discovery_assessment": "Good use of open questions and implication questions around reporting time.",
+        "presentation_quality": "Demo was tailored to the reporting pain but ran long on admin features.",
+        "closing_effectiveness": "Soft close; proposed a follow-up but did not book it.",
+        "rapport_building": "Warm and conversational, mirrored the customer's pace.",
+        "coaching_recommendations": ["Map the buying committee before the demo",
+                                     "Use the feel-felt-found method on price",
+                                     "Book the next meeting before hanging up"],
+        "top_priority_improvement": "Closing for a concrete next step",
+    },
+}
+
+OBJECTIONS = {
+    "agent_name": "Objection Expert",
+    "analysis": {
+        "objections_detected": [
+            {
+                "objection": "It's more than we budgeted for this year",
+                "type": "price",
+                "severity": "high",
+                "how_handled": "Rep offered a discount immediately",
+                "effectiveness_score": 4,
+                "missed_opportunity": "Tie the price to the two days of reporting time saved each month",
+                "recommended_approach": "Isolate the objection, then reframe around ROI",
+            },
+            {
+                "objection": "I need to run this by our CFO",
+                "type": "authority",
+                "severity": "medium",
+                "how_handled": "Rep agreed to send materials",
+                "effectiveness_score": 5,
+                "missed_opportunity": "Offer to join the CFO conversation",
+                "recommended_approach": "Propose a joint call with finance",
+            },
+        ],
+        "overall_objection_handling_score": 5.0,
+        "unaddressed_concerns": ["Onboarding effort for the ops team"],
+        "key_improvements": ["Probe before discounting", "Engage the economic buyer directly"],
+        "framework_recommendations": ["LAER", "Feel-Felt-Found"],
+    },
+}
+
+
+def indented(previous_analyses, supervisor: bool = False) -> str:
+    """The previous json.dumps(..., indent=2) rendering."""
+    if supervisor:
+        return "\n\n".join(
+            f"## {analysis['agent_name']}\n{json.dumps(analysis.get('analysis', {}), indent=2)}"
+            for analysis in previous_analyses
+        )
+    return "".join(
+        f"\n### {analysis['agent_name']}:\n{json.dumps(analysis.get('analysis', {}), indent=2)}\n"
+        for analysis in previous_analyses
+    )
+
+
+def main():
+    consumers = [
+        ("Sales Coach", SalesCoachAgent, [ANALYZER], False),
+        ("Objection Expert", ObjectionExpertAgent, [ANALYZER], False),
+        ("Supervisor", SupervisorAgent, [ANALYZER, COACH, OBJECTIONS], True),
+    ]
+
+    print("=" * 72)
+    print("  INTER-AGENT CONTEXT TOKENS PER CALL (estimated)")
+    print("=" * 72)
+    print(f"  {'consumer':18s} {'indented':>10s} {'compact':>10s} {'reduction':>10s}")
+
+    total_before = total_after = 0
+    for name, agent_class, previous, supervisor in consumers:
+        before = estimate_tokens(indented(previous, supervisor))
+        after = estimate_tokens(format_agent_context(previous, agent_class.CONTEXT_FIELDS))
+        total_before += before
+        total_after += after
+        print(f"  {name:18s} {before:10d} {after:10d} {1 - after / before:9.0%}")
+
+    print(f"  {'total':18s} {total_before:10d} {total_after:10d} {1 - total_after / total_before:9.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
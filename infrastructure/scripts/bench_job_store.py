@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+bench_job_store.py — Benchmark job store backends under concurrent access
+
+Each worker thread creates jobs, walks them through the pipeline's status
+updates, attaches a transcript and report, and interleaves status reads the
+way polling clients do. Reports throughput, read/write latency percentiles
+and the store's eviction metrics for every backend.
+
+Usage:
+  cd backend
+  python ../infrastructure/scripts/bench_job_store.py --threads 8 --jobs 500
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add backend to Python path so we can import from app/
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from app.models import SalesReport, TranscriptResponse, TranscriptSegment
+from app.services.job_store import InMemoryJobStore, SQLiteJobStore
+
+
+STATUS_STEPS = [
+    ("pending", 0), ("transcribing", 10), ("transcribing", 20),
+    ("transcribing", 50), ("analyzing", 60), ("completed", 100),
+]
+
+
+def sample_payloads(job_id: str, segments: int):
+    transcript = TranscriptResponse(
+        job_id=job_id,
+        segments=[
+            TranscriptSegment(
+                speaker=f"spk_{i % 2}",
+                text="we can integrate with your team before the renewal quarter " * 3,
+                start_time=i * 6.0,
+                end_time=i * 6.0 + 5.9,
+            )
+            for i in range(segments)
+        ],
+        duration=segments * 6.0,
+        word_count=segments * 30,
+    )
+    report = SalesReport(
+        job_id=job_id,
+        call_summary="Summary " * 40,
+        overall_score=7.5,
+        strengths=["Clear agenda"] * 5,
+        weaknesses=["Weak close"] * 5,
+        missed_opportunities=["Ask about budget"] * 5,
+        objections_detected=[],
+        recommended_actions=["Practice discovery"] * 5,
+        agent_insights=[],
+    )
+    return transcript, report
+
+
+def run_worker(store, worker: int, jobs: int, reads_per_step: int, segments: int):
+    read_latencies = []
+    write_latencies = []
+
+    for n in range(jobs):
+        job_id = f"bench-{worker}-{n}"
+        transcript, report = sample_payloads(job_id, segments)
+
+        for status, progress in STATUS_STEPS:
+            start = time.perf_counter()
+            store.update(job_id, status=status, progress_percentage=progress, current_step=status)
+            if progress == 60:
+                store.save_transcript(job_id, transcript)
+            if progress == 100:
+                store.save_report(job_id, report)
+            write_latencies.append(time.perf_counter() - start)
+
+            for _ in range(reads_per_step):
+                start = time.perf_counter()
+                store.get(job_id)
+                read_latencies.append(time.perf_counter() - start)
+
+    return read_latencies, write_latencies
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def bench(name, store, args):
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        results = list(pool.map(
+            lambda worker: run_worker(store, worker, args.jobs, args.reads, args.segments),
+            range(args.threads),
+        ))
+
+    elapsed = time.perf_counter() - started
+    reads = [latency for r, _ in results for latency in r]
+    writes = [latency for _, w in results for latency in w]
+    stats = store.stats()
+
+    print(f"  {name}")
+    print(f"    ops/s        {(len(reads) + len(writes)) / elapsed:12,.0f}")
+    print(
+        f"    read  p50/p99 {statistics.median(reads) * 1e6:8.1f}us "
+        f"{percentile(reads, 99) * 1e6:8.1f}us"
+    )
+    print(
+        f"    write p50/p99 {statistics.median(writes) * 1e6:8.1f}us "
+        f"{percentile(writes, 99) * 1e6:8.1f}us"
+    )
+    print(
+        f"    jobs={stats['jobs']} evictions={stats['evictions']} "
+        f"expirations={stats['expirations']} hits={stats['hits']} misses={stats['misses']}"
+    )
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--jobs", type=int, default=200, help="jobs per thread")
+    parser.add_argument("--reads", type=int, default=5, help="status reads per status update")
+    parser.add_argument("--segments", type=int, default=200, help="transcript segments per job")
+    parser.add_argument("--max-jobs", type=int, default=1000)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"  JOB STORE BENCHMARK ({args.threads} threads x {args.jobs} jobs)")
+    print("=" * 80)
+
+    bench("InMemoryJobStore", InMemoryJobStore(args.max_jobs, ttl_seconds=3600), args)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs.sqlite3")
+        bench("SQLiteJobStore", SQLiteJobStore(path, args.max_jobs, ttl_seconds=3600), args)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+bench_map_reduce.py — Compare single-pass and map-reduce call analysis
+
+Runs AgentOrchestrationService.analyze_call on synthetic transcripts of
+increasing duration in both modes against a simulated Groq client whose
+latency grows with prompt and completion tokens, and reports wall-clock
+time, LLM calls, total tokens and the largest prompt sent in one call
+(the figure that hits the model's context limit).
+
+Usage:
+  cd backend
+  python ../infrastructure/scripts/bench_map_reduce.py --minutes 5 15 30 60
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import types
+from pathlib import Path
+
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("RAG_ENABLED", "false")
+
+# Add backend to Python path so we can import from app/
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from app.models import TranscriptResponse, TranscriptSegment
+from app.services import agent_service as agent_module
+from app.services.agent_service import AgentOrchestrationService, estimate_tokens
+
+
+WORDS_PER_MINUTE = 150
+VOCABULARY = [
+    "pricing", "budget", "team", "timeline", "demo", "contract", "we", "you",
+    "need", "can", "integrate", "support", "renewal", "discount", "quarter",
+]
+
+
+class SimulatedGroq:
+    """Latency = overhead + prompt prefill + completion decode, scaled down."""
+
+    def __init__(self, scale: float, completion_tokens: int = 400):
+        self.scale = scale
+        self.completion_tokens = completion_tokens
+        self.max_prompt_tokens = 0
+        self.chat = types.SimpleNamespace(
+            completions=types.SimpleNamespace(create=self.create)
+        )
+
+    def create(self, model, temperature, messages, **kwargs):
+        prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+        self.max_prompt_tokens = max(self.max_prompt_tokens, prompt_tokens)
+
+        # ~0.3s overhead, 5k tokens/s prefill, 250 tokens/s decode
+        latency = 0.3 + prompt_tokens / 5000 + self.completion_tokens / 250
+        time.sleep(latency * self.scale)
+
+        # Agent calls are streamed; one content chunk, usage on the last
+        return SimulatedStream([
+            types.SimpleNamespace(
+                choices=[types.SimpleNamespace(
+                    delta=types.SimpleNamespace(content="finding " * self.completion_tokens)
+                )],
+                x_groq=None,
+            ),
+            types.SimpleNamespace(
+                choices=[],
+                x_groq=types.SimpleNamespace(usage=types.SimpleNamespace(
+                    prompt_tokens=prompt_tokens, completion_tokens=self.completion_tokens
+                )),
+            ),
+        ])
+
+
+class SimulatedStream(list):
+    def close(self):
+        pass
+
+
+def synthetic_transcript(minutes: int, seed: int = 11) -> TranscriptResponse:
+    rng = random.Random(seed)
+    words = minutes * WORDS_PER_MINUTE
+    segments = []
+
+    for turn in range(0, words, 20):
+        segments.append(TranscriptSegment(
+            speaker=f"spk_{(turn // 20) % 2}",
+            text=" ".join(rng.choice(VOCABULARY) for _ in range(min(20, words - turn))),
+            start_time=turn * 0.4,
+            end_time=(turn + 20) * 0.4,
+        ))
+
+    return TranscriptResponse(
+        job_id="bench", segments=segments, duration=minutes * 60.0, word_count=words
+    )
+
+
+def run(service: AgentOrchestrationService, transcript: TranscriptResponse, threshold: int, scale: float):
+    client = SimulatedGroq(scale)
+    service.client = client
+    service.usage = {"llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    agent_module.settings.ANALYSIS_MAP_REDUCE_THRESHOLD_TOKENS = threshold
+
+    started = time.perf_counter()
+    service.analyze_call("bench", transcript)
+    elapsed = (time.perf_counter() - started) / scale
+
+    usage = service.usage_stats()
+    return elapsed, usage, client.max_prompt_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--minutes", type=int, nargs="+", default=[5, 15, 30, 60])
+    parser.add_argument("--concurrency", type=int, default=12)
+    parser.add_argument("--chunk-tokens", type=int, default=3000)
+    parser.add_argument("--scale", type=float, default=0.05, help="real seconds per simulated second")
+    args = parser.parse_args()
+
+    agent_module.settings.AGENT_MAX_CONCURRENCY = args.concurrency
+    agent_module.settings.ANALYSIS_CHUNK_TOKENS = args.chunk_tokens
+    service = AgentOrchestrationService()
+
+    print("=" * 96)
+    print(f"  SINGLE-PASS vs MAP-REDUCE (concurrency {args.concurrency}, chunks of {args.chunk_tokens} tokens)")
+    print("=" * 96)
+    print(
+        f"  {'min':>4s} {'tokens':>7s} | {'mode':11s} {'latency':>9s} {'calls':>6s} "
+        f"{'prompt tok':>11s} {'compl tok':>10s} {'max prompt':>11s}"
+    )
+
+    for minutes in args.minutes:
+        transcript = synthetic_transcript(minutes)
+        text_tokens = estimate_tokens(
+            "\n".join(f"{s.speaker}: {s.text}" for s in transcript.segments)
+        )
+
+        for mode, threshold in (("single", 10 ** 9), ("map-reduce", 0)):
+            elapsed, usage, max_prompt = run(service, transcript, threshold, args.scale)
+            print(
+                f"  {minutes:4d} {text_tokens:7d} | {mode:11s} {elapsed:8.1f}s {usage['llm_calls']:6d} "
+                f"{usage['prompt_tokens']:11,d} {usage['completion_tokens']:10,d} {max_prompt:11,d}"
+            )
+
+    print()
+    print("  Latency is simulated model time; max prompt is the largest single request.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
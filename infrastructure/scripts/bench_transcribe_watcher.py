@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+bench_transcribe_watcher.py — Compare Transcribe status polling strategies
+
+Runs a batch of concurrent simulated Transcribe jobs (clips from 15s to 30
+minutes, finishing at a jittered multiple of their length) and waits for
+each one in two ways:
+
+  fixed    get_transcription_job every 10s per job (the previous loop)
+  watcher  TranscriptionWatcher: schedule scaled to the audio length,
+           batched list_transcription_jobs rounds
+
+and reports how long each job waited past its real finish and how many
+status calls it cost. Simulated time runs --scale times faster than real
+time, so no AWS access is needed.
+
+Usage:
+  cd backend
+  python ../infrastructure/scripts/bench_transcribe_watcher.py --jobs 40
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+FIXED_INTERVAL = 10.0   # simulated seconds between checks in the old loop
+BYTES_PER_SECOND = 16000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--scale", type=float, default=50.0,
+                        help="Simulated seconds per real second")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+args = parse_args()
+TICK = 1.0 / args.scale  # real seconds per simulated second
+
+# The watcher reads its schedule from settings; compress it like the jobs
+os.environ["TRANSCRIBE_AUDIO_BYTES_PER_SECOND"] = str(BYTES_PER_SECOND / TICK)
+os.environ["TRANSCRIBE_EXPECTED_BASE_SECONDS"] = str(10.0 * TICK)
+os.environ["TRANSCRIBE_POLL_MIN_INTERVAL_SECONDS"] = str(1.0 * TICK)
+os.environ["TRANSCRIBE_POLL_MAX_INTERVAL_SECONDS"] = str(15.0 * TICK)
+
+# Add backend to Python path so we can import from app/
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from app.config import get_settings
+from app.services.transcription_watcher import TranscriptionWatcher
+
+
+class SimulatedTranscribe:
+    """Jobs finish at a fixed real time; counts every status call."""
+
+    def __init__(self):
+        self.finish_at = {}
+        self.calls = 0
+
+    def status(self, name):
+        return "COMPLETED" if time.monotonic() >= self.finish_at[name] else "IN_PROGRESS"
+
+    def get_transcription_job(self, TranscriptionJobName):
+        self.calls += 1
+        return {"TranscriptionJob": {
+            "TranscriptionJobName": TranscriptionJobName,
+            "TranscriptionJobStatus": self.status(TranscriptionJobName),
+        }}
+
+    def list_transcription_jobs(self, Status, **kwargs):
+        self.calls += 1
+        return {"TranscriptionJobSummaries": [
+            {"TranscriptionJobName": name, "TranscriptionJobStatus": Status}
+            for name in self.finish_at if self.status(name) == Status
+        ]}
+
+
+def make_jobs(count: int, seed: int):
+    """(name, audio seconds, start offset, turnaround) in simulated seconds."""
+    rng = random.Random(seed)
+    prefix = get_settings().TRANSCRIBE_JOB_PREFIX
+    jobs = []
+
+    for index in range(count):
+        audio_seconds = rng.choice([15, 45, 120, 300, 600, 1800])
+        turnaround = (8.0 + 0.25 * audio_seconds) * rng.uniform(0.7, 1.4)
+        jobs.append((f"{prefix}bench-{index}", audio_seconds, rng.uniform(0, 60), turnaround))
+
+    return jobs
+
+
+async def wait_fixed(client, name):
+    while True:
+        response = await asyncio.to_thread(client.get_transcription_job, TranscriptionJobName=name)
+        if response["TranscriptionJob"]["TranscriptionJobStatus"] == "COMPLETED":
+            return
+        await asyncio.sleep(FIXED_INTERVAL * TICK)
+
+
+async def run(strategy: str, jobs):
+    client = SimulatedTranscribe()
+    watcher = TranscriptionWatcher(lambda: client)
+    lags = []
+
+    async def one(name, audio_seconds, offset, turnaround):
+        await asyncio.sleep(offset * TICK)
+        client.finish_at[name] = time.monotonic() + turnaround * TICK
+
+        if strategy == "fixed":
+            await wait_fixed(client, name)
+        else:
+            await watcher.wait(
+                name,
+                expected_seconds=watcher.expected_seconds(audio_seconds * BYTES_PER_SECOND),
+                timeout=3600,
+            )
+
+        lags.append((time.monotonic() - client.finish_at[name]) / TICK)
+
+    await asyncio.gather(*(one(*job) for job in jobs))
+    return lags, client.calls
+
+
+def main():
+    jobs = make_jobs(args.jobs, args.seed)
+
+    print("=" * 80)
+    print(f"  TRANSCRIBE STATUS POLLING — {args.jobs} CONCURRENT JOBS (simulated seconds)")
+    print("=" * 80)
+
+    results = {}
+    for strategy in ("fixed", "watcher"):
+        lags, calls = asyncio.run(run(strategy, jobs))
+        results[strategy] = (statistics.mean(lags), calls / len(jobs))
+        print(
+            f"  {strategy:8s} wait past finish: mean={statistics.mean(lags):6.2f}s  "
+            f"max={max(lags):6.2f}s   status calls/job={calls / len(jobs):6.2f}"
+        )
+
+    print()
+    fixed, watcher = results["fixed"], results["watcher"]
+    if watcher[0] >= fixed[0] or watcher[1] >= fixed[1]:
+        print("❌ Watcher did not cut both latency and status calls")
+        return 1
+
+    print(
+        f"✓ Watcher: {fixed[0] / max(watcher[0], 1e-9):.1f}x lower wait, "
+        f"{fixed[1] / watcher[1]:.1f}x fewer status calls"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+bench_transcript_parser.py — Benchmark TranscribeService.parse_transcript_with_speakers
+
+Generates synthetic AWS Transcribe outputs (speaker-labelled, ~150 words per
+minute, punctuation every few words) for 1-, 10- and 60-minute calls and
+times the parser on each.
+
+With --legacy the previous nested-scan parser is timed as well (only on
+calls up to --legacy-max-minutes, since it is quadratic). That both
+parsers agree is checked by tests/test_transcript_parser.py.
+
+Usage:
+  cd backend
+  python ../infrastructure/scripts/bench_transcript_parser.py --legacy
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add backend to Python path so we can import from app/
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from app.models import TranscriptSegment
+from app.services.transcribe_service import TranscribeService
+
+
+WORDS_PER_MINUTE = 150
+VOCABULARY = [
+    "pricing", "budget", "team", "timeline", "demo", "contract", "we", "you",
+    "need", "can", "integrate", "support", "renewal", "discount", "quarter",
+]
+
+
+def synthetic_transcript(minutes: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    word_count = minutes * WORDS_PER_MINUTE
+    step = 60.0 / WORDS_PER_MINUTE
+
+    items = []
+    segments = []
+    current = None
+    speaker = 0
+
+    for i in range(word_count):
+        start = round(i * step, 2)
+        end = round(start + step * 0.8, 2)
+
+        items.append({
+            "type": "pronunciation",
+            "start_time": f"{start:.2f}",
+            "end_time": f"{end:.2f}",
+            "alternatives": [{"content": rng.choice(VOCABULARY)}],
+        })
+
+        if i % 8 == 7:
+            items.append({
+                "type": "punctuation",
+                "alternatives": [{"content": rng.choice([",", ".", "?"])}],
+            })
+
+        # Switch speaker every ~15 words
+        if current is None or i % 15 == 0:
+            if current is not None:
+                segments.append(current)
+            speaker = 1 - speaker
+            current = {
+                "speaker_label": f"spk_{speaker}",
+                "start_time": f"{start:.2f}",
+                "end_time": f"{end:.2f}",
+                "items": [],
+            }
+
+        current["items"].append({
+            "speaker_label": f"spk_{speaker}",
+            "start_time": f"{start:.2f}",
+            "end_time": f"{end:.2f}",
+        })
+        current["end_time"] = f"{end:.2f}"
+
+    segments.append(current)
+
+    return {
+        "results": {
+            "items": items,
+            "speaker_labels": {"speakers": 2, "segments": segments},
+        }
+    }
+
+
+def legacy_parse_segments(transcript_json: dict) -> list:
+    """The previous O(segments x items x items) diarized parser, for reference."""
+    results = transcript_json.get("results", {})
+    speaker_segments = (results.get("speaker_labels") or {}).get("segments", [])
+    items = results.get("items", [])
+
+    segments = []
+    for segment in speaker_segments:
+        text_parts = []
+        for seg_item in segment.get("items", []):
+            start_time_item = float(seg_item.get("start_time", 0))
+            for word_item in items:
+                if word_item.get("type") == "pronunciation":
+                    word_start = float(word_item.get("start_time", 0))
+                    if abs(word_start - start_time_item) < 0.01:
+                        text_parts.append(word_item["alternatives"][0]["content"])
+                elif word_item.get("type") == "punctuation":
+                    text_parts.append(word_item["alternatives"][0]["content"])
+
+        segments.append(
+            TranscriptSegment(
+                speaker=segment.get("speaker_label", "spk_0"),
+                text=" ".join(text_parts).replace(" ,", ",").replace(" .", "."),
+                start_time=float(segment.get("start_time", 0)),
+                end_time=float(segment.get("end_time", 0)),
+            )
+        )
+    return segments
+
+
+def best_of(func, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--minutes", type=int, nargs="+", default=[1, 10, 60])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--legacy", action="store_true", help="also time the old parser")
+    parser.add_argument("--legacy-max-minutes", type=int, default=10)
+    args = parser.parse_args()
+
+    service = TranscribeService.__new__(TranscribeService)  # parser needs no AWS clients
+
+    print("=" * 80)
+    print("  TRANSCRIPT PARSER BENCHMARK")
+    print("=" * 80)
+    print(f"  {'minutes':>7s} {'words':>7s} {'segments':>9s} {'current':>11s} {'legacy':>11s}")
+
+    for minutes in args.minutes:
+        transcript = synthetic_transcript(minutes)
+        words = minutes * WORDS_PER_MINUTE
+
+        current = best_of(lambda: service.parse_transcript_with_speakers(transcript), args.repeats)
+        segment_count = len(service.parse_transcript_with_speakers(transcript).segments)
+
+        legacy_column = "-"
+        if args.legacy and minutes <= args.legacy_max_minutes:
+            legacy = best_of(lambda: legacy_parse_segments(transcript), 1)
+            legacy_column = f"{legacy * 1000:9.1f}ms"
+
+        print(
+            f"  {minutes:7d} {words:7d} {segment_count:9d} "
+            f"{current * 1000:9.1f}ms {legacy_column:>11s}"
+        )
+
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-build_embeddings.py — Build FAISS vector index from knowledge base documents
+build_embeddings.py — Build the vector index artifact from knowledge base documents
 
 This script must be run BEFORE starting the backend server for the first time.
 
@@ -11,17 +11,30 @@ Prerequisites:
 
 Usage:
   cd backend
-  python ../infrastructure/scripts/build_embeddings.py
+  python ../infrastructure/scripts/build_embeddings.py          # incremental
+  python ../infrastructure/scripts/build_embeddings.py --full   # re-embed everything
 
 The script will:
   1. Load all .txt files from data/knowledge_base/
   2. Chunk documents using RecursiveCharacterTextSplitter
-  3. Generate embeddings via AWS Bedrock (amazon.titan-embed-text-v1)
-  4. Build a FAISS vector index
-  5. Save the index to data/embeddings/faiss_index.pkl
-  6. Run a test query to verify functionality
+  3. Generate embeddings via AWS Bedrock (amazon.titan-embed-text-v1) for
+     chunks not already in the current artifact; unchanged files and
+     chunks reuse their vectors and removed ones are dropped
+  4. Write a new versioned index artifact (vectors, document store and a
+     manifest of source file hashes) under backend/data/embeddings/ and
+     point CURRENT at it
+  5. Run a test query to verify functionality
+
+With EMBEDDING_BACKEND=local the chunks are embedded offline on CPU and the
+artifact is written to backend/data/embeddings/local/ (the backend also
+builds it on startup when missing).
+
+The backend memory-maps the artifact read-only at startup instead of
+embedding the knowledge base, so re-run this script whenever documents in
+data/knowledge_base/ change.
 """
 
+import argparse
 import sys
 import os
 from pathlib import Path
@@ -37,7 +50,10 @@ logger = get_logger(__name__)
 
 
 def main():
-    """Build and save FAISS index from knowledge base."""
+    """Build and save the index artifact from knowledge base."""
+    parser = argparse.ArgumentParser(description="Build the knowledge base index artifact")
+    parser.add_argument("--full", action="store_true", help="ignore the current artifact and re-embed every chunk")
+    args = parser.parse_args()
     
     print("=" * 80)
     print("  AI SALES COACH — KNOWLEDGE BASE EMBEDDING BUILDER")
@@ -72,20 +88,25 @@ def main():
         print()
         
         # Build index
-        logger.info("Building FAISS vector index...")
+        logger.info("Building vector index...")
         logger.info("⏳ This will take 2-5 minutes depending on document size...")
         print()
         
-        vector_store = rag_service.build_vector_index(documents)
+        stats = rag_service.update_index(full_rebuild=args.full)
+        rag_service.vector_store = rag_service.load_index()
         
         logger.info("✓ Index built successfully")
         print()
         
-        # Save to disk
-        logger.info("Saving index to disk...")
-        rag_service.save_index(vector_store)
+        print("Index update:")
+        print(f"  Files     {stats['files_unchanged']} unchanged, {stats['files_changed']} changed, "
+              f"{stats['files_added']} added, {stats['files_removed']} removed")
+        print(f"  Chunks    {stats['chunks']} total, {stats['chunks_reused']} reused, "
+              f"{stats['chunks_embedded']} embedded, {stats['chunks_removed']} removed")
+        print(f"  Embedding calls saved: {stats['embedding_calls_saved']}")
+        print()
         
-        logger.info(f"✓ Index saved to: {rag_service.settings.FAISS_INDEX_PATH}")
+        logger.info(f"✓ Index saved to: {rag_service.vector_store.path}")
         print()
         
         # Test query
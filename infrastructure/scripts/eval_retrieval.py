@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+eval_retrieval.py — Compare retrieval quality of embedding backends and modes
+
+Runs a fixed set of labelled coaching queries against the bundled knowledge
+base with each embedding backend in dense, keyword (BM25) and hybrid (RRF)
+mode and reports hit@1, hit@k and MRR (a hit is a retrieved chunk from the
+expected source file), the median latency of one query and the per-query
+latency when all queries are retrieved as one batch.
+
+The local backend re-embeds the chunks of the committed index artifact on
+CPU. The Bedrock backend searches the committed Titan vectors and embeds
+the queries through Bedrock, so it needs AWS credentials; it is skipped
+with a note when Bedrock cannot be reached.
+
+Usage:
+  cd backend
+  python ../infrastructure/scripts/eval_retrieval.py --top-k 3
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to Python path so we can import from app/
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from langchain_community.embeddings import BedrockEmbeddings
+
+from app.config import get_settings
+from app.services.client_registry import get_boto3_client
+from app.services.local_embeddings import HashedTfEmbeddings
+from app.services.rag_service import RAGService
+from app.services.vector_index import VectorIndex
+from app.utils.paths import resolve_data_path
+
+settings = get_settings()
+
+# (query, expected source file)
+LABELLED_QUERIES = [
+    ("How do I handle a customer who says the price is too high?", "objection_handling.txt"),
+    ("The prospect says they need to check with their boss first", "objection_handling.txt"),
+    ("Customer says they are already using a competitor", "objection_handling.txt"),
+    ("Feel felt found method for objections", "objection_handling.txt"),
+    ("Prospect says now is not a good time, maybe next quarter", "objection_handling.txt"),
+    ("What is an assumptive close?", "closing_techniques.txt"),
+    ("How to ask for the sale directly at the end of the call", "closing_techniques.txt"),
+    ("Using a trial close to test buying readiness", "closing_techniques.txt"),
+    ("Summary close that recaps agreed benefits", "closing_techniques.txt"),
+    ("Questions to qualify budget, authority, need and timeline", "discovery_questions.txt"),
+    ("SPIN selling implication questions to amplify pain", "discovery_questions.txt"),
+    ("Open-ended questions to uncover the customer's problems", "discovery_questions.txt"),
+    ("How many times should I follow up after sending a proposal?", "follow_up_strategies.txt"),
+    ("Follow-up email template after a demo", "follow_up_strategies.txt"),
+    ("Which channels to use when following up: email, phone, LinkedIn", "follow_up_strategies.txt"),
+    ("How to follow up without being pushy or annoying", "follow_up_strategies.txt"),
+    ("Showing empathy when the customer is frustrated", "tone_empathy.txt"),
+    ("Mirroring the prospect's communication style and pace", "tone_empathy.txt"),
+    ("Active listening signals during a sales call", "tone_empathy.txt"),
+    ("Controlling vocal tone, pitch and speaking speed", "tone_empathy.txt"),
+]
+
+
+MODES = ("dense", "keyword", "hybrid")
+MRR_DEPTH = 10
+
+
+def make_service(embeddings, index: VectorIndex, vectors) -> RAGService:
+    """RAGService over the given chunk vectors, without loading an artifact."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+
+    service = RAGService.__new__(RAGService)
+    service.embeddings = embeddings
+    service.vector_store = VectorIndex(
+        path="", manifest=index.manifest, vectors=vectors,
+        norms=np.einsum("ij,ij->i", vectors, vectors), documents=index.documents,
+        chunk_hashes=index.chunk_hashes, keyword_index=index.keyword_index,
+    )
+    return service
+
+
+def evaluate(name, service: RAGService, top_k: int):
+    queries = [query for query, _ in LABELLED_QUERIES]
+
+    for mode in MODES:
+        settings.RAG_RETRIEVAL_MODE = mode
+
+        latencies = []
+        rankings = []
+        for query in queries:
+            started = time.perf_counter()
+            rankings.append(service._search([query], MRR_DEPTH)[0])
+            latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        service._search(queries, MRR_DEPTH)
+        batched = (time.perf_counter() - started) / len(queries)
+
+        hits_at_1 = hits_at_k = 0
+        reciprocal_ranks = []
+        for ranked, (_, expected) in zip(rankings, LABELLED_QUERIES):
+            sources = [doc["metadata"]["source"] for doc in ranked]
+            rank = sources.index(expected) + 1 if expected in sources else None
+
+            hits_at_1 += rank == 1
+            hits_at_k += rank is not None and rank <= top_k
+            reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+
+        count = len(queries)
+        print(
+            f"  {name:28s} {mode:8s} {hits_at_1 / count:6.2f} {hits_at_k / count:6.2f} "
+            f"{statistics.mean(reciprocal_ranks):6.3f} {statistics.median(latencies) * 1e3:9.3f}ms "
+            f"{batched * 1e3:9.3f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--dimension", type=int, default=settings.LOCAL_EMBEDDING_DIMENSION)
+    args = parser.parse_args()
+
+    index = VectorIndex.load(resolve_data_path(settings.RAG_INDEX_PATH))
+    texts = [doc.page_content for doc in index.documents]
+
+    print("=" * 92)
+    print(f"  RETRIEVAL QUALITY ({len(LABELLED_QUERIES)} queries, {len(texts)} chunks)")
+    print("=" * 92)
+    print(
+        f"  {'embeddings':28s} {'mode':8s} {'hit@1':>6s} {'hit@' + str(args.top_k):>6s} "
+        f"{'MRR':>6s} {'query p50':>11s} {'batched/q':>11s}"
+    )
+
+    local = HashedTfEmbeddings(dimension=args.dimension)
+    started = time.perf_counter()
+    vectors = local.embed_documents(texts)
+    build_seconds = time.perf_counter() - started
+    evaluate(local.model_id, make_service(local, index, vectors), args.top_k)
+
+    bedrock = BedrockEmbeddings(
+        client=get_boto3_client("bedrock-runtime"),
+        model_id=index.manifest["embedding_model"],
+    )
+    try:
+        bedrock.embed_query("connectivity check")
+    except Exception as e:
+        print(f"  {index.manifest['embedding_model']:28s} skipped: Bedrock unavailable ({type(e).__name__})")
+    else:
+        # Document vectors come precomputed from the artifact
+        evaluate(index.manifest["embedding_model"], make_service(bedrock, index, index.vectors), args.top_k)
+
+    print()
+    print(f"  A hit is a chunk from the expected source file; MRR over the top {MRR_DEPTH}.")
+    print(f"  Local index build (embedding every chunk): {build_seconds * 1e3:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+load_test_health.py — Verify the audio pipeline does not block the event loop
+
+Runs N simulated audio jobs through process_audio_pipeline while hammering
+GET /api/v1/health on the same event loop, and compares health latency
+percentiles against an idle baseline.
+
+AWS Transcribe, S3 and Groq are replaced by in-process fakes with realistic
+blocking latencies, so no credentials or network access are needed.
+
+Usage:
+  cd backend
+  python ../infrastructure/scripts/load_test_health.py --jobs 50
+
+The script exits non-zero if health p99 under load exceeds
+--max-p99-ms (default 50ms).
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Fast polling so the simulated jobs cycle through several status checks
+os.environ.setdefault("TRANSCRIBE_EXPECTED_BASE_SECONDS", "0.5")
+os.environ.setdefault("TRANSCRIBE_POLL_MIN_INTERVAL_SECONDS", "0.2")
+os.environ.setdefault("TRANSCRIBE_POLL_MAX_INTERVAL_SECONDS", "0.5")
+os.environ.setdefault("RAG_ENABLED", "false")
+# Fresh records every run; the jobs are driven directly, not via the queue
+os.environ.setdefault("JOB_STORE_BACKEND", "memory")
+
+# Add backend to Python path so we can import from app/
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+import httpx
+
+from app.main import app
+from app.services import pipeline
+
+
+SDK_LATENCY = 0.05  # seconds of blocking I/O per fake SDK call
+LLM_LATENCY = 0.5   # seconds per fake Groq completion
+
+SAMPLE_TRANSCRIPT = {
+    "results": {
+        "items": [
+            {"type": "pronunciation", "start_time": "0.0", "end_time": "0.4",
+             "alternatives": [{"content": "Hello"}]},
+            {"type": "punctuation", "alternatives": [{"content": "."}]},
+        ],
+        "speaker_labels": {
+            "segments": [
+                {"speaker_label": "spk_0", "start_time": "0.0", "end_time": "0.4",
+                 "items": [{"start_time": "0.0", "end_time": "0.4"}]},
+            ]
+        },
+    }
+}
+
+
+class FakeS3Client:
+    def head_object(self, **kwargs):
+        time.sleep(SDK_LATENCY)
+        return {}
+
+    def get_object(self, **kwargs):
+        time.sleep(SDK_LATENCY)
+        return {"Body": io.BytesIO(json.dumps(SAMPLE_TRANSCRIPT).encode("utf-8"))}
+
+    def put_object(self, **kwargs):
+        time.sleep(SDK_LATENCY)
+        return {}
+
+    def copy_object(self, **kwargs):
+        time.sleep(SDK_LATENCY)
+        return {}
+
+
+class FakeTranscribeClient:
+    """Reports IN_PROGRESS for a few polls before COMPLETED."""
+
+    def __init__(self, polls_before_done: int):
+        self.polls_before_done = polls_before_done
+        self.polls = {}
+
+    def start_transcription_job(self, TranscriptionJobName, **kwargs):
+        time.sleep(SDK_LATENCY)
+        self.polls[TranscriptionJobName] = 0
+        return {}
+
+    def _poll(self, name):
+        self.polls[name] = self.polls.get(name, 0) + 1
+        return "COMPLETED" if self.polls[name] > self.polls_before_done else "IN_PROGRESS"
+
+    def get_transcription_job(self, TranscriptionJobName):
+        time.sleep(SDK_LATENCY)
+        status = self._poll(TranscriptionJobName)
+        return {"TranscriptionJob": {"TranscriptionJobName": TranscriptionJobName,
+                                     "TranscriptionJobStatus": status}}
+
+    def list_transcription_jobs(self, Status, **kwargs):
+        time.sleep(SDK_LATENCY)
+        if Status != "IN_PROGRESS":
+            return {"TranscriptionJobSummaries": []}
+
+        running = [name for name, count in list(self.polls.items()) if count <= self.polls_before_done]
+        return {"TranscriptionJobSummaries": [
+            {"TranscriptionJobName": name, "TranscriptionJobStatus": "IN_PROGRESS"}
+            for name in running if self._poll(name) == "IN_PROGRESS"
+        ]}
+
+
+def fake_llm(system_prompt, user_prompt, on_progress=None):
+    time.sleep(LLM_LATENCY)
+    return "Simulated analysis."
+
+
+def install_fakes(polls_before_done: int):
+    s3 = FakeS3Client()
+    pipeline.s3_service.s3_client = s3
+    pipeline.transcribe_service.s3_client = s3
+    pipeline.transcribe_service.transcribe_client = FakeTranscribeClient(polls_before_done)
+    pipeline.agent_service._invoke_llm = fake_llm
+
+
+async def sample_health(client: httpx.AsyncClient, stop: asyncio.Event, interval: float):
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/api/v1/health")
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+        await asyncio.sleep(interval)
+    return latencies
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(label, latencies):
+    print(
+        f"  {label:10s} n={len(latencies):5d}  "
+        f"p50={statistics.median(latencies):7.2f}ms  "
+        f"p99={percentile(latencies, 99):7.2f}ms  "
+        f"max={max(latencies):7.2f}ms"
+    )
+
+
+async def run(jobs: int, baseline_seconds: float, interval: float) -> tuple:
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+
+        # Idle baseline
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_health(client, stop, interval))
+        await asyncio.sleep(baseline_seconds)
+        stop.set()
+        idle = await sampler
+
+        # Under load
+        job_ids = [f"loadtest-{i}" for i in range(jobs)]
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_health(client, stop, interval))
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(pipeline.process_audio_pipeline(job_id, "mp3") for job_id in job_ids)
+        )
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        loaded = await sampler
+
+    failed = [
+        job_id for job_id in job_ids
+        if pipeline.job_store.get(job_id)["status"] != "completed"
+    ]
+
+    return idle, loaded, elapsed, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--polls", type=int, default=5, help="IN_PROGRESS polls per job")
+    parser.add_argument("--baseline-seconds", type=float, default=2.0)
+    parser.add_argument("--interval", type=float, default=0.01)
+    parser.add_argument("--max-p99-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    install_fakes(args.polls)
+
+    idle, loaded, elapsed, failed = asyncio.run(
+        run(args.jobs, args.baseline_seconds, args.interval)
+    )
+
+    print("=" * 80)
+    print(f"  HEALTH LATENCY WITH {args.jobs} CONCURRENT PIPELINE JOBS")
+    print("=" * 80)
+    summarize("idle", idle)
+    summarize("loaded", loaded)
+    print(f"  jobs completed in {elapsed:.2f}s, failed: {len(failed)}")
+    print()
+
+    if failed:
+        print(f"❌ {len(failed)} jobs did not complete")
+        return 1
+
+    if percentile(loaded, 99) > args.max_p99_ms:
+        print(f"❌ p99 under load exceeds {args.max_p99_ms}ms")
+        return 1
+
+    print("✓ Health latency stays flat under load")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,14 @@ set -e
 
 BUCKET_NAME="ai-sales-coach-audio"
 REGION="us-east-1"
+# Queue for upload notifications (Step 6); named in iam_policies.json
+UPLOAD_EVENTS_QUEUE="ai-sales-coach-upload-events"
 
 # Use local temp files (cross-platform safe)
 TMP_CORS_FILE="cors.json"
 TMP_LIFECYCLE_FILE="lifecycle.json"
+TMP_QUEUE_POLICY_FILE="upload_events_policy.json"
+TMP_NOTIFICATION_FILE="upload_events_notification.json"
 
 echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 echo "  S3 BUCKET SETUP FOR AI SALES COACH"
@@ -45,6 +49,7 @@ cat > "$TMP_CORS_FILE" <<'EOF'
       "AllowedOrigins": ["http://localhost:5173", "http://localhost:3000"],
       "AllowedMethods": ["PUT", "POST", "GET"],
       "AllowedHeaders": ["*"],
+      "ExposeHeaders": ["ETag"],
       "MaxAgeSeconds": 3000
     }
   ]
@@ -92,6 +97,54 @@ aws s3api put-public-access-block \
 
 echo "  ✓ Public access blocked"
 
+# ── Step 6: Upload notifications (optional) ──────────────────────────
+# Set SETUP_UPLOAD_EVENTS=true to deliver audio upload events to SQS, then
+# run the API with UPLOAD_EVENTS_BACKEND=sqs and the queue URL printed below.
+if [ "$SETUP_UPLOAD_EVENTS" = "true" ]; then
+  echo ""
+  echo "→ Sending upload notifications to SQS queue $UPLOAD_EVENTS_QUEUE..."
+
+  QUEUE_URL=$(aws sqs create-queue --queue-name "$UPLOAD_EVENTS_QUEUE" \
+    --region "$REGION" --query QueueUrl --output text)
+  QUEUE_ARN=$(aws sqs get-queue-attributes --queue-url "$QUEUE_URL" \
+    --attribute-names QueueArn --region "$REGION" \
+    --query Attributes.QueueArn --output text)
+
+  # Let the bucket publish to the queue
+  cat > "$TMP_QUEUE_POLICY_FILE" <<EOF
+{
+  "Policy": "{\"Version\":\"2012-10-17\",\"Statement\":[{\"Effect\":\"Allow\",\"Principal\":{\"Service\":\"s3.amazonaws.com\"},\"Action\":\"sqs:SendMessage\",\"Resource\":\"$QUEUE_ARN\",\"Condition\":{\"ArnLike\":{\"aws:SourceArn\":\"arn:aws:s3:::$BUCKET_NAME\"}}}]}"
+}
+EOF
+
+  aws sqs set-queue-attributes --queue-url "$QUEUE_URL" --region "$REGION" \
+    --attributes file://$TMP_QUEUE_POLICY_FILE
+
+  cat > "$TMP_NOTIFICATION_FILE" <<EOF
+{
+  "QueueConfigurations": [
+    {
+      "QueueArn": "$QUEUE_ARN",
+      "Events": ["s3:ObjectCreated:*"],
+      "Filter": {
+        "Key": {
+          "FilterRules": [{ "Name": "prefix", "Value": "audio-uploads/" }]
+        }
+      }
+    }
+  ]
+}
+EOF
+
+  aws s3api put-bucket-notification-configuration \
+    --bucket "$BUCKET_NAME" \
+    --notification-configuration file://$TMP_NOTIFICATION_FILE
+
+  echo "  ✓ Upload notifications enabled"
+  echo "    UPLOAD_EVENTS_SQS_QUEUE_URL=$QUEUE_URL"
+  echo "    Queue ARN for iam_policies.json: $QUEUE_ARN"
+fi
+
 echo ""
 echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 echo "✓ S3 bucket setup complete!"
@@ -0,0 +1,18 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Settings are read once at import, so point them at throwaway files and
+# keep every external service off before anything imports app/
+_data_dir = tempfile.mkdtemp(prefix="sales-coach-tests-")
+
+os.environ.setdefault("RAG_ENABLED", "false")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("JOB_STORE_BACKEND", "sqlite")
+os.environ.setdefault("JOB_STORE_SQLITE_PATH", os.path.join(_data_dir, "jobs.sqlite3"))
+os.environ.setdefault("JOB_QUEUE_SQLITE_PATH", os.path.join(_data_dir, "job_queue.sqlite3"))
+
+# Add backend to Python path so we can import from app/
+backend_path = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
@@ -0,0 +1,207 @@
+import uuid
+
+import pytest
+
+from app.models import ProcessingStatus
+from app.services import job_queue as job_queue_module
+from app.services.job_queue import DONE, FAILED, LEASED, QUEUED, SQLiteJobQueue, get_job_queue
+from app.services.pipeline import fail_abandoned_job, job_store, record_upload, update_job_status
+
+LEASE_SECONDS = 30.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(job_queue_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def make_queue(tmp_path, clock):
+    def make(max_attempts: int = 3, on_abandon=None) -> SQLiteJobQueue:
+        return SQLiteJobQueue(
+            str(tmp_path / "queue.sqlite3"),
+            lease_seconds=LEASE_SECONDS,
+            max_attempts=max_attempts,
+            retention_seconds=3600.0,
+            on_abandon=on_abandon,
+        )
+    return make
+
+
+def queue_row(queue: SQLiteJobQueue, job_id: str):
+    return queue.db.connection().execute(
+        "SELECT state, attempts, worker_id, error FROM job_queue WHERE job_id = ?", (job_id,)
+    ).fetchone()
+
+
+# ----------------------------------------------------------
+# CLAIM
+# ----------------------------------------------------------
+def test_claim_leases_oldest_job_once(make_queue, clock):
+    queue = make_queue()
+    assert queue.enqueue("a", {"file_extension": "mp3"})
+    clock.now += 1
+    assert queue.enqueue("b", {"file_extension": "wav"})
+
+    first = queue.claim("w1")
+    second = queue.claim("w2")
+
+    assert first == {"job_id": "a", "payload": {"file_extension": "mp3"}, "attempts": 1}
+    assert second["job_id"] == "b"
+    assert queue.claim("w3") is None
+    assert queue_row(queue, "a")[:3] == (LEASED, 1, "w1")
+
+
+def test_enqueue_skips_queued_or_leased_job(make_queue):
+    queue = make_queue()
+    assert queue.enqueue("a", {})
+    assert not queue.enqueue("a", {})
+
+    queue.claim("w1")
+    assert not queue.enqueue("a", {})
+
+    queue.complete("a", "w1")
+    assert queue.enqueue("a", {})
+    assert queue_row(queue, "a")[:2] == (QUEUED, 0)
+
+
+def test_complete_and_fail_require_the_lease_holder(make_queue):
+    queue = make_queue()
+    queue.enqueue("a", {})
+    queue.enqueue("b", {})
+    queue.claim("w1")
+    queue.claim("w1")
+
+    queue.complete("a", "w2")
+    assert queue_row(queue, "a")[0] == LEASED
+
+    queue.complete("a", "w1")
+    queue.fail("b", "w1", "boom")
+    assert queue_row(queue, "a")[0] == DONE
+    assert queue_row(queue, "b")[0] == FAILED
+    assert queue_row(queue, "b")[3] == "boom"
+
+
+# ----------------------------------------------------------
+# LEASES
+# ----------------------------------------------------------
+def test_expired_lease_is_reclaimed(make_queue, clock):
+    queue = make_queue()
+    queue.enqueue("a", {})
+    queue.claim("w1")
+
+    clock.now += LEASE_SECONDS - 1
+    assert queue.claim("w2") is None
+
+    clock.now += 2
+    job = queue.claim("w2")
+
+    assert job["job_id"] == "a"
+    assert job["attempts"] == 2
+    assert queue_row(queue, "a")[2] == "w2"
+
+    # The first worker lost the job and can no longer touch it
+    assert not queue.extend("a", "w1")
+    queue.complete("a", "w1")
+    assert queue_row(queue, "a")[0] == LEASED
+
+
+def test_extend_keeps_lease_alive(make_queue, clock):
+    queue = make_queue()
+    queue.enqueue("a", {})
+    queue.claim("w1")
+
+    for _ in range(3):
+        clock.now += LEASE_SECONDS - 1
+        assert queue.extend("a", "w1")
+
+    assert queue.claim("w2") is None
+
+
+def test_release_requeues_without_counting_attempt(make_queue):
+    queue = make_queue()
+    queue.enqueue("a", {})
+    queue.claim("w1")
+
+    queue.release("a", "w1")
+    assert queue_row(queue, "a")[:3] == (QUEUED, 0, None)
+
+    assert queue.claim("w2")["attempts"] == 1
+
+
+# ----------------------------------------------------------
+# MAX ATTEMPTS
+# ----------------------------------------------------------
+def test_job_abandoned_after_max_attempts(make_queue, clock):
+    abandoned = []
+    queue = make_queue(max_attempts=2, on_abandon=lambda job_id, error: abandoned.append((job_id, error)))
+    queue.enqueue("a", {})
+    clock.now += 1
+    queue.enqueue("b", {})
+
+    queue.claim("w1")
+    queue.claim("w1")
+    clock.now += LEASE_SECONDS + 1
+    assert queue.claim("w2")["job_id"] == "a"
+    clock.now += LEASE_SECONDS + 1
+
+    # "a" is out of attempts; the same claim moves on to "b"
+    job = queue.claim("w3")
+
+    assert job["job_id"] == "b"
+    assert queue_row(queue, "a")[0] == FAILED
+    assert abandoned == [("a", "Lease expired 2 times")]
+
+
+def test_abandon_callback_error_does_not_break_claim(make_queue, clock):
+    def broken(job_id, error):
+        raise RuntimeError("store unavailable")
+
+    queue = make_queue(max_attempts=1, on_abandon=broken)
+    queue.enqueue("a", {})
+    queue.claim("w1")
+    clock.now += LEASE_SECONDS + 1
+
+    assert queue.claim("w2") is None
+    assert queue_row(queue, "a")[0] == FAILED
+
+
+def test_abandoned_job_fails_in_job_store(make_queue, clock):
+    job_id = f"abandoned-{uuid.uuid4().hex}"
+    update_job_status(job_id, ProcessingStatus.TRANSCRIBING, 20, "Transcribing audio")
+    record_upload(job_id, 1024, "etag")
+
+    queue = make_queue(max_attempts=1, on_abandon=fail_abandoned_job)
+    queue.enqueue(job_id, {})
+    queue.claim("w1")
+    clock.now += LEASE_SECONDS + 1
+    queue.claim("w2")
+
+    record = job_store.get(job_id)
+    assert record["status"] == ProcessingStatus.FAILED.value
+    assert record["failed_stage"] == "transcribe"
+    assert record["progress_percentage"] == 20
+    assert record["error_message"] == "Lease expired 1 times"
+
+
+def test_fail_abandoned_job_leaves_finished_jobs_alone():
+    job_id = f"finished-{uuid.uuid4().hex}"
+    update_job_status(job_id, ProcessingStatus.COMPLETED, 100, "Analysis complete")
+
+    fail_abandoned_job(job_id, "Lease expired 3 times")
+
+    assert job_store.get(job_id)["status"] == ProcessingStatus.COMPLETED.value
+
+
+def test_default_queue_fails_abandoned_jobs_in_job_store():
+    assert get_job_queue().on_abandon is job_queue_module._fail_abandoned_job
@@ -0,0 +1,204 @@
+import random
+
+import pytest
+
+from app.models import TranscriptResponse, TranscriptSegment
+from app.services.transcribe_service import TranscribeService
+
+VOCABULARY = [
+    "pricing", "budget", "team", "timeline", "demo", "contract", "we", "you",
+    "need", "can", "integrate", "support", "renewal", "discount", "quarter",
+]
+
+
+@pytest.fixture
+def service() -> TranscribeService:
+    return TranscribeService.__new__(TranscribeService)  # parser needs no AWS clients
+
+
+def legacy_parse(transcript_json: dict) -> TranscriptResponse:
+    """The original nested-scan parser, kept as the reference."""
+    results = transcript_json.get("results", {})
+    speaker_labels = results.get("speaker_labels") or {}
+    speaker_segments = speaker_labels.get("segments", [])
+    items = results.get("items", [])
+
+    segments = []
+
+    if speaker_segments:
+        for segment in speaker_segments:
+            text_parts = []
+            for seg_item in segment.get("items", []):
+                start_time_item = float(seg_item.get("start_time", 0))
+                for word_item in items:
+                    if word_item.get("type") == "pronunciation":
+                        word_start = float(word_item.get("start_time", 0))
+                        if abs(word_start - start_time_item) < 0.01:
+                            text_parts.append(word_item["alternatives"][0]["content"])
+                    elif word_item.get("type") == "punctuation":
+                        text_parts.append(word_item["alternatives"][0]["content"])
+
+            segments.append(TranscriptSegment(
+                speaker=segment.get("speaker_label", "spk_0"),
+                text=" ".join(text_parts).replace(" ,", ",").replace(" .", "."),
+                start_time=float(segment.get("start_time", 0)),
+                end_time=float(segment.get("end_time", 0)),
+            ))
+
+    else:
+        text_parts = []
+        end_time = 0.0
+        for word_item in items:
+            if word_item.get("type") == "pronunciation":
+                text_parts.append(word_item["alternatives"][0]["content"])
+                end_time = float(word_item.get("end_time", end_time))
+            elif word_item.get("type") == "punctuation":
+                text_parts.append(word_item["alternatives"][0]["content"])
+
+        segments.append(TranscriptSegment(
+            speaker="spk_0", text=" ".join(text_parts), start_time=0.0, end_time=end_time
+        ))
+
+    full_text = " ".join(seg.text for seg in segments)
+    return TranscriptResponse(
+        job_id="",
+        segments=segments,
+        duration=segments[-1].end_time if segments else 0.0,
+        word_count=len(full_text.split()),
+    )
+
+
+def word(content: str, start: float, end: float) -> dict:
+    return {
+        "type": "pronunciation",
+        "start_time": f"{start:.2f}",
+        "end_time": f"{end:.2f}",
+        "alternatives": [{"content": content}],
+    }
+
+
+def punctuation(content: str) -> dict:
+    return {"type": "punctuation", "alternatives": [{"content": content}]}
+
+
+def synthetic_transcript(words: int, turn_lengths=(15,), punctuated: bool = False, seed: int = 7) -> dict:
+    """Speaker-labelled Transcribe output; speakers alternate every turn."""
+    rng = random.Random(seed)
+    items, segments = [], []
+    speaker, turn_left, current = 0, 0, None
+
+    for i in range(words):
+        start, end = round(i * 0.4, 2), round(i * 0.4 + 0.32, 2)
+        items.append(word(rng.choice(VOCABULARY), start, end))
+        if punctuated and i % 8 == 7:
+            items.append(punctuation(rng.choice([",", ".", "?"])))
+
+        if turn_left == 0:
+            if current is not None:
+                segments.append(current)
+            speaker = 1 - speaker
+            turn_left = rng.choice(turn_lengths)
+            current = {"speaker_label": f"spk_{speaker}", "start_time": f"{start:.2f}", "items": []}
+
+        current["items"].append({"speaker_label": f"spk_{speaker}", "start_time": f"{start:.2f}"})
+        current["end_time"] = f"{end:.2f}"
+        turn_left -= 1
+
+    segments.append(current)
+    return {"results": {"items": items, "speaker_labels": {"speakers": 2, "segments": segments}}}
+
+
+# ----------------------------------------------------------
+# EQUIVALENCE WITH THE LEGACY PARSER
+# ----------------------------------------------------------
+@pytest.mark.parametrize("words,turn_lengths,seed", [
+    (1, (15,), 1),
+    (30, (15,), 2),
+    (150, (1, 2, 7, 40), 3),
+    (1500, (3, 15, 60), 4),
+])
+def test_matches_legacy_on_speaker_changes(service, words, turn_lengths, seed):
+    transcript = synthetic_transcript(words, turn_lengths, seed=seed)
+
+    parsed = service.parse_transcript_with_speakers(transcript)
+
+    assert parsed == legacy_parse(transcript)
+    assert len({seg.speaker for seg in parsed.segments}) == min(2, len(parsed.segments))
+
+
+def test_matches_legacy_within_start_time_tolerance(service):
+    # Segment items may carry start times a few milliseconds off the word's
+    transcript = {"results": {
+        "items": [word("hello", 0.99, 1.2), word("there", 1.5, 1.8)],
+        "speaker_labels": {"segments": [{
+            "speaker_label": "spk_1",
+            "start_time": "0.99",
+            "end_time": "1.8",
+            "items": [{"start_time": "0.995"}, {"start_time": "1.509"}, {"start_time": "1.6"}],
+        }]},
+    }}
+
+    parsed = service.parse_transcript_with_speakers(transcript)
+
+    assert parsed == legacy_parse(transcript)
+    assert parsed.segments[0].text == "hello there"
+
+
+@pytest.mark.parametrize("transcript", [
+    {},
+    {"results": {}},
+    {"results": {"items": []}},
+    {"results": {"items": [], "speaker_labels": None}},
+    {"results": {"items": [], "speaker_labels": {"segments": []}}},
+], ids=["no-results", "empty-results", "no-items", "null-labels", "no-segments"])
+def test_matches_legacy_without_content(service, transcript):
+    assert service.parse_transcript_with_speakers(transcript) == legacy_parse(transcript)
+
+
+def test_matches_legacy_without_speaker_labels(service):
+    transcript = synthetic_transcript(40, punctuated=True)
+    del transcript["results"]["speaker_labels"]
+
+    parsed = service.parse_transcript_with_speakers(transcript)
+
+    assert parsed == legacy_parse(transcript)
+    assert [seg.speaker for seg in parsed.segments] == ["spk_0"]
+
+
+def test_matches_legacy_on_segments_without_items_or_label(service):
+    transcript = synthetic_transcript(20)
+    segments = transcript["results"]["speaker_labels"]["segments"]
+    segments.insert(1, {"start_time": "5.0", "end_time": "5.0", "items": []})
+    del segments[0]["speaker_label"]
+
+    parsed = service.parse_transcript_with_speakers(transcript)
+
+    assert parsed == legacy_parse(transcript)
+    assert parsed.segments[0].speaker == "spk_0"
+    assert parsed.segments[1].text == ""
+
+
+# ----------------------------------------------------------
+# PUNCTUATION
+# ----------------------------------------------------------
+def test_punctuation_attaches_to_its_word(service):
+    # The legacy parser appended every punctuation item to every segment
+    transcript = {"results": {
+        "items": [
+            word("yes", 0.0, 0.3), punctuation(","),
+            word("sure", 0.4, 0.7), punctuation("."),
+            word("price", 1.0, 1.3), punctuation("?"), punctuation("!"),
+        ],
+        "speaker_labels": {"segments": [
+            {"speaker_label": "spk_0", "start_time": "0.0", "end_time": "0.7",
+             "items": [{"start_time": "0.0"}, {"start_time": "0.4"}]},
+            {"speaker_label": "spk_1", "start_time": "1.0", "end_time": "1.3",
+             "items": [{"start_time": "1.0"}]},
+        ]},
+    }}
+
+    parsed = service.parse_transcript_with_speakers(transcript)
+
+    assert [seg.text for seg in parsed.segments] == ["yes, sure.", "price?!"]
+    assert parsed.word_count == 3
+    assert parsed.duration == 1.3
@@ -0,0 +1,232 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from botocore.exceptions import ClientError
+
+from app.services import transcription_watcher as watcher_module
+from app.services.transcription_watcher import TranscriptionWatcher
+from app.utils.exceptions import TranscriptionException
+
+PREFIX = watcher_module.settings.TRANSCRIBE_JOB_PREFIX
+
+# Seconds until a job's first check; rounds then repeat every POLL_INTERVAL
+EXPECTED = 0.04
+POLL_INTERVAL = 0.02
+
+
+class FakeTranscribeClient:
+    """
+    Transcribe stub: a job reaches its final status after `rounds` watcher
+    rounds, and list_transcription_jobs pages two summaries at a time.
+    """
+
+    PAGE_SIZE = 2
+
+    def __init__(self):
+        self.jobs = {}
+        self.get_errors = {}
+        self.list_error = None
+        self.list_calls = 0
+        self.get_calls = []
+
+    def add(self, name: str, final_status: str = "COMPLETED", rounds: int = 0):
+        self.jobs[name] = {"status": "IN_PROGRESS", "final": final_status, "rounds_left": rounds}
+
+    def advance(self):
+        for job in self.jobs.values():
+            if job["rounds_left"] > 0:
+                job["rounds_left"] -= 1
+            else:
+                job["status"] = job["final"]
+
+    def list_transcription_jobs(self, Status, JobNameContains, MaxResults, NextToken=None):
+        self.list_calls += 1
+        if self.list_error:
+            raise self.list_error
+
+        names = sorted(
+            name for name, job in self.jobs.items()
+            if job["status"] == Status and JobNameContains in name
+        )
+        start = int(NextToken or 0)
+        page = names[start:start + self.PAGE_SIZE]
+
+        response = {"TranscriptionJobSummaries": [{"TranscriptionJobName": name} for name in page]}
+        if start + self.PAGE_SIZE < len(names):
+            response["NextToken"] = str(start + self.PAGE_SIZE)
+        return response
+
+    def get_transcription_job(self, TranscriptionJobName):
+        self.get_calls.append(TranscriptionJobName)
+        if TranscriptionJobName in self.get_errors:
+            raise self.get_errors.pop(TranscriptionJobName)
+
+        job = self.jobs[TranscriptionJobName]
+        response = {"TranscriptionJobName": TranscriptionJobName, "TranscriptionJobStatus": job["status"]}
+        if job["status"] == "FAILED":
+            response["FailureReason"] = "Unsupported media"
+        return {"TranscriptionJob": response}
+
+
+def client_error(code: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, "GetTranscriptionJob")
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    settings = watcher_module.settings
+    monkeypatch.setattr(settings, "TRANSCRIBE_POLL_MIN_INTERVAL_SECONDS", POLL_INTERVAL)
+    monkeypatch.setattr(settings, "TRANSCRIBE_POLL_MAX_INTERVAL_SECONDS", POLL_INTERVAL)
+
+
+@pytest.fixture
+def client() -> FakeTranscribeClient:
+    return FakeTranscribeClient()
+
+
+@pytest_asyncio.fixture
+async def watcher(client) -> TranscriptionWatcher:
+    watcher = TranscriptionWatcher(lambda: client)
+
+    # Jobs progress once per round, however the round checked them
+    check_round = watcher._check_round
+
+    async def advancing_round():
+        client.advance()
+        await check_round()
+
+    watcher._check_round = advancing_round
+    yield watcher
+
+    # Stop the shared polling loop before the test's event loop closes
+    if watcher._task is not None:
+        watcher._task.cancel()
+        await asyncio.gather(watcher._task, return_exceptions=True)
+
+
+# ----------------------------------------------------------
+# SETTLE
+# ----------------------------------------------------------
+@pytest.mark.asyncio
+async def test_completed_job_resolves(client, watcher):
+    client.add(f"{PREFIX}a", rounds=2)
+
+    job = await watcher.wait(f"{PREFIX}a", EXPECTED, timeout=2)
+
+    assert job["TranscriptionJobStatus"] == "COMPLETED"
+    assert watcher.stats()["in_flight"] == 0
+    assert watcher.stats()["jobs_finished"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_job_raises(client, watcher):
+    client.add(f"{PREFIX}a", final_status="FAILED")
+
+    with pytest.raises(TranscriptionException, match="Unsupported media"):
+        await watcher.wait(f"{PREFIX}a", EXPECTED, timeout=2)
+
+    assert watcher.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_many_jobs_share_list_calls(client, watcher):
+    names = [f"{PREFIX}{i}" for i in range(6)]
+    for i, name in enumerate(names):
+        client.add(name, final_status="FAILED" if i == 5 else "COMPLETED", rounds=i % 3)
+
+    results = await asyncio.gather(
+        *(watcher.wait(name, EXPECTED, timeout=2) for name in names), return_exceptions=True
+    )
+
+    assert [r["TranscriptionJobStatus"] for r in results[:5]] == ["COMPLETED"] * 5
+    assert isinstance(results[5], TranscriptionException)
+    assert client.list_calls > 0
+    # Only jobs that left the in-flight list are fetched, each once
+    assert sorted(client.get_calls) == sorted(names)
+
+
+# ----------------------------------------------------------
+# PER-JOB ERRORS
+# ----------------------------------------------------------
+@pytest.mark.asyncio
+async def test_transient_get_error_is_retried(client, watcher):
+    client.add(f"{PREFIX}a")
+    client.get_errors[f"{PREFIX}a"] = client_error("ThrottlingException")
+
+    job = await watcher.wait(f"{PREFIX}a", EXPECTED, timeout=2)
+
+    assert job["TranscriptionJobStatus"] == "COMPLETED"
+    assert client.get_calls == [f"{PREFIX}a", f"{PREFIX}a"]
+    assert watcher.stats()["get_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_job_fails_without_stopping_others(client, watcher):
+    names = [f"{PREFIX}{i}" for i in range(4)]
+    for name in names:
+        client.add(name)
+    client.get_errors[names[1]] = client_error("BadRequestException")
+    client.get_errors[names[2]] = ConnectionError("connection reset")
+
+    results = await asyncio.gather(
+        *(watcher.wait(name, EXPECTED, timeout=2) for name in names), return_exceptions=True
+    )
+
+    assert isinstance(results[1], TranscriptionException)
+    assert [results[i]["TranscriptionJobStatus"] for i in (0, 2, 3)] == ["COMPLETED"] * 3
+    assert watcher.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_list_error_falls_back_to_per_job_checks(client, watcher):
+    names = [f"{PREFIX}{i}" for i in range(4)]
+    for name in names:
+        client.add(name, rounds=1)
+    client.list_error = client_error("ThrottlingException")
+
+    results = await asyncio.gather(*(watcher.wait(name, EXPECTED, timeout=2) for name in names))
+
+    assert [r["TranscriptionJobStatus"] for r in results] == ["COMPLETED"] * 4
+    assert watcher.stats()["list_errors"] > 0
+
+
+# ----------------------------------------------------------
+# TIMEOUT AND CANCELLATION
+# ----------------------------------------------------------
+@pytest.mark.asyncio
+async def test_timeout_removes_watch(client, watcher):
+    client.add(f"{PREFIX}slow", rounds=10_000)
+    client.add(f"{PREFIX}fast", rounds=1)
+
+    slow = asyncio.ensure_future(watcher.wait(f"{PREFIX}slow", EXPECTED, timeout=0.1))
+    fast = await watcher.wait(f"{PREFIX}fast", EXPECTED, timeout=2)
+
+    with pytest.raises(TimeoutError):
+        await slow
+
+    assert fast["TranscriptionJobStatus"] == "COMPLETED"
+    assert f"{PREFIX}slow" not in watcher._watches
+
+    # The loop keeps serving jobs after a timeout
+    client.add(f"{PREFIX}next")
+    job = await watcher.wait(f"{PREFIX}next", EXPECTED, timeout=2)
+    assert job["TranscriptionJobStatus"] == "COMPLETED"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_wait_removes_watch(client, watcher):
+    client.add(f"{PREFIX}a", rounds=10_000)
+
+    waiting = asyncio.ensure_future(watcher.wait(f"{PREFIX}a", EXPECTED, timeout=5))
+    await asyncio.sleep(EXPECTED * 2)
+    assert f"{PREFIX}a" in watcher._watches
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    assert watcher._watches == {}
+    calls = len(client.get_calls) + client.list_calls
+    await asyncio.sleep(POLL_INTERVAL * 5)
+    assert len(client.get_calls) + client.list_calls == calls